@@ -1,33 +1,336 @@
 # bytecode_inspector.py
 
 import py_compile
+import compileall
 import dis
 import os
 import marshal
 import importlib.util
 import argparse
+import multiprocessing
+import json
+import struct
+import time
+from collections import Counter
+from functools import partial
 from pathlib import Path
 
-def compile_to_bytecode(file_path):
-    """Compile a Python file to bytecode and return the path to the .pyc file"""
+from interpreter_internals import start_line
+
+# Bit 0 of the PEP 552 flags word marks a hash-based pyc, bit 1 a checked one
+FLAG_HASH_BASED = 0b01
+FLAG_CHECK_SOURCE = 0b10
+
+def read_pyc_header(pyc_path):
+    """Parse the 16-byte PEP 552 header of a .pyc file into a dict"""
+    with open(pyc_path, 'rb') as f:
+        header = f.read(16)
+    if len(header) < 16:
+        raise ValueError(f"Truncated .pyc header in {pyc_path}")
+    magic, flags = header[:4], struct.unpack('<I', header[4:8])[0]
+    info = {'magic': magic, 'flags': flags, 'hash_based': bool(flags & FLAG_HASH_BASED)}
+    if info['hash_based']:
+        info['check_source'] = bool(flags & FLAG_CHECK_SOURCE)
+        info['source_hash'] = header[8:16]
+    else:
+        info['mtime'], info['source_size'] = struct.unpack('<II', header[8:16])
+    return info
+
+def pyc_is_current(file_path, pyc_path=None):
+    """True when pyc_path is a hash-based pyc for this interpreter and source"""
+    pyc_path = pyc_path or importlib.util.cache_from_source(file_path)
     try:
-        py_compile.compile(file_path)
+        info = read_pyc_header(pyc_path)
+        with open(file_path, 'rb') as f:
+            source = f.read()
+    except (OSError, ValueError):
+        return False
+    return (info['magic'] == importlib.util.MAGIC_NUMBER
+            and info['hash_based']
+            and info['source_hash'] == importlib.util.source_hash(source))
+
+def compile_to_bytecode(file_path, force=False):
+    """Compile a Python file to bytecode and return the path to the .pyc file
+
+    The pyc goes where the import system looks for it (cache_from_source) and
+    records a hash of the source (PEP 552 checked-hash), so an unchanged source
+    is not recompiled on the next run.
+    """
+    pyc_path = importlib.util.cache_from_source(file_path)
+    if not force and pyc_is_current(file_path, pyc_path):
+        print(f"Up to date: {file_path}")
+        return pyc_path
+    try:
+        py_compile.compile(
+            file_path, cfile=pyc_path, doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
         print(f"Successfully compiled {file_path}")
-        
-        # Find the compiled .pyc file
-        cache_dir = '__pycache__'
-        base_name = os.path.basename(file_path)
-        module_name = os.path.splitext(base_name)[0]
-        
-        if os.path.exists(cache_dir):
-            pyc_files = [f for f in os.listdir(cache_dir) if f.startswith(f"{module_name}.")]
-            if pyc_files:
-                return os.path.join(cache_dir, pyc_files[0])
-    except Exception as e:
+        return pyc_path
+    except (py_compile.PyCompileError, OSError) as e:
         print(f"Error compiling {file_path}: {e}")
     
     return None
 
+def compile_many(paths, workers=None, force=False):
+    """Compile many files (directories are walked) with compileall in a process pool
+
+    Files whose checked-hash pyc still matches the source are skipped before any
+    worker starts. Returns (compiled, skipped, failed) file counts.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d != '__pycache__']
+                files.extend(os.path.join(dirpath, name)
+                             for name in filenames if name.endswith('.py'))
+        else:
+            files.append(path)
+    stale = [f for f in files if force or not pyc_is_current(f)]
+    compile_one = partial(
+        compileall.compile_file, force=True, quiet=1,
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+    # compileall's own workers use concurrent.futures, which imports logging and
+    # so breaks when this repository's logging.py shadows the stdlib module.
+    if stale and (workers or os.cpu_count() or 1) > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(compile_one, stale, chunksize=max(1, len(stale) // 64))
+    else:
+        results = [compile_one(f) for f in stale]
+    failed = results.count(False)
+    return len(stale) - failed, len(files) - len(stale), failed
+
+def load_code(pyc_path):
+    """Read the module code object from a .pyc without executing anything"""
+    info = read_pyc_header(pyc_path)
+    if info['magic'] != importlib.util.MAGIC_NUMBER:
+        # marshal's format changes between versions; refuse rather than misread
+        raise ValueError(f"{pyc_path} was written by a different Python version")
+    with open(pyc_path, 'rb') as f:
+        f.seek(16)
+        return marshal.load(f)
+
+class CodeIndex:
+    """Qualified name -> code object for a module, filled in lazily
+
+    Nested code objects are found by walking co_consts, but only as far as
+    needed: looking up an early function does not visit the rest of the module.
+    A second definition under the same name is indexed as "name@line".
+    """
+
+    def __init__(self, module_code):
+        self.module = module_code
+        self._index = {}
+        self._pending = [module_code]
+
+    def _qualname(self, code):
+        name = getattr(code, 'co_qualname', code.co_name)
+        if name in self._index:
+            name = f"{name}@{code.co_firstlineno}"
+        return name
+
+    def _walk(self):
+        """Index code objects one at a time, yielding each new name"""
+        while self._pending:
+            code = self._pending.pop()
+            name = self._qualname(code)
+            self._index[name] = code
+            self._pending.extend(
+                reversed([c for c in code.co_consts if isinstance(c, type(code))]))
+            yield name
+
+    def __getitem__(self, name):
+        if name in self._index:
+            return self._index[name]
+        for found in self._walk():
+            if found == name:
+                return self._index[name]
+        raise KeyError(name)
+
+    def names(self):
+        """Every qualified name, walking whatever is left of the module"""
+        for _ in self._walk():
+            pass
+        return list(self._index)
+
+    def disassemble(self, name, file=None):
+        """Disassemble one code object without descending into nested ones"""
+        dis.dis(self[name], file=file, depth=0)
+
+def inspect_pyc(pyc_path, function=None):
+    """Inspect a .pyc by loading and indexing it, never executing it
+
+    Lists the qualified names, or disassembles only `function` when given.
+    Returns the timings in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    index = CodeIndex(load_code(pyc_path))
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if function is None:
+        names = index.names()
+        timings['index'] = time.perf_counter() - start
+        print(f"{len(names)} code objects in {pyc_path}:")
+        for name in names:
+            code = index[name]
+            print(f"  {name:50} line {code.co_firstlineno}")
+    else:
+        code = index[function]
+        timings['index'] = time.perf_counter() - start
+        start = time.perf_counter()
+        print(f"\n{'='*50}")
+        print(f"Disassembly of {function}:")
+        print(f"{'='*50}")
+        index.disassemble(function)
+        timings['disassemble'] = time.perf_counter() - start
+    print("\nTimings: " + ", ".join(
+        f"{step} {seconds * 1000:.2f}ms" for step, seconds in timings.items()))
+    return timings
+
+# Instruction mix and slow patterns
+
+_NAME_LOADS = {'LOAD_FAST', 'LOAD_GLOBAL', 'LOAD_DEREF', 'LOAD_NAME'}
+_ATTR_LOADS = {'LOAD_ATTR', 'LOAD_METHOD'}
+_JUMPS = set(dis.hasjrel) | set(dis.hasjabs)
+
+def code_from_source(file_path):
+    """Compile a source file to its module code object (nothing is executed)"""
+    with open(file_path, 'rb') as f:
+        return compile(f.read(), file_path, 'exec')
+
+def _loop_ranges(instructions):
+    """(start, end) offsets of every loop, found from backward jumps"""
+    return [(i.argval, i.offset) for i in instructions
+            if i.opcode in _JUMPS and isinstance(i.argval, int)
+            and i.argval <= i.offset]
+
+def find_slow_patterns(code):
+    """Flag global loads, repeated attribute loads and list rebuilds inside loops"""
+    instructions = list(dis.get_instructions(code))
+    loops = _loop_ranges(instructions)
+    warnings = []
+    if not loops:
+        return warnings
+    
+    line = code.co_firstlineno
+    globals_seen = set()
+    per_loop_attrs = {loop: Counter() for loop in loops}
+    chain = None
+    for n, instr in enumerate(instructions):
+        line = start_line(instr) or line
+        inside = [loop for loop in loops if loop[0] <= instr.offset <= loop[1]]
+        if instr.opname in _NAME_LOADS:
+            chain = instr.argval
+        elif instr.opname in _ATTR_LOADS and chain is not None:
+            chain = f"{chain}.{instr.argval}"
+            for loop in inside:
+                per_loop_attrs[loop][chain] += 1
+        else:
+            chain = None
+        if not inside:
+            continue
+        if instr.opname == 'LOAD_GLOBAL' and instr.argval not in globals_seen:
+            globals_seen.add(instr.argval)
+            warnings.append({
+                'pattern': 'global-in-loop', 'line': line,
+                'detail': f"global {instr.argval!r} is looked up on every iteration"})
+        if (instr.opname == 'BUILD_LIST'
+                and any(i.opname == 'LIST_EXTEND' for i in instructions[n + 1:n + 3])):
+            warnings.append({
+                'pattern': 'list-rebuilt-in-loop', 'line': line,
+                'detail': "BUILD_LIST+LIST_EXTEND builds a new list every iteration"})
+    for (start, _), attrs in per_loop_attrs.items():
+        for dotted, count in attrs.items():
+            if count > 1:
+                warnings.append({
+                    'pattern': 'repeated-attribute-load',
+                    'line': _line_at(instructions, start, code.co_firstlineno),
+                    'detail': f"{dotted} is loaded {count} times per iteration"})
+    return sorted(warnings, key=lambda w: w['line'])
+
+def _line_at(instructions, offset, default):
+    line = default
+    for instr in instructions:
+        if instr.offset > offset:
+            break
+        line = start_line(instr) or line
+    return line
+
+def instruction_stats(module_code, file_name=None):
+    """Opcode histograms per function and for the whole file, plus warnings"""
+    index = CodeIndex(module_code)
+    functions = {}
+    total = Counter()
+    for name in index.names():
+        code = index[name]
+        histogram = Counter(i.opname for i in dis.get_instructions(code))
+        total.update(histogram)
+        functions[name] = {
+            'line': code.co_firstlineno,
+            'instructions': sum(histogram.values()),
+            'opcodes': dict(histogram.most_common()),
+            'warnings': find_slow_patterns(code),
+        }
+    return {
+        'file': file_name or module_code.co_filename,
+        'instructions': sum(total.values()),
+        'opcodes': dict(total.most_common()),
+        'functions': functions,
+    }
+
+def diff_stats(old, new):
+    """Instruction-count deltas between two instruction_stats() results"""
+    functions = {}
+    for name in sorted(set(old['functions']) | set(new['functions'])):
+        before = old['functions'].get(name, {}).get('instructions', 0)
+        after = new['functions'].get(name, {}).get('instructions', 0)
+        if before != after:
+            functions[name] = {'old': before, 'new': after, 'delta': after - before}
+    opcodes = {}
+    for op in sorted(set(old['opcodes']) | set(new['opcodes'])):
+        delta = new['opcodes'].get(op, 0) - old['opcodes'].get(op, 0)
+        if delta:
+            opcodes[op] = delta
+    return {
+        'old': old['file'], 'new': new['file'],
+        'instructions': {'old': old['instructions'], 'new': new['instructions'],
+                         'delta': new['instructions'] - old['instructions']},
+        'functions': functions,
+        'opcodes': dict(sorted(opcodes.items(), key=lambda kv: -abs(kv[1]))),
+    }
+
+def print_stats(stats, top=3):
+    """Print instruction_stats() as a table followed by the warnings"""
+    print(f"{'function':50} {'line':>5} {'instrs':>7}  top opcodes")
+    for name, info in stats['functions'].items():
+        common = ", ".join(f"{op} {n}" for op, n in list(info['opcodes'].items())[:top])
+        print(f"{name[:50]:50} {info['line']:>5} {info['instructions']:>7}  {common}")
+    print(f"\n{stats['file']}: {stats['instructions']} instructions")
+    for op, n in list(stats['opcodes'].items())[:10]:
+        print(f"  {op:24} {n:>7} {n / stats['instructions']:7.1%}")
+    warnings = [(name, w) for name, info in stats['functions'].items()
+                for w in info['warnings']]
+    if warnings:
+        print("\nSlow patterns:")
+        for name, w in warnings:
+            print(f"  line {w['line']:>5} {name}: {w['detail']} [{w['pattern']}]")
+
+def print_diff(diff):
+    """Print diff_stats() as a table"""
+    total = diff['instructions']
+    print(f"{diff['old']} -> {diff['new']}: "
+          f"{total['old']} -> {total['new']} instructions ({total['delta']:+d})")
+    if diff['functions']:
+        print(f"\n{'function':50} {'old':>7} {'new':>7} {'delta':>7}")
+        for name, d in diff['functions'].items():
+            print(f"{name[:50]:50} {d['old']:>7} {d['new']:>7} {d['delta']:>+7d}")
+    if diff['opcodes']:
+        print("\nOpcode deltas:")
+        for op, delta in diff['opcodes'].items():
+            print(f"  {op:24} {delta:>+7d}")
+
 def inspect_bytecode(pyc_path):
     """Disassemble and inspect a .pyc file"""
     if not pyc_path or not os.path.exists(pyc_path):
@@ -53,52 +356,97 @@ def inspect_bytecode(pyc_path):
         print(f"\n{'='*50}")
         print(f"Raw bytecode from {pyc_path}:")
         print(f"{'='*50}")
-        with open(pyc_path, 'rb') as pyc_file:
-            # Skip the magic number and timestamp/size
-            pyc_file.read(16)  # 4 bytes magic + 4 bytes timestamp + 4 bytes size + 4 bytes hash
-            
-            # Load the code object
-            try:
-                code_obj = marshal.load(pyc_file)
-                dis.dis(code_obj)
-            except Exception as e:
-                print(f"Error loading code object: {e}")
+        try:
+            dis.dis(load_code(pyc_path))
+        except Exception as e:
+            print(f"Error loading code object: {e}")
                 
     except Exception as e:
         print(f"Error inspecting {pyc_path}: {e}")
 
+def inspect_file(file_path, args):
+    """Compile one file (unless --no-compile) and inspect its .pyc"""
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return
+    
+    if args.no_compile:
+        # Look where the import system would have written it
+        pyc_path = importlib.util.cache_from_source(file_path)
+        if os.path.exists(pyc_path):
+            print(f"Using existing .pyc file: {pyc_path}")
+        else:
+            print(f"No existing .pyc file found for {file_path}")
+            return
+    else:
+        pyc_path = compile_to_bytecode(file_path, force=args.force)
+        if not pyc_path:
+            return
+        print(f"Compiled to: {pyc_path}")
+    
+    if args.no_exec or args.function:
+        try:
+            inspect_pyc(pyc_path, args.function)
+        except KeyError:
+            print(f"No code object named {args.function!r}; try --no-exec to list them")
+        except ValueError as e:
+            print(f"Error inspecting {pyc_path}: {e}")
+    else:
+        inspect_bytecode(pyc_path)
+
 def main():
-    parser = argparse.ArgumentParser(description='Compile Python files to bytecode and inspect them')
-    parser.add_argument('file', help='Python file to compile and inspect')
-    parser.add_argument('--no-compile', action='store_true', 
+    parser = argparse.ArgumentParser(
+        description='Compile Python files to bytecode and inspect them')
+    parser.add_argument('file', nargs='+', help='Python files to compile and inspect')
+    parser.add_argument('--no-compile', action='store_true',
                         help='Inspect existing .pyc without recompiling')
+    parser.add_argument('--no-exec', action='store_true',
+                        help='List code objects from the .pyc without running it')
+    parser.add_argument('--function', metavar='QUALNAME',
+                        help='Disassemble only this function (implies --no-exec)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Opcode histograms and slow-pattern warnings per function')
+    parser.add_argument('--diff', action='store_true',
+                        help='Compare instruction counts of two files: OLD NEW')
+    parser.add_argument('--json', action='store_true',
+                        help='Print --stats/--diff results as JSON')
+    parser.add_argument('--force', action='store_true',
+                        help='Recompile even when the source hash matches')
+    parser.add_argument('--batch', action='store_true',
+                        help='Only compile the files (and directories), in parallel')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --batch (default: all cores)')
     
     args = parser.parse_args()
     
-    file_path = args.file
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
+    if args.batch:
+        start = time.perf_counter()
+        compiled, skipped, failed = compile_many(args.file, args.workers, args.force)
+        print(f"{compiled} compiled, {skipped} up to date, {failed} failed "
+              f"in {time.perf_counter() - start:.2f}s")
         return
     
-    if args.no_compile:
-        # Try to find existing .pyc file
-        cache_dir = '__pycache__'
-        base_name = os.path.basename(file_path)
-        module_name = os.path.splitext(base_name)[0]
-        
-        if os.path.exists(cache_dir):
-            pyc_files = [f for f in os.listdir(cache_dir) if f.startswith(f"{module_name}.")]
-            if pyc_files:
-                pyc_path = os.path.join(cache_dir, pyc_files[0])
-                print(f"Using existing .pyc file: {pyc_path}")
-                inspect_bytecode(pyc_path)
+    if args.diff:
+        if len(args.file) != 2:
+            parser.error("--diff needs exactly two files: OLD NEW")
+        old, new = (instruction_stats(code_from_source(f), f) for f in args.file)
+        diff = diff_stats(old, new)
+        if args.json:
+            print(json.dumps(diff, indent=2))
+        else:
+            print_diff(diff)
+        return
+    if args.stats:
+        for path in args.file:
+            stats = instruction_stats(code_from_source(path), path)
+            if args.json:
+                print(json.dumps(stats, indent=2))
             else:
-                print(f"No existing .pyc file found for {file_path}")
-    else:
-        pyc_path = compile_to_bytecode(file_path)
-        if pyc_path:
-            print(f"Compiled to: {pyc_path}")
-            inspect_bytecode(pyc_path)
+                print_stats(stats)
+        return
+    
+    for file_path in args.file:
+        inspect_file(file_path, args)
 
 if __name__ == "__main__":
     main()
@@ -11,25 +11,328 @@ including CPython and IPython, focusing on:
 - Evaluation loop
 """
 
+# Only modules the interpreter has already loaded at startup are imported
+# here; each section imports what it needs (see --section imports).
 import sys
 import os
-import inspect
-import types
-import ctypes
 import gc
-import dis
-import marshal
-import importlib
-import importlib.util
-import traceback
-from pprint import pprint
+import time
+from importlib.machinery import PathFinder
+
+# Check if IPython is available, without importing it (that alone takes
+# hundreds of milliseconds)
+IPYTHON_AVAILABLE = PathFinder.find_spec("IPython") is not None
+
+# What this module imported at load time before sections imported lazily;
+# explore_imports loads them up front to time startup the old way
+EAGER_IMPORTS = ("inspect", "types", "ctypes", "dis", "marshal", "importlib",
+                 "importlib.util", "traceback", "pprint")
+
+
+class OpcodeProfile:
+    """
+    Executed-instruction counts collected by PythonInternalsExplorer.profile_opcodes
+
+    counts maps (code object, bytecode offset) to the number of times that
+    instruction ran. With call sampling the counts are scaled back up, so they
+    estimate the totals of an unsampled run.
+    """
+    
+    def __init__(self, counts, result, elapsed, mechanism, sample_every, truncated):
+        self.counts = counts
+        self.result = result
+        self.elapsed = elapsed
+        self.mechanism = mechanism
+        self.sample_every = sample_every
+        self.truncated = truncated
+        
+    @property
+    def total(self):
+        return sum(self.counts.values())
+        
+    def by_code(self):
+        """Instruction totals per code object, hottest first"""
+        from collections import Counter
+        totals = Counter()
+        for (code, _), n in self.counts.items():
+            totals[code] += n
+        return totals.most_common()
+        
+    def by_line(self):
+        """Instruction totals per (filename, line, function), hottest first"""
+        from collections import Counter
+        totals = Counter()
+        lines = {}
+        for (code, offset), n in self.counts.items():
+            if code not in lines:
+                lines[code] = _offset_lines(code)
+            line = lines[code].get(offset, code.co_firstlineno)
+            totals[(code.co_filename, line, code.co_name)] += n
+        return totals.most_common()
+        
+    def hot_spots(self, top=10):
+        """Text report of the hottest lines"""
+        out = [f"{self.total} instructions via {self.mechanism} in {self.elapsed:.3f}s"
+               + (" (stopped at max_events)" if self.truncated else "")]
+        for (filename, line, name), n in self.by_line()[:top]:
+            share = n / self.total if self.total else 0
+            out.append(f"  {n:>10} {share:6.1%}  {name} "
+                       f"({os.path.basename(filename)}:{line})")
+        return "\n".join(out)
+        
+    def annotate(self, code):
+        """The dis listing of code with each instruction's execution count"""
+        import dis
+        out = []
+        for instr in dis.get_instructions(code):
+            n = self.counts.get((code, instr.offset), 0)
+            start = start_line(instr)
+            line = f"{start:>5}" if start else " " * 5
+            out.append(f"{n or '':>10} {line} {instr.offset:>6} "
+                       f"{instr.opname:<24} {instr.argrepr}")
+        return "\n".join(out)
+
+
+# Upper bounds (seconds) of the GC pause histogram buckets
+GC_PAUSE_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+
+# Candidates tried by sweep_gc_settings: (label, thresholds, freeze)
+GC_CANDIDATES = (
+    ("default", (700, 10, 10), False),
+    ("gen0=10k", (10_000, 10, 10), False),
+    ("gen0=50k,gen1=20", (50_000, 20, 10), False),
+    ("default+freeze", (700, 10, 10), True),
+    ("gen0=50k+freeze", (50_000, 20, 10), True),
+)
+
+# Objects already in the permanent generation when this module was loaded;
+# 3.12 starts with a few hundred there that nobody froze
+_BASELINE_FROZEN = gc.get_freeze_count()
+
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def pause_histogram(durations, buckets=GC_PAUSE_BUCKETS):
+    """Count durations per bucket; returns [(label, count)] from fastest up"""
+    counts = [0] * (len(buckets) + 1)
+    for d in durations:
+        counts[next((i for i, b in enumerate(buckets) if d < b), len(buckets))] += 1
+    labels = [f"< {b * 1e6:g}us" for b in buckets] + [f">= {buckets[-1] * 1e6:g}us"]
+    return list(zip(labels, counts))
+
+
+def parse_importtime(text):
+    """
+    Parse `python -X importtime` output into a tree of imports
+    
+    Returns the top-level imports as nodes {'name', 'self_us', 'cumulative_us',
+    'children'}. importtime prints a module after everything it imported, one
+    indentation level (two spaces) deeper per level of nesting.
+    """
+    pending = {}  # depth -> nodes waiting for their parent
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        node = {
+            'name': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'children': pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def _offset_lines(code):
+    """Map every instruction offset in code to its source line"""
+    import dis
+    lines = {}
+    line = code.co_firstlineno
+    for instr in dis.get_instructions(code):
+        line = start_line(instr) or line
+        lines[instr.offset] = line
+    return lines
+
+
+def start_line(instr):
+    """
+    The line instr starts, or None if it continues the previous line
+    
+    Instruction.starts_line is that line number up to 3.12; from 3.13 it is
+    a bool and the number is in line_number.
+    """
+    if isinstance(instr.starts_line, bool):
+        return instr.line_number if instr.starts_line else None
+    return instr.starts_line
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler over sys._current_frames()
+    
+    A daemon thread wakes every `interval` seconds, walks the current frame of
+    every other thread and counts each distinct stack, weighted by the wall time
+    since the previous sample. Nothing is installed in the profiled threads, so
+    the cost is one stack walk per thread per sample (about 1% at the default
+    100Hz). The sampler needs the GIL to run, so against CPU-bound threads the
+    real rate is capped near 1 / sys.getswitchinterval(). Use as a context
+    manager, or call start() and stop():
+    
+        with StackSampler(interval=0.005) as sampler:
+            workload()
+        sampler.write_speedscope("profile.speedscope.json")
+    
+    The sampler thread updates stacks and seconds under a lock; the report
+    methods read a snapshot(), so they are safe to call while sampling.
+    """
+    
+    def __init__(self, interval=0.01, per_thread=True):
+        import threading
+        from collections import Counter
+        self.interval = interval
+        self.per_thread = per_thread
+        self.stacks = Counter()
+        self.seconds = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._labels = {}
+        self._thread_names = {}
+        self._thread = None
+        self._stop = None
+        self._started = None
+        self._lock = threading.Lock()
+        
+    def start(self):
+        import threading
+        if self._thread is not None:
+            raise RuntimeError("sampler is already running")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="StackSampler",
+                                        daemon=True)
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += time.perf_counter() - self._started
+        self._started = None
+        return self
+        
+    def __enter__(self):
+        return self.start()
+        
+    def __exit__(self, *exc):
+        self.stop()
+        
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:" \
+                    f"{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+        
+    def _thread_name(self, ident):
+        name = self._thread_names.get(ident)
+        if name is None:
+            import threading
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+        
+    def _run(self):
+        import threading
+        own = threading.get_ident()
+        label = self._label
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            sampled = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(label(frame.f_code))
+                    frame = frame.f_back
+                if self.per_thread:
+                    stack.append(self._thread_name(ident))
+                stack.reverse()
+                sampled.append(tuple(stack))
+            with self._lock:
+                for stack in sampled:
+                    self.stacks[stack] += 1
+                    self.seconds[stack] += weight
+                self.samples += 1
+            
+    def snapshot(self):
+        """Copies of (stacks, seconds), consistent even while sampling runs"""
+        with self._lock:
+            return self.stacks.copy(), self.seconds.copy()
+        
+    def collapsed(self):
+        """Stacks in collapsed format ("root;...;leaf count"), as flamegraph.pl reads"""
+        stacks, _ = self.snapshot()
+        return [";".join(stack) + f" {count}" for stack, count in stacks.most_common()]
+        
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+            
+    def speedscope(self, name="StackSampler"):
+        """The samples as a speedscope "sampled" profile, weighted in seconds"""
+        frames = []
+        index = {}
+        samples = []
+        weights = []
+        stacks, seconds = self.snapshot()
+        for stack, count in stacks.most_common():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({'name': label})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(seconds[stack])
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+            'name': name,
+            'activeProfileIndex': 0,
+            'exporter': 'interpreter_internals.StackSampler',
+        }
+        
+    def write_speedscope(self, path, name="StackSampler"):
+        import json
+        with open(path, "w") as f:
+            json.dump(self.speedscope(name), f)
 
-# Check if IPython is available
-try:
-    import IPython
-    IPYTHON_AVAILABLE = True
-except ImportError:
-    IPYTHON_AVAILABLE = False
 
 class PythonInternalsExplorer:
     """
@@ -55,7 +358,6 @@ class PythonInternalsExplorer:
         print(f"Executable Path: {self.interpreter_path}")
         print(f"Compiled with: {sys.implementation.cache_tag}")
         print(f"Flags: {sys.flags}")
-        print(f"Check Interval: {sys.getcheckinterval()}")
         print(f"Thread Switch Interval: {sys.getswitchinterval()}")
         
         # Python memory info
@@ -90,21 +392,339 @@ class PythonInternalsExplorer:
             print(f"\nObject of type {type(obj).__name__}:")
             print(f"  ID: {id(obj)}")
             print(f"  Size: {sys.getsizeof(obj)} bytes")
-            print(f"  Reference count: {sys.getrefcount(obj) - 1}")  # -1 for the reference in this function
+            # -1 for the reference held by this function's argument
+            print(f"  Reference count: {sys.getrefcount(obj) - 1}")
             print(f"  Memory address: {hex(id(obj))}")
             if hasattr(obj, "__dict__"):
                 print(f"  Attributes: {obj.__dict__}")
                 
         # Memory allocations
         print("\nGarbage Collection Information:")
-        print(f"  GC enabled: {gc.isenabled()}")
-        print(f"  GC thresholds: {gc.get_threshold()}")
-        print(f"  Current GC counts: {gc.get_count()}")
-        print(f"  Objects tracked by GC: {len(gc.get_objects())}")
+        stats = self.gc_stats()
+        print(f"  GC enabled: {stats['enabled']}")
+        print(f"  GC thresholds: {stats['thresholds']}")
+        print(f"  Current GC counts: {stats['counts']}")
+        for gen, info in enumerate(stats['generations']):
+            print(f"  Generation {gen}: {info}")
+        print("  Youngest generation by type: " + ", ".join(
+            f"{name} {count}" for name, count in stats['young_types'][:5]))
+        
+        # Deep sizes and allocation sites of a workload
+        nested = {"rows": [[i] * 10 for i in range(100)], "name": "table"}
+        nested["self"] = nested
+        total, by_type = self.deep_sizeof(nested, by_type=True)
+        print(f"\nDeep size of a self-referencing table: {total} bytes "
+              f"(sys.getsizeof says {sys.getsizeof(nested)})")
+        for name, (count, size) in list(by_type.items())[:5]:
+            print(f"  {name}: {count} objects, {size} bytes")
+        
+        diff = self.memory_snapshot_diff(lambda: [str(i) * 10 for i in range(10000)])
+        print(f"\nAllocation diff around a workload: {diff['size_diff']:+} bytes")
+        for site in diff['top'][:5]:
+            print(f"  {site['size_diff']:+10} bytes {site['count_diff']:+7} blocks "
+                  f"{os.path.basename(site['filename'])}:{site['lineno']}")
+        
+    def memory_snapshot_diff(self, workload, *args, top=10, **kwargs):
+        """
+        Run workload(*args, **kwargs) between two tracemalloc snapshots
+        
+        Returns a dict with the workload's result, the net size change and the
+        top allocation sites (by absolute size change). The result is kept
+        alive until the second snapshot, so its memory shows up in the diff.
+        """
+        import tracemalloc
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            result = workload(*args, **kwargs)
+            after = tracemalloc.take_snapshot()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+        stats = after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore), 'lineno')
+        return {
+            'result': result,
+            'size_diff': sum(stat.size_diff for stat in stats),
+            'top': [
+                {
+                    'filename': stat.traceback[0].filename,
+                    'lineno': stat.traceback[0].lineno,
+                    'size_diff': stat.size_diff,
+                    'count_diff': stat.count_diff,
+                    'size': stat.size,
+                }
+                for stat in stats[:top]
+            ],
+        }
+        
+    def deep_sizeof(self, obj, by_type=False):
+        """
+        Total size of obj and everything it references, counting each object once
+        
+        Walks gc.get_referents with an explicit stack, so deep or cyclic
+        structures neither recurse nor loop. Classes, modules and functions are
+        shared rather than owned and are not descended into. With by_type=True
+        also returns {type name: (count, bytes)}, largest first.
+        """
+        import types
+        # Shared, not owned: not descended into
+        skip = (type, types.ModuleType, types.FunctionType,
+                types.BuiltinFunctionType)
+        seen = set()
+        stack = [obj]
+        total = 0
+        types_seen = {}
+        while stack:
+            current = stack.pop()
+            if id(current) in seen or isinstance(current, skip):
+                continue
+            seen.add(id(current))
+            size = sys.getsizeof(current)
+            total += size
+            if by_type:
+                name = type(current).__name__
+                count, nbytes = types_seen.get(name, (0, 0))
+                types_seen[name] = (count + 1, nbytes + size)
+            stack.extend(gc.get_referents(current))
+            if isinstance(current, dict):
+                # dicts with str keys only report their values to the gc
+                stack.extend(current.keys())
+        if not by_type:
+            return total
+        return total, dict(sorted(types_seen.items(), key=lambda kv: -kv[1][1]))
+        
+    def gc_stats(self, generation=0):
+        """
+        Collector state plus per-type counts for one generation
+        
+        Only `generation` is listed (the youngest by default, usually a few
+        hundred objects), instead of every tracked object on the heap.
+        """
+        from collections import Counter
+        young = Counter(type(o).__name__ for o in gc.get_objects(generation))
+        return {
+            'enabled': gc.isenabled(),
+            'thresholds': gc.get_threshold(),
+            'counts': gc.get_count(),
+            'generations': gc.get_stats(),
+            'young_types': young.most_common(),
+        }
+        
+    def measure_gc_pauses(self, workload, *args, **kwargs):
+        """
+        Run workload(*args, **kwargs) recording every garbage collection
+        
+        A gc.callbacks hook times each collection. Returns a dict with the
+        result, elapsed wall time, the individual pauses (generation, duration,
+        collected, uncollectable), a summary and a pause histogram.
+        """
+        pauses = []
+        started = {}
+        
+        def on_gc(phase, info):
+            if phase == 'start':
+                started['t'] = time.perf_counter()
+            elif 't' in started:
+                pauses.append({
+                    'generation': info['generation'],
+                    'duration': time.perf_counter() - started.pop('t'),
+                    'collected': info['collected'],
+                    'uncollectable': info['uncollectable'],
+                })
+        
+        gc.callbacks.append(on_gc)
+        start = time.perf_counter()
+        try:
+            result = workload(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            gc.callbacks.remove(on_gc)
+        durations = [p['duration'] for p in pauses]
+        by_generation = {}
+        for p in pauses:
+            by_generation.setdefault(p['generation'], []).append(p['duration'])
+        return {
+            'result': result,
+            'elapsed': elapsed,
+            'pauses': pauses,
+            'summary': {
+                'collections': len(pauses),
+                'total_pause': sum(durations),
+                'max_pause': max(durations, default=0.0),
+                'p50_pause': _percentile(durations, 0.50),
+                'p99_pause': _percentile(durations, 0.99),
+                'by_generation': {
+                    gen: {'collections': len(d), 'total_pause': sum(d)}
+                    for gen, d in sorted(by_generation.items())
+                },
+            },
+            'histogram': pause_histogram(durations),
+        }
+        
+    def sweep_gc_settings(self, workload, candidates=GC_CANDIDATES, repeat=3):
+        """
+        Measure workload under each (label, thresholds, freeze) candidate
+        
+        Before each candidate the heap is collected and, if freeze is set,
+        everything alive is moved to the permanent generation with gc.freeze().
+        Reports runs per second (best of repeat) and pause statistics over all
+        runs. The original thresholds are restored and the heap unfrozen.
+        
+        gc.unfreeze() cannot tell the sweep's freezes from the caller's, so if
+        objects are already frozen at entry (say a service froze its heap after
+        fork) the freeze candidates are skipped and the permanent generation
+        is left exactly as it was. Objects that were already frozen when this
+        module was imported do not count as the caller's.
+        """
+        original = gc.get_threshold()
+        host_frozen = gc.get_freeze_count() > _BASELINE_FROZEN
+        if host_frozen:
+            candidates = [c for c in candidates if not c[2]]
+        rows = []
+        try:
+            for label, thresholds, freeze in candidates:
+                if not host_frozen:
+                    gc.unfreeze()
+                gc.collect()
+                if freeze:
+                    gc.freeze()
+                gc.set_threshold(*thresholds)
+                runs = [self.measure_gc_pauses(workload) for _ in range(repeat)]
+                durations = [p['duration'] for run in runs for p in run['pauses']]
+                rows.append({
+                    'label': label,
+                    'thresholds': thresholds,
+                    'freeze': freeze,
+                    'throughput': 1 / min(run['elapsed'] for run in runs),
+                    'collections': len(durations) / repeat,
+                    'p99_pause': _percentile(durations, 0.99),
+                    'max_pause': max(durations, default=0.0),
+                })
+        finally:
+            gc.set_threshold(*original)
+            if not host_frozen:
+                gc.unfreeze()
+        return rows
+        
+    def explore_gc_tuning(self):
+        """Measure GC pauses of an allocation-heavy workload and sweep settings"""
+        self.print_separator("GC Pauses and Tuning")
+        
+        def workload():
+            # Cyclic records keep the cycle collector busy
+            records = []
+            for i in range(50_000):
+                record = {'id': i, 'tags': [i, str(i)]}
+                record['self'] = record
+                records.append(record)
+            return len(records)
+        
+        measured = self.measure_gc_pauses(workload)
+        summary = measured['summary']
+        print(f"{summary['collections']} collections in {measured['elapsed']:.3f}s, "
+              f"{summary['total_pause'] * 1000:.2f}ms paused "
+              f"(p99 {summary['p99_pause'] * 1e6:.0f}us, "
+              f"max {summary['max_pause'] * 1e6:.0f}us)")
+        for gen, info in summary['by_generation'].items():
+            print(f"  generation {gen}: {info['collections']} collections, "
+                  f"{info['total_pause'] * 1000:.2f}ms")
+        print("\nPause histogram:")
+        for label, count in measured['histogram']:
+            print(f"  {label:>12} {count:>6} {'#' * min(count, 60)}")
+        
+        print(f"\n{'setting':20} {'runs/s':>8} {'GCs/run':>8} {'p99':>10} {'max':>10}")
+        for row in self.sweep_gc_settings(workload):
+            print(f"{row['label']:20} {row['throughput']:8.2f} "
+                  f"{row['collections']:8.1f} {row['p99_pause'] * 1e6:8.0f}us "
+                  f"{row['max_pause'] * 1e6:8.0f}us")
+        if gc.get_freeze_count() > _BASELINE_FROZEN:
+            print("(heap already frozen: freeze candidates skipped)")
+        
+    def profile_imports(self, module):
+        """Import module in a fresh interpreter under -X importtime; returns the tree"""
+        import subprocess
+        # This script's directory comes after the current one, so the default
+        # module (this file) is found from any working directory
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (here, env.get('PYTHONPATH')) if p)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env)
+        if proc.returncode:
+            lines = proc.stderr.strip().splitlines()
+            raise ImportError(lines[-1] if lines else
+                              f"importing {module} exited with {proc.returncode}")
+        return parse_importtime(proc.stderr)
+        
+    def measure_startup(self, argv, repeat=5):
+        """Best and median wall time of running `python *argv` to completion"""
+        import subprocess
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *argv], capture_output=True, check=True)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return {'min': timings[0], 'median': timings[len(timings) // 2]}
+        
+    def explore_imports(self, module="interpreter_internals", min_ms=1.0):
+        """Show the cumulative import tree of module and this CLI's startup time"""
+        self.print_separator(f"Import Time: {module}")
+        
+        try:
+            roots = self.profile_imports(module)
+        except ImportError as e:
+            print(f"Could not import {module}: {e}")
+            return
+        
+        def show(node, depth):
+            if node['cumulative_us'] < min_ms * 1000:
+                return
+            print(f"{node['cumulative_us'] / 1000:9.2f}ms "
+                  f"{node['self_us'] / 1000:8.2f}ms  {'  ' * depth}{node['name']}")
+            for child in sorted(node['children'], key=lambda c: -c['cumulative_us']):
+                show(child, depth + 1)
+        
+        print(f"{'cumulative':>11} {'self':>10}  module (>= {min_ms}ms)")
+        for root in sorted(roots, key=lambda r: -r['cumulative_us']):
+            show(root, 0)
+        
+        total = sum(root['cumulative_us'] for root in roots)
+        print(f"\nTotal: {total / 1000:.2f}ms across {len(roots)} top-level imports")
+        
+        # Before/after: the same run with EAGER_IMPORTS loaded first, as the
+        # module used to at import time
+        print("\nCLI startup, --section info (best of 5):")
+        for label, eager in (("lazy imports (now)", False), ("eager imports", True)):
+            startup = self.measure_startup(["-c", self._cli_startup_code(eager)])
+            print(f"  {label:20} {startup['min'] * 1000:8.1f}ms")
+        baseline = self.measure_startup(["-c", "pass"])
+        print(f"  {'bare interpreter':20} {baseline['min'] * 1000:8.1f}ms")
+        
+    @staticmethod
+    def _cli_startup_code(eager):
+        """-c source running this CLI's info section, optionally after EAGER_IMPORTS"""
+        script = os.path.abspath(__file__)
+        lines = ["import runpy, sys",
+                 f"sys.path.insert(0, {os.path.dirname(script)!r})",
+                 f"sys.argv = [{script!r}, '--section', 'info']"]
+        if eager:
+            lines.append(f"import {', '.join(EAGER_IMPORTS)}")
+            lines.append("try:\n    import IPython\nexcept ImportError:\n    pass")
+        lines.append(f"runpy.run_path({script!r}, run_name='__main__')")
+        return "\n".join(lines)
         
     def explore_code_objects(self):
         """Explore code objects and function internals"""
         self.print_separator("Code Objects and Function Internals")
+        import dis
         
         # Define a sample function to explore
         def sample_function(a, b=10, *args, **kwargs):
@@ -149,6 +769,7 @@ class PythonInternalsExplorer:
     def explore_frame_objects(self):
         """Explore frame objects and execution model"""
         self.print_separator("Frame Objects and Execution Model")
+        import inspect
         
         # Function to examine its own frame
         def frame_inspector():
@@ -170,32 +791,209 @@ class PythonInternalsExplorer:
             # Print the call stack
             print("\nCall stack:")
             for frame_info in inspect.stack():
-                print(f"  {frame_info.function} at {frame_info.filename}:{frame_info.lineno}")
+                print(f"  {frame_info.function} at "
+                      f"{frame_info.filename}:{frame_info.lineno}")
                 
         # Call the frame inspector
         frame_inspector()
         
+    def explore_stack_sampling(self, interval=0.01, output=None):
+        """Sample the stacks of a CPU-bound workload and report the hottest ones"""
+        self.print_separator("Stack Sampling Profiler")
+        
+        def fib(n):
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+        
+        def parse(n):
+            return [int(str(i) * 3) for i in range(n)]
+        
+        def workload():
+            for _ in range(5):
+                fib(22)
+                parse(50_000)
+        
+        start = time.perf_counter()
+        workload()
+        bare = time.perf_counter() - start
+        
+        with StackSampler(interval=interval) as sampler:
+            start = time.perf_counter()
+            workload()
+            sampled = time.perf_counter() - start
+        
+        print(f"{sampler.samples} samples at {1 / interval:.0f}Hz over "
+              f"{sampler.duration:.2f}s; workload {bare:.3f}s bare, "
+              f"{sampled:.3f}s sampled ({sampled / bare - 1:+.1%})")
+        print("\nHottest stacks (collapsed format, leaf last):")
+        for line in sampler.collapsed()[:8]:
+            stack, count = line.rsplit(" ", 1)
+            print(f"  {count:>5}  ...{';'.join(stack.split(';')[-3:])}")
+        if output:
+            if output.endswith(".json"):
+                sampler.write_speedscope(output)
+            else:
+                sampler.write_collapsed(output)
+            print(f"\nWrote {output}")
+        
     def explore_interpreter_state(self):
         """Explore the interpreter state and thread state"""
         self.print_separator("Interpreter State and Thread State")
+        import threading
         
         print("Thread State Information:")
         print(f"  Current thread: {threading.current_thread().name}")
         print(f"  Thread count: {threading.active_count()}")
-        print(f"  Thread identifiers: {[t.ident for t in threading.enumerate()]}")
+        for t in threading.enumerate():
+            print(f"  Thread {t.name}: ident={t.ident} native_id={t.native_id} "
+                  f"daemon={t.daemon}")
         
         print("\nInterpreter Internals (limited access in pure Python):")
-        print(f"  Check interval: {sys.getcheckinterval()}")
         print(f"  Switch interval: {sys.getswitchinterval()}")
         print(f"  Default encoding: {sys.getdefaultencoding()}")
         print(f"  File system encoding: {sys.getfilesystemencoding()}")
         
         # This would require C extension modules to fully explore
-        print("\nNote: For deeper interpreter state inspection, C extension modules are needed")
+        print("\nNote: For deeper interpreter state inspection, "
+              "C extension modules are needed")
+        
+        def cpu_bound():
+            total = 0
+            for i in range(2_000_000):
+                total += i * i
+            return total
+        
+        def io_bound():
+            for _ in range(20):
+                time.sleep(0.01)
+        
+        for name, workload in (("CPU-bound", cpu_bound), ("I/O-bound", io_bound)):
+            report = self.measure_gil_contention(workload, threads=4)
+            print(f"\nGIL contention, {name} workload in 4 threads:")
+            for run in report['runs']:
+                print(f"  switch interval {run['switch_interval'] * 1000:g}ms: "
+                      f"probe waited {run['probe']['wait_ratio']:.0%} of the time "
+                      f"({run['probe']['slowdown']:.1f}x slower), workload "
+                      f"{run['wall']:.3f}s using {run['cores_used']:.2f} cores")
+            for t in report['runs'][0]['threads']:
+                print(f"    {t['name']}: {t['cpu']:.3f}s CPU of {t['wall']:.3f}s wall")
+            print(f"  Recommendation: {report['recommendation']}")
+        
+    def _spin_probe(self, keep_running, chunk=10_000):
+        """Spin while keep_running(); returns (iterations, wall time, CPU time)"""
+        iterations = 0
+        wall, cpu = time.perf_counter(), time.thread_time()
+        while keep_running():
+            for _ in range(chunk):
+                pass
+            iterations += chunk
+        return iterations, time.perf_counter() - wall, time.thread_time() - cpu
+        
+    def measure_gil_contention(self, workload, threads=2,
+                               switch_intervals=(0.005, 0.001), calibrate=0.1):
+        """
+        Estimate how much a threaded workload contends for the GIL
+        
+        A CPU-spin probe is first timed alone, then run in its own thread next
+        to `threads` threads each calling workload(), once per switch interval.
+        While blocked on the GIL the probe burns no CPU, so its wait ratio is
+        1 - thread CPU time / wall time. Per-thread CPU comes from
+        time.thread_time(). The original switch interval is restored.
+        
+        Returns {'baseline_rate', 'runs': [...], 'recommendation'}. An exception
+        raised by workload in any thread is re-raised here.
+        """
+        import threading
+        
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        if not switch_intervals:
+            raise ValueError("switch_intervals must not be empty")
+        deadline = time.perf_counter() + calibrate
+        iterations, wall, _ = self._spin_probe(lambda: time.perf_counter() < deadline)
+        baseline_rate = iterations / wall
+        
+        original = sys.getswitchinterval()
+        runs = []
+        try:
+            for interval in switch_intervals:
+                sys.setswitchinterval(interval)
+                stats = []
+                errors = []
+                
+                def worker():
+                    wall, cpu = time.perf_counter(), time.thread_time()
+                    try:
+                        workload()
+                    except BaseException as e:
+                        errors.append(e)
+                        return
+                    stats.append({
+                        'name': threading.current_thread().name,
+                        'cpu': time.thread_time() - cpu,
+                        'wall': time.perf_counter() - wall,
+                    })
+                
+                workers = [threading.Thread(target=worker, name=f"worker-{i}")
+                           for i in range(threads)]
+                probe = {}
+                
+                def running():
+                    return any(w.is_alive() for w in workers)
+                
+                def run_probe():
+                    probe['iterations'], probe['wall'], probe['cpu'] = \
+                        self._spin_probe(running)
+                
+                prober = threading.Thread(target=run_probe, name="gil-probe")
+                start = time.perf_counter()
+                for w in workers:
+                    w.start()
+                prober.start()
+                for w in workers:
+                    w.join()
+                wall = time.perf_counter() - start
+                prober.join()
+                if errors:
+                    raise errors[0]
+                rate = probe['iterations'] / probe['wall'] if probe['wall'] else 0
+                runs.append({
+                    'switch_interval': interval,
+                    'wall': wall,
+                    'cores_used': sum(t['cpu'] for t in stats) / wall,
+                    'threads': sorted(stats, key=lambda t: t['name']),
+                    'probe': {
+                        **probe,
+                        'wait_ratio': (max(0.0, 1 - probe['cpu'] / probe['wall'])
+                                       if probe['wall'] else 0.0),
+                        'slowdown': baseline_rate / rate if rate else float('inf'),
+                    },
+                })
+        finally:
+            sys.setswitchinterval(original)
+        
+        first = runs[0]
+        if first['probe']['wait_ratio'] > 0.5 and first['cores_used'] < 1.5:
+            recommendation = (
+                f"GIL-bound: {threads} threads kept only {first['cores_used']:.2f} "
+                f"cores busy and the probe waited "
+                f"{first['probe']['wait_ratio']:.0%} of the time. Move this "
+                f"workload to processes (multiprocessing / ProcessPoolExecutor).")
+        elif first['cores_used'] >= 1.5:
+            recommendation = (
+                f"Threads already use {first['cores_used']:.2f} cores (the work "
+                f"releases the GIL); threads are fine.")
+        else:
+            recommendation = (
+                "Threads mostly wait outside the GIL (I/O or sleeps); threads are "
+                "fine, processes would add only overhead.")
+        return {'baseline_rate': baseline_rate, 'runs': runs,
+                'recommendation': recommendation}
         
     def explore_extension_modules(self):
         """Explore Python's C API and extension modules"""
         self.print_separator("C API and Extension Modules")
+        import ctypes
+        import importlib
         
         # List built-in modules
         print("Built-in modules:")
@@ -232,7 +1030,9 @@ class PythonInternalsExplorer:
         """Explore IPython specific internals"""
         self.print_separator("IPython Integration")
         
-        if not IPYTHON_AVAILABLE:
+        try:
+            import IPython
+        except ImportError:
             print("IPython is not available in this environment.")
             return
             
@@ -255,7 +1055,8 @@ class PythonInternalsExplorer:
             ip = get_ipython()
             print(f"  Profile: {ip.profile}")
             print(f"  User namespace: {list(ip.user_ns_hidden)[:10]}...")
-            print(f"  Magic functions: {list(ip.magics_manager.magics['line'].keys())[:10]}...")
+            line_magics = list(ip.magics_manager.magics['line'])
+            print(f"  Magic functions: {line_magics[:10]}...")
             
         # Print IPython extension mechanism
         print("\nIPython Extension System:")
@@ -265,6 +1066,7 @@ class PythonInternalsExplorer:
     def explore_bytecode_execution(self):
         """Explore bytecode execution and VM operations"""
         self.print_separator("Bytecode Execution and VM Operations")
+        import dis
         
         # Define a simple function to explore
         def fib(n):
@@ -327,7 +1129,8 @@ class PythonInternalsExplorer:
                 
                 print(f"  Magic number: {magic.hex()}")
                 print(f"  Bit field: {bit_field.hex()}")
-                print(f"  Source size: {int.from_bytes(source_size, byteorder='little')}")
+                size = int.from_bytes(source_size, byteorder='little')
+                print(f"  Source size: {size}")
                 print(f"  Source hash: {source_hash.hex()}")
                 
                 # Load code object
@@ -348,28 +1151,149 @@ class PythonInternalsExplorer:
         except:
             pass
         
+    def profile_opcodes(self, target, *args, sample_every=1, max_events=None,
+                        **kwargs):
+        """
+        Run target(*args, **kwargs) counting every bytecode instruction it executes
+        
+        Python 3.12+ uses sys.monitoring INSTRUCTION events. Older interpreters
+        fall back to sys.settrace with frame.f_trace_opcodes. With sample_every=N
+        counts are scaled by N to estimate the full run: sys.settrace traces
+        only one call in N, which bounds the overhead; sys.monitoring records
+        each instruction with probability 1/N, using random gaps so that a
+        loop body cannot alias with the stride, which saves the bookkeeping
+        but not the callback. Counting stops after max_events instructions.
+        Returns an OpcodeProfile.
+        """
+        from collections import Counter
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        counts = Counter()
+        state = {'events': 0, 'calls': 0, 'truncated': False, 'next': 1}
+        limit = max_events or float('inf')
+        monitoring = getattr(sys, 'monitoring', None)
+        
+        if monitoring is not None:
+            import math
+            import random
+            tool = monitoring.PROFILER_ID
+            events = monitoring.events
+            rng = random.Random(0)
+            log_miss = math.log(1 - 1 / sample_every) if sample_every > 1 else 0.0
+            
+            def on_instruction(code, offset):
+                state['events'] += 1
+                if state['events'] >= state['next']:
+                    if log_miss:
+                        # Geometric gap with mean sample_every
+                        state['next'] += 1 + int(math.log(1 - rng.random()) / log_miss)
+                    else:
+                        state['next'] += 1
+                    counts[(code, offset)] += sample_every
+                if state['events'] >= limit:
+                    state['truncated'] = True
+                    monitoring.set_events(tool, events.NO_EVENTS)
+                    
+            monitoring.use_tool_id(tool, "opcode-profiler")
+            monitoring.register_callback(tool, events.INSTRUCTION, on_instruction)
+            monitoring.set_events(tool, events.INSTRUCTION)
+            start = time.perf_counter()
+            try:
+                result = target(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                monitoring.set_events(tool, events.NO_EVENTS)
+                monitoring.register_callback(tool, events.INSTRUCTION, None)
+                monitoring.free_tool_id(tool)
+            return OpcodeProfile(counts, result, elapsed, "sys.monitoring",
+                                 sample_every, state['truncated'])
+        
+        def trace_opcodes(frame, event, arg):
+            if event == 'opcode':
+                counts[(frame.f_code, frame.f_lasti)] += sample_every
+                state['events'] += 1
+                if state['events'] >= limit:
+                    state['truncated'] = True
+                    sys.settrace(None)
+                    frame.f_trace = None
+                    return None
+            return trace_opcodes
+            
+        def trace_calls(frame, event, arg):
+            state['calls'] += 1
+            if state['calls'] % sample_every:
+                return None
+            # Set f_trace first: 3.13 ignores f_trace_opcodes on a frame
+            # without a trace function once sys.monitoring has been used.
+            frame.f_trace = trace_opcodes
+            frame.f_trace_opcodes = True
+            return trace_opcodes
+            
+        # 3.12 only adds opcode events to sys.settrace once some frame has
+        # asked for them; without this the first profile sees none.
+        caller = sys._getframe()
+        caller.f_trace_opcodes = True
+        caller.f_trace_opcodes = False
+        previous = sys.gettrace()
+        sys.settrace(trace_calls)
+        start = time.perf_counter()
+        try:
+            result = target(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            sys.settrace(previous)
+        return OpcodeProfile(counts, result, elapsed, "f_trace_opcodes", sample_every,
+                             state['truncated'])
+        
+    def explore_opcode_profile(self):
+        """Profile executed bytecode of a small workload and map it onto dis"""
+        self.print_separator("Opcode Execution Profile")
+        
+        def fib(n):
+            a, b = 0, 1
+            for i in range(n):
+                a, b = b, a + b
+            return a
+        
+        def workload():
+            return [fib(n) for n in range(200)]
+        
+        profile = self.profile_opcodes(workload)
+        print(profile.hot_spots())
+        print("\nfib, annotated with execution counts:")
+        print(profile.annotate(fib.__code__))
+        
+        sampled = self.profile_opcodes(workload, sample_every=10)
+        print(f"\nWith 1-in-10 call sampling: ~{sampled.total} instructions "
+              f"in {sampled.elapsed:.3f}s (exact: {profile.total})")
+        
     def explore_all(self):
         """Run all exploration functions"""
         self.explore_interpreter_info()
         self.explore_memory_management()
+        self.explore_gc_tuning()
         self.explore_code_objects()
         self.explore_frame_objects()
+        self.explore_stack_sampling()
         
         # These explorations may require additional setup
         try:
             import threading
             self.explore_interpreter_state()
         except ImportError:
-            self.print_separator("Interpreter State - SKIPPED (threading module not available)")
+            self.print_separator(
+                "Interpreter State - SKIPPED (threading module not available)")
         
         self.explore_extension_modules()
         
         if IPYTHON_AVAILABLE:
             self.explore_ipython_integration()
         else:
-            self.print_separator("IPython Integration - SKIPPED (IPython not available)")
+            self.print_separator(
+                "IPython Integration - SKIPPED (IPython not available)")
             
         self.explore_bytecode_execution()
+        self.explore_opcode_profile()
         
         self.print_separator("Exploration Complete")
 
@@ -379,9 +1303,17 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Explore Python interpreter internals")
     parser.add_argument('--section', choices=[
-        'info', 'memory', 'code', 'frame', 'state', 
-        'extensions', 'ipython', 'bytecode', 'all'
+        'info', 'memory', 'gc', 'code', 'frame', 'state',
+        'extensions', 'ipython', 'bytecode', 'opcodes', 'imports', 'sampling',
+        'all'
     ], default='all', help="Specific section to explore")
+    parser.add_argument('--module', default='interpreter_internals',
+                        help="Module whose imports --section imports profiles")
+    parser.add_argument('--interval', type=float, default=0.01,
+                        help="Seconds between stack samples for --section sampling")
+    parser.add_argument('--output',
+                        help="Write --section sampling stacks here (.json: speedscope, "
+                             "otherwise collapsed)")
     
     args = parser.parse_args()
     
@@ -391,12 +1323,13 @@ if __name__ == "__main__":
         explorer.explore_interpreter_info()
     elif args.section == 'memory':
         explorer.explore_memory_management()
+    elif args.section == 'gc':
+        explorer.explore_gc_tuning()
     elif args.section == 'code':
         explorer.explore_code_objects()
     elif args.section == 'frame':
         explorer.explore_frame_objects()
     elif args.section == 'state':
-        import threading
         explorer.explore_interpreter_state()
     elif args.section == 'extensions':
         explorer.explore_extension_modules()
@@ -404,5 +1337,11 @@ if __name__ == "__main__":
         explorer.explore_ipython_integration()
     elif args.section == 'bytecode':
         explorer.explore_bytecode_execution()
+    elif args.section == 'opcodes':
+        explorer.explore_opcode_profile()
+    elif args.section == 'imports':
+        explorer.explore_imports(args.module)
+    elif args.section == 'sampling':
+        explorer.explore_stack_sampling(args.interval, args.output)
     else:
         explorer.explore_all()
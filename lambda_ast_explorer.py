@@ -1,7 +1,11 @@
 # lambda_ast_explorer.py
 
 import ast
+import argparse
+import heapq
 import inspect
+import json
+import sys
 import types
 import dis
 import textwrap
@@ -43,7 +47,80 @@ def print_list(lst):
             current = None
     return result
 
-def explore_ast(source_code):
+def iter_nodes(tree, max_depth=None):
+    """Yield one record per AST node in pre-order, without building a list"""
+    stack = [(tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        children = list(ast.iter_child_nodes(node))
+        yield {
+            "type": type(node).__name__,
+            "lineno": getattr(node, "lineno", None),
+            "col": getattr(node, "col_offset", None),
+            "depth": depth,
+            "children": len(children),
+        }
+        if max_depth is None or depth < max_depth:
+            stack.extend((child, depth + 1) for child in reversed(children))
+
+def subtree_summary(tree, top=10):
+    """Compute subtree sizes in one iterative post-order pass and summarize them"""
+    by_type = {}
+    largest = []  # min-heap of (size, order, type, lineno)
+    total = max_depth = 0
+    # Each frame is [node, child iterator, size so far]
+    stack = [[tree, ast.iter_child_nodes(tree), 1]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is not None:
+            stack.append([child, ast.iter_child_nodes(child), 1])
+            max_depth = max(max_depth, len(stack) - 1)
+            continue
+        stack.pop()
+        node, _, size = frame
+        if stack:
+            stack[-1][2] += size
+        total += 1
+        name = type(node).__name__
+        count, nodes = by_type.get(name, (0, 0))
+        by_type[name] = (count + 1, nodes + size)
+        entry = (size, total, name, getattr(node, "lineno", None))
+        if len(largest) < top:
+            heapq.heappush(largest, entry)
+        elif size > largest[0][0]:
+            heapq.heapreplace(largest, entry)
+    return {
+        "nodes": total,
+        "max_depth": max_depth,
+        "by_type": {
+            name: {"count": count, "subtree_nodes": nodes}
+            for name, (count, nodes) in sorted(
+                by_type.items(), key=lambda item: -item[1][0]
+            )
+        },
+        "largest_subtrees": [
+            {"type": name, "lineno": lineno, "size": size}
+            for size, _, name, lineno in sorted(largest, reverse=True)
+        ],
+    }
+
+def stream_ast(source_code, out=None, max_depth=None, json_lines=False):
+    """Write one line per node to out as it is visited; returns the node count"""
+    out = out or sys.stdout
+    count = 0
+    for record in iter_nodes(ast.parse(source_code), max_depth):
+        if json_lines:
+            out.write(json.dumps(record) + "\n")
+        else:
+            out.write(
+                f"{'  ' * record['depth']}{record['type']} "
+                f"line={record['lineno']} children={record['children']}\n"
+            )
+        count += 1
+    return count
+
+def explore_ast(source_code, max_depth=None, execute=True):
     """Parse Python code into an AST and display its structure"""
     print(f"\n{'='*60}")
     print(f"AST for: {source_code}")
@@ -52,15 +129,25 @@ def explore_ast(source_code):
     # Parse the source code into an AST
     parsed_ast = ast.parse(source_code)
     
-    # Pretty print the AST 
+    # One line per node; ast.dump of every node re-serialized whole subtrees
     print("Raw AST structure:")
-    for node in ast.walk(parsed_ast):
-        print(f"{type(node).__name__}: {ast.dump(node)}")
+    for record in iter_nodes(parsed_ast, max_depth):
+        print(f"{'  ' * record['depth']}{record['type']} "
+              f"(line {record['lineno']}, {record['children']} children)")
     
-    # Compile and execute the code
-    compiled_code = compile(parsed_ast, '<string>', 'exec')
     local_vars = {}
-    global_vars = globals().copy()
+    if not execute:
+        return local_vars
+    
+    # Compile and execute the code against the list helpers only
+    compiled_code = compile(parsed_ast, '<string>', 'exec')
+    global_vars = {
+        "pair": pair,
+        "first": first,
+        "rest": rest,
+        "make_list": make_list,
+        "print_list": print_list,
+    }
     
     print("\nExecuting code and inspecting bytecode...")
     exec(compiled_code, global_vars, local_vars)
@@ -75,7 +162,10 @@ def explore_ast(source_code):
             if isinstance(obj, types.LambdaType):
                 print(f"\nLambda function details:")
                 print(f"  Name: {obj.__name__}")
-                print(f"  Code: {inspect.getsource(obj)}")
+                try:
+                    print(f"  Code: {inspect.getsource(obj)}")
+                except OSError:
+                    print("  Code: <source unavailable for exec'd code>")
                 print(f"  Closure: {obj.__closure__}")
                 
                 # Try to evaluate it for demonstration
@@ -87,7 +177,33 @@ def explore_ast(source_code):
     
     return local_vars
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Stream the AST of a file, or run the interactive examples without one"""
+    parser = argparse.ArgumentParser(description="Explore Python ASTs")
+    parser.add_argument("file", nargs="?",
+                        help="Python file to explore ('-' for stdin)")
+    parser.add_argument("--max-depth", type=int,
+                        help="Do not descend below this depth")
+    parser.add_argument("--jsonl", action="store_true", help="Emit JSON lines")
+    parser.add_argument("--summary", action="store_true",
+                        help="Print subtree-size summary instead of nodes")
+    args = parser.parse_args(argv)
+
+    if args.file is None:
+        run_examples()
+        return
+    if args.file == "-":
+        source = sys.stdin.read()
+    else:
+        with open(args.file) as f:
+            source = f.read()
+    if args.summary:
+        print(json.dumps(subtree_summary(ast.parse(source)), indent=2))
+    else:
+        stream_ast(source, max_depth=args.max_depth, json_lines=args.jsonl)
+
+def run_examples():
+    """Explore the built-in examples, then one line of user input"""
     # Example 1: Simple pair
     example1 = """
 p = pair(1, 2)
@@ -116,3 +232,6 @@ twice = lambda f: lambda x: f(f(x))
     user_code = input("> ")
     if user_code:
         result4 = explore_ast(user_code)
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,18 @@ Plus basic list operations (pair, first, rest) in a functional style.
 
 When used in IPython/Python-mode, you can set breakpoints and
 inspect the execution flow of these higher-order functions.
+
+For symbolic reduction there is also a de Bruijn term representation
+(Var, Lam, App) with a call-by-need normal-order reducer, normalize().
 """
 
+import gc
+import re
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
 
 # Basic combinators
 def I(x):
@@ -63,6 +73,108 @@ def Y(f):
     return g(g)
 
 
+# Memoizing fixed point
+#
+# Y rebuilds h(h) on every recursive call and remembers nothing, so
+# Y(fibonacci_gen) is exponential.  Y_memo ties the knot once: f receives a
+# single wrapper that consults a cache before running f's body, and that same
+# wrapper is returned.  Any object with get(key, default) and item assignment
+# works as the cache; LRUCache bounds it and can hold its keys weakly.
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Least-recently-used cache holding at most maxsize entries.
+
+    With weak_keys=True entries are dropped as soon as their key is garbage
+    collected, so keys must support weak references (ints do not).  A tuple
+    key, such as the argument tuples Y_memo uses, is held as a tuple of weak
+    references and dropped when any of its elements is collected.
+    """
+
+    def __init__(self, maxsize=128, weak_keys=False):
+        self.maxsize = maxsize
+        self.weak_keys = weak_keys
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def _key(self, key, store=False):
+        if not self.weak_keys:
+            return key
+        if not store:
+            if isinstance(key, tuple):
+                return tuple(weakref.ref(k) for k in key)
+            return weakref.ref(key)
+        data = self._data
+        if isinstance(key, tuple):
+            refs = tuple(weakref.ref(k, lambda ref: data.pop(refs, None)) for k in key)
+            return refs
+        return weakref.ref(key, lambda ref: data.pop(ref, None))
+
+    def get(self, key, default=None):
+        key = self._key(key)
+        try:
+            value = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        key = self._key(key, store=True)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+
+def Y_memo(f, cache=None):
+    """
+    Memoizing fixed-point combinator.
+
+    Calls are cached under the tuple of positional arguments, so f(x) and
+    f((x,)) never share an entry.  The returned function has cache_info()
+    and cache_clear() like functools.lru_cache.
+    """
+    if cache is None:
+        cache = LRUCache()
+    hits = misses = 0
+
+    def fixed(*args):
+        nonlocal hits, misses
+        value = cache.get(args, _MISSING)
+        if value is not _MISSING:
+            hits += 1
+            return value
+        misses += 1
+        value = body(*args)
+        cache[args] = value
+        return value
+
+    def cache_info():
+        return CacheInfo(hits, misses, getattr(cache, "maxsize", None), len(cache))
+
+    def cache_clear():
+        nonlocal hits, misses
+        cache.clear()
+        hits = misses = 0
+
+    body = f(fixed)
+    fixed.cache = cache
+    fixed.cache_info = cache_info
+    fixed.cache_clear = cache_clear
+    return fixed
+
+
 # Functional pair implementation
 def pair(first, rest):
     """Create a pair: λx.λy.λf.fxy"""
@@ -84,45 +196,93 @@ def rest(p):
 
 
 # Example of a list using pairs
+#
+# A list is None or pair(head, rest).  Every operation below walks the list
+# with a loop and rebuilds results from a reversed Python list, so none of
+# them recurse and lists of millions of elements are fine.
 def make_list(*elements):
     """Create a list from elements using pairs"""
+    return from_python_list(elements)
+
+
+def from_python_list(items):
+    """Build a pair-list from any iterable without recursion"""
+    if not isinstance(items, (list, tuple, range)):
+        items = list(items)
     result = None
-    for element in reversed(elements):
+    for element in reversed(items):
         result = pair(element, result)
     return result
 
 
+def _unpair(x, y):
+    return x, y
+
+
+def iter_list(lst):
+    """Stream the elements of a pair-list"""
+    # One selector call yields both halves, instead of separate first/rest calls.
+    current = lst
+    while current is not None:
+        head, current = current(_unpair)
+        yield head
+
+
 def map_list(func, lst):
     """Map a function over a list implemented as pairs"""
-    if lst is None:
-        return None
-    return pair(func(first(lst)), map_list(func, rest(lst)))
+    return from_python_list([func(x) for x in iter_list(lst)])
 
 
 def filter_list(predicate, lst):
     """Filter a list implemented as pairs"""
-    if lst is None:
-        return None
-
-    head = first(lst)
-    tail = rest(lst)
-
-    if predicate(head):
-        return pair(head, filter_list(predicate, tail))
-    else:
-        return filter_list(predicate, tail)
+    return from_python_list([x for x in iter_list(lst) if predicate(x)])
 
 
 def to_python_list(lst):
     """Convert our functional list to a Python list"""
-    result = []
-    current = lst
-
-    while current is not None:
-        result.append(first(current))
-        current = rest(current)
-
-    return result
+    return list(iter_list(lst))
+
+
+def benchmark_list_operations(n=10**6):
+    """Time each pair-list operation on a list of n elements"""
+    timings = []
+
+    def timed(label, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append((label, time.perf_counter() - start))
+        return result
+
+    # Each pair is a new closure tracked by the cyclic GC, and a million of them
+    # trigger several full collections that scan everything built so far.  The
+    # chains are acyclic, so the benchmark pauses collection while it runs and
+    # restores whatever state the caller had.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _run_list_operations(timed, n)
+    finally:
+        if was_enabled:
+            gc.enable()
+    return timings
+
+
+def _run_list_operations(timed, n):
+    lst = timed("from_python_list", from_python_list, range(n))
+    timed("iter_list", lambda: sum(1 for _ in iter_list(lst)))
+    timed("first/rest walk", lambda: _walk_with_first_rest(lst))
+    timed("map_list", map_list, lambda x: x * 2, lst)
+    timed("filter_list", filter_list, lambda x: x % 2 == 0, lst)
+    timed("to_python_list", to_python_list, lst)
+
+
+def _walk_with_first_rest(lst):
+    count = 0
+    while lst is not None:
+        first(lst)
+        lst = rest(lst)
+        count += 1
+    return count
 
 
 # Demonstration with factorial using Y combinator
@@ -138,6 +298,629 @@ def factorial_gen(f):
 
 factorial = Y(factorial_gen)
 
+
+def fibonacci_gen(f):
+    def fibonacci(n):
+        if n < 2:
+            return n
+        return f(n - 1) + f(n - 2)
+
+    return fibonacci
+
+
+def benchmark_fixed_points(fib_n=24, fact_n=200, calls=1000):
+    """
+    Compare Y, Y_memo and functools.lru_cache on exponential fibonacci and
+    on per-call overhead of an already warm factorial.
+    """
+    rows = []
+
+    def timed(label, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        rows.append((label, time.perf_counter() - start))
+
+    @lru_cache(maxsize=128)
+    def fib_lru(n):
+        return n if n < 2 else fib_lru(n - 1) + fib_lru(n - 2)
+
+    @lru_cache(maxsize=None)
+    def fact_lru(n):
+        return 1 if n == 0 else n * fact_lru(n - 1)
+
+    timed(f"Y fibonacci({fib_n})", Y(fibonacci_gen), fib_n)
+    timed(f"Y_memo fibonacci({fib_n})", Y_memo(fibonacci_gen), fib_n)
+    timed(f"lru_cache fibonacci({fib_n})", fib_lru, fib_n)
+
+    fact_y = Y(factorial_gen)
+    fact_memo = Y_memo(factorial_gen, LRUCache(maxsize=None))
+    fact_memo(fact_n)
+    fact_lru(fact_n)
+    variants = (("Y", fact_y), ("Y_memo warm", fact_memo), ("lru_cache warm", fact_lru))
+    for label, fn in variants:
+        timed(f"{label} factorial({fact_n}) x{calls}", _repeat, fn, fact_n, calls)
+    return rows
+
+
+def _repeat(fn, arg, times):
+    for _ in range(times):
+        fn(arg)
+
+
+# Symbolic lambda terms
+#
+# The combinators above are Python closures, so Python evaluates them.  The
+# terms below are data: Var/Lam/App nodes with de Bruijn indices, reduced by
+# normalize() to beta-normal form.
+#
+# normalize() is normalisation by evaluation on a lazy Krivine machine.
+# Arguments become thunks that are evaluated at most once and then updated in
+# place (call-by-need), so a shared argument is never reduced twice, which is
+# what makes naive substitution blow up.  Evaluation stops at weak head normal
+# form; read-back then continues under binders, forcing only the arguments
+# that appear in the normal form, so the strategy is normal order.  Both the
+# machine and the read-back use explicit stacks, so terms as deep as a Church
+# numeral for 10^5 do not hit the recursion limit.
+class Var:
+    """Variable, as a de Bruijn index (0 = innermost binder)."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    def __eq__(self, other):
+        return type(other) is Var and other.index == self.index
+
+    def __repr__(self):
+        return str(self.index)
+
+
+class Lam:
+    """Abstraction: λ.body"""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body):
+        self.body = body
+
+    def __eq__(self, other):
+        return type(other) is Lam and other.body == self.body
+
+    def __repr__(self):
+        return f"λ.{self.body!r}"
+
+
+class App:
+    """Application: fn arg"""
+
+    __slots__ = ("fn", "arg")
+
+    def __init__(self, fn, arg):
+        self.fn = fn
+        self.arg = arg
+
+    def __eq__(self, other):
+        return type(other) is App and other.fn == self.fn and other.arg == self.arg
+
+    def __repr__(self):
+        fn = f"({self.fn!r})" if type(self.fn) is Lam else repr(self.fn)
+        arg = f"({self.arg!r})" if type(self.arg) is not Var else repr(self.arg)
+        return f"{fn} {arg}"
+
+
+class ReductionLimitExceeded(RuntimeError):
+    """Raised when normalize() uses up its step budget."""
+
+    def __init__(self, steps):
+        super().__init__(f"reduction budget exhausted after {steps} steps")
+        self.steps = steps
+
+
+_TOKEN = re.compile(r"\s*(?:(λ|\\)|([A-Za-z_][A-Za-z0-9_']*)|(\d+)|(.))")
+
+
+def parse_term(source, definitions=None):
+    """
+    Parse a named lambda term into de Bruijn form.
+
+    Accepts λ or \\ for binders, ``λx y.body`` for nested binders, application
+    by juxtaposition, parentheses, and decimal literals as Church numerals.
+    Free names are looked up in ``definitions``.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(source.strip()):
+        lam, name, number, other = match.groups()
+        if lam:
+            tokens.append(("λ", None))
+        elif name:
+            tokens.append(("name", name))
+        elif number:
+            tokens.append(("number", int(number)))
+        elif other in "().":
+            tokens.append((other, None))
+        else:
+            raise ValueError(f"Unexpected character: {other!r}")
+    definitions = definitions or {}
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def expect(kind):
+        nonlocal pos
+        if peek() != kind:
+            raise ValueError(f"Expected {kind!r} at token {pos}")
+        pos += 1
+        return tokens[pos - 1][1]
+
+    def term(scope):
+        nonlocal pos
+        if peek() == "λ":
+            pos += 1
+            names = [expect("name")]
+            while peek() == "name":
+                names.append(expect("name"))
+            expect(".")
+            body = term(scope + names)
+            for _ in names:
+                body = Lam(body)
+            return body
+        result = None
+        while peek() in ("name", "number", "(", "λ"):
+            if peek() == "λ":
+                node = term(scope)
+            else:
+                node = atom(scope)
+            result = node if result is None else App(result, node)
+        if result is None:
+            raise ValueError(f"Expected a term at token {pos}")
+        return result
+
+    def atom(scope):
+        nonlocal pos
+        kind, value = tokens[pos]
+        pos += 1
+        if kind == "(":
+            inner = term(scope)
+            expect(")")
+            return inner
+        if kind == "number":
+            return church(value)
+        if value in scope:
+            return Var(scope[::-1].index(value))
+        if value in definitions:
+            return definitions[value]
+        raise ValueError(f"Unbound variable: {value}")
+
+    result = term([])
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected token at {pos}")
+    return result
+
+
+def church(n):
+    """Church numeral term for n: λf.λx.f (f ... (f x))"""
+    body = Var(0)
+    for _ in range(n):
+        body = App(Var(1), body)
+    return Lam(Lam(body))
+
+
+def church_to_int(term):
+    """Decode a Church numeral in normal form back to an int."""
+    if type(term) is Lam and type(term.body) is Lam:
+        count = 0
+        body = term.body.body
+        while type(body) is App and body.fn == Var(1):
+            count += 1
+            body = body.arg
+        if body == Var(0):
+            return count
+    raise ValueError(f"Not a Church numeral: {term!r}")
+
+
+class _Thunk:
+    __slots__ = ("term", "env", "value")
+
+    def __init__(self, term, env, value=None):
+        self.term = term
+        self.env = env
+        self.value = value
+
+
+class _Closure:
+    __slots__ = ("body", "env")
+
+    def __init__(self, body, env):
+        self.body = body
+        self.env = env
+
+
+class _Neutral:
+    # A variable bound outside the term being evaluated (identified by its
+    # binder depth) applied to a cons list of argument thunks, newest first.
+    __slots__ = ("level", "args")
+
+    def __init__(self, level, args):
+        self.level = level
+        self.args = args
+
+
+class _Update:
+    __slots__ = ("thunk",)
+
+    def __init__(self, thunk):
+        self.thunk = thunk
+
+
+class _Machine:
+    def __init__(self, max_steps):
+        self.steps = 0
+        self.max_steps = max_steps
+
+    def beta(self):
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ReductionLimitExceeded(self.max_steps)
+
+    def force(self, thunk):
+        if thunk.value is None:
+            self.whnf(thunk.term, thunk.env, [_Update(thunk)])
+        return thunk.value
+
+    def whnf(self, term, env, stack):
+        """Run the machine until term is in weak head normal form."""
+        while True:
+            kind = type(term)
+            if kind is App:
+                stack.append(_Thunk(term.arg, env))
+                term = term.fn
+                continue
+            if kind is Lam:
+                if stack and type(stack[-1]) is _Thunk:
+                    self.beta()
+                    env = (stack.pop(), env)
+                    term = term.body
+                    continue
+                value = _Closure(term.body, env)
+            else:
+                index = term.index
+                while index:
+                    env = env[1]
+                    index -= 1
+                thunk = env[0]
+                if thunk.value is None:
+                    stack.append(_Update(thunk))
+                    term, env = thunk.term, thunk.env
+                    continue
+                value = thunk.value
+
+            # Unwind: update pending thunks, apply closures to waiting args.
+            while stack:
+                top = stack.pop()
+                if type(top) is _Update:
+                    top.thunk.value = value
+                    top.thunk.term = top.thunk.env = None
+                elif type(value) is _Closure:
+                    self.beta()
+                    term, env = value.body, (top, value.env)
+                    break
+                else:
+                    value = _Neutral(value.level, (top, value.args))
+            else:
+                return value
+
+    def read_back(self, value):
+        """Turn a value into a normal-form term, reducing under binders."""
+        work = [("value", value, 0)]
+        out = []
+        while work:
+            task, item, depth = work.pop()
+            if task == "lam":
+                out.append(Lam(out.pop()))
+            elif task == "app":
+                head, count = item
+                term = head
+                if count:
+                    for arg in out[-count:]:
+                        term = App(term, arg)
+                    del out[-count:]
+                out.append(term)
+            else:
+                if type(item) is _Thunk:
+                    item = self.force(item)
+                if type(item) is _Closure:
+                    fresh = _Thunk(None, None, _Neutral(depth, None))
+                    body = self.whnf(item.body, (fresh, item.env), [])
+                    work.append(("lam", None, depth))
+                    work.append(("value", body, depth + 1))
+                else:
+                    args = []
+                    cell = item.args
+                    while cell is not None:
+                        args.append(cell[0])
+                        cell = cell[1]
+                    head = Var(depth - item.level - 1)
+                    work.append(("app", (head, len(args)), depth))
+                    # args is newest first, which is the order to push them in
+                    # so the oldest argument is read back first.
+                    for arg in args:
+                        work.append(("value", arg, depth))
+        return out[0]
+
+
+def normalize(term, max_steps=None):
+    """
+    Reduce a closed term to beta-normal form in normal order with sharing.
+
+    Returns:
+        (normal_form, steps) where steps counts beta reductions.
+
+    Raises:
+        ReductionLimitExceeded: if more than max_steps reductions are needed.
+    """
+    machine = _Machine(max_steps)
+    value = machine.whnf(term, None, [])
+    return machine.read_back(value), machine.steps
+
+
+CHURCH_SUCC = parse_term("λn f x. f (n f x)")
+CHURCH_PLUS = parse_term("λm n f x. m f (n f x)")
+CHURCH_MULT = parse_term("λm n f. m (n f)")
+CHURCH_POW = parse_term("λm n. n m")
+CHURCH_PRED = parse_term("λn f x. n (λg h. h (g f)) (λu. x) (λu. u)")
+CHURCH_TRUE = parse_term("λx y. x")
+CHURCH_FALSE = parse_term("λx y. y")
+CHURCH_ISZERO = parse_term(
+    "λn. n (λx. false) true", {"true": CHURCH_TRUE, "false": CHURCH_FALSE}
+)
+CHURCH_PAIR = parse_term("λa b f. f a b")
+CHURCH_FIRST = parse_term("λp. p true", {"true": CHURCH_TRUE})
+CHURCH_REST = parse_term("λp. p false", {"false": CHURCH_FALSE})
+Y_TERM = parse_term("λf. (λx. f (x x)) (λx. f (x x))")
+
+# Names usable in parse_term(source, PRELUDE)
+PRELUDE = {
+    "succ": CHURCH_SUCC,
+    "plus": CHURCH_PLUS,
+    "mult": CHURCH_MULT,
+    "pow": CHURCH_POW,
+    "pred": CHURCH_PRED,
+    "true": CHURCH_TRUE,
+    "false": CHURCH_FALSE,
+    "iszero": CHURCH_ISZERO,
+    "pair": CHURCH_PAIR,
+    "first": CHURCH_FIRST,
+    "rest": CHURCH_REST,
+    "Y": Y_TERM,
+}
+
+FACTORIAL_TERM = parse_term("Y (λf n. iszero n 1 (mult n (f (pred n))))", PRELUDE)
+
+
+def benchmark_church_arithmetic(
+    sizes=(10, 100, 1000, 10000, 100000), max_steps=None
+):
+    """Time normalize() on Church-numeral addition, multiplication and powers."""
+    cases = []
+    for n in sizes:
+        plus = App(App(CHURCH_PLUS, church(n)), church(n))
+        mult = App(App(CHURCH_MULT, church(n)), church(3))
+        cases.append((f"{n} + {n}", plus, 2 * n))
+        cases.append((f"{n} * 3", mult, 3 * n))
+    for k in (8, 12, 16):
+        cases.append((f"2 ** {k}", App(App(CHURCH_POW, church(2)), church(k)), 2**k))
+
+    results = []
+    for label, term, expected in cases:
+        start = time.perf_counter()
+        normal, steps = normalize(term, max_steps)
+        elapsed = time.perf_counter() - start
+        if church_to_int(normal) != expected:
+            raise AssertionError(f"{label} did not reduce to {expected}")
+        results.append((label, steps, elapsed))
+    return results
+
+
+# Compiling Church encodings to native values
+#
+# compile_term() turns a term into Python values, replacing encodings it
+# recognises with native ones: Church numerals become ints, TRUE/FALSE become
+# bools, PAIR builds tuples, the arithmetic/predicate/pair terms above become
+# Python functions on those, and Y becomes a knot tied once.  De Bruijn terms
+# are equal exactly when they are alpha-equivalent, so recognition is a plain
+# structural comparison.  Everything else compiles to Python closures over an
+# environment of cons cells.
+#
+# The natives stay observationally equivalent to the encodings: an int applied
+# to f and x iterates f, a bool applied to a and b selects one, a tuple applied
+# to a selector passes it both halves.  Arguments that need work are passed as
+# memoized promises, so the compiled program is lazy like normalize() and the
+# usual "iszero n base (recurse ...)" shape terminates.
+class _Promise:
+    __slots__ = ("code", "env", "value")
+
+    def __init__(self, code, env):
+        self.code = code
+        self.env = env
+        self.value = None
+
+
+def _force(value):
+    while type(value) is _Promise:
+        if value.code is not None:
+            value.value = value.code(value.env)
+            value.code = value.env = None
+        value = value.value
+    return value
+
+
+def _identity(x):
+    return x
+
+
+def _iterate(n, f):
+    def church_n(x):
+        for _ in range(n):
+            x = _apply(f, x)
+        return x
+
+    return church_n
+
+
+def _apply(fn, arg):
+    fn = _force(fn)
+    kind = type(fn)
+    if kind is int:
+        return _iterate(fn, arg)
+    if kind is bool:
+        return (lambda _: arg) if fn else _identity
+    if kind is tuple:
+        return _apply(_apply(arg, fn[0]), fn[1])
+    return fn(arg)
+
+
+def _num(value):
+    value = _force(value)
+    if type(value) is int or type(value) is bool:
+        return int(value)
+    return _force(_apply(_apply(value, lambda k: _num(k) + 1), 0))
+
+
+def _truth(value):
+    value = _force(value)
+    if type(value) is bool:
+        return value
+    if type(value) is int and value == 0:
+        return False
+    return _force(_apply(_apply(value, True), False))
+
+
+def _pair(value):
+    value = _force(value)
+    if type(value) is tuple:
+        return value
+    return _force(_apply(value, lambda a: lambda b: (a, b)))
+
+
+def _fix(f):
+    knot = _Promise(lambda _: _apply(f, knot), None)
+    return knot
+
+
+_NATIVES = [
+    (CHURCH_SUCC, lambda n: _num(n) + 1),
+    (CHURCH_PLUS, lambda m: lambda n: _num(m) + _num(n)),
+    (CHURCH_MULT, lambda m: lambda n: _num(m) * _num(n)),
+    (CHURCH_POW, lambda m: lambda n: _num(m) ** _num(n)),
+    (CHURCH_PRED, lambda n: max(_num(n) - 1, 0)),
+    (CHURCH_ISZERO, lambda n: _num(n) == 0),
+    (CHURCH_TRUE, True),
+    (CHURCH_PAIR, lambda a: lambda b: (a, b)),
+    (CHURCH_FIRST, lambda p: _pair(p)[0]),
+    (CHURCH_REST, lambda p: _pair(p)[1]),
+    (Y_TERM, _fix),
+]
+_NO_MATCH = object()
+
+
+def _recognize(term):
+    # λ.λ.0 is both the numeral 0 and FALSE; 0 is chosen and behaves as both.
+    try:
+        return church_to_int(term)
+    except ValueError:
+        pass
+    for known, native in _NATIVES:
+        if term == known:
+            return native
+    return _NO_MATCH
+
+
+def _compile(term):
+    native = _recognize(term)
+    if native is not _NO_MATCH:
+        return lambda env: native
+    kind = type(term)
+    if kind is Var:
+        index = term.index
+        if index == 0:
+            return lambda env: env[0]
+        if index == 1:
+            return lambda env: env[1][0]
+
+        def lookup(env):
+            for _ in range(index):
+                env = env[1]
+            return env[0]
+
+        return lookup
+    if kind is Lam:
+        body = _compile(term.body)
+        return lambda env: lambda arg: body((arg, env))
+    fn = _compile(term.fn)
+    arg = _compile(term.arg)
+    if type(term.arg) is App:
+        return lambda env: _apply(fn(env), _Promise(arg, env))
+    return lambda env: _apply(fn(env), arg(env))
+
+
+def _deep_force(value):
+    value = _force(value)
+    if type(value) is tuple:
+        return tuple(_deep_force(v) for v in value)
+    return value
+
+
+def compile_term(term):
+    """
+    Compile a closed term to a native Python value.
+
+    Numerals, booleans and pairs come back as int, bool and tuple; other
+    abstractions come back as one-argument Python functions.
+    """
+    return _deep_force(_compile(term)(None))
+
+
+def run_compiled(term, *args):
+    """Compile a function term and apply it to native arguments."""
+    value = _compile(term)(None)
+    for arg in args:
+        value = _apply(value, arg)
+    return _deep_force(value)
+
+
+def benchmark_factorial(ns=(5, 7, 10, 50, 100), reduce_up_to=7):
+    """
+    Compare factorial through the Y-combinator closures, symbolic reduction
+    of FACTORIAL_TERM (only up to reduce_up_to, the numerals grow as n!) and
+    the compiled FACTORIAL_TERM.
+    """
+    rows = []
+    compiled = _compile(FACTORIAL_TERM)(None)
+    for n in ns:
+        start = time.perf_counter()
+        expected = factorial(n)
+        rows.append((n, "Y closures", time.perf_counter() - start))
+
+        if n <= reduce_up_to:
+            start = time.perf_counter()
+            normal, _ = normalize(App(FACTORIAL_TERM, church(n)))
+            rows.append((n, "normalize", time.perf_counter() - start))
+            assert church_to_int(normal) == expected
+
+        start = time.perf_counter()
+        result = run_compiled(FACTORIAL_TERM, n)
+        rows.append((n, "compile + run", time.perf_counter() - start))
+        assert result == expected
+
+        start = time.perf_counter()
+        result = _force(_apply(compiled, n))
+        rows.append((n, "run precompiled", time.perf_counter() - start))
+        assert result == expected
+    return rows
+
+
 # Demo code with debugging examples
 if __name__ == "__main__":
     # Test basic combinators
@@ -165,3 +948,19 @@ if __name__ == "__main__":
     # In Python-mode: Set breakpoint at this line and step through
     # import pdb; pdb.set_trace()  # Uncomment for manual debugging
     print("Factorial using Y combinator:", factorial(5))
+
+    # Pair-list operations on a large list
+    for label, elapsed in benchmark_list_operations():
+        print(f"{label}: {elapsed:.3f}s")
+
+    # Memoizing fixed point
+    for label, elapsed in benchmark_fixed_points():
+        print(f"{label}: {elapsed:.6f}s")
+
+    # Factorial: Y closures vs symbolic reduction vs compiled Church encoding
+    for n, label, elapsed in benchmark_factorial():
+        print(f"factorial({n}) {label}: {elapsed:.6f}s")
+
+    # Symbolic reduction of Church-numeral arithmetic
+    for label, steps, elapsed in benchmark_church_arithmetic():
+        print(f"{label}: {steps} beta steps in {elapsed:.4f}s")
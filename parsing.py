@@ -1,129 +1,920 @@
+import ast
+import functools
+import itertools
+import operator
+import random
 import re
-from typing import Callable, Dict, List, Tuple, Union
+import time
+from array import array
+from collections import OrderedDict
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import click
 
+# NumPy is optional: batch evaluation falls back to array('q') chunks
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 Expression = Union[int, str, Tuple[str, "Expression", "Expression"]]
+# A column of batch values: a scalar for argument-independent subtrees, else
+# an int64 NumPy array or an array('q')
+Column = Any
+
+BATCH_CHUNK_SIZE = 1 << 16
+# Deepest body the closure interpreter nests; deeper ones use a stack machine
+CLOSURE_DEPTH = 200
+# Native functions kept by jit_compile, keyed on normalized body text
+JIT_CACHE_SIZE = 1024
+
+
+Token = Tuple[str, str]
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:(\d+)|([A-Za-z_]\w*)|(\*\*|//|<=|>=|==|!=|[-+*/%<>()λ.])|(\S))"
+)
+_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+# Infix binding powers (left, right): left < right is left-associative,
+# left > right right-associative.  Comparisons bind loosest, ** tightest.
+_BINDING_POWER: Dict[str, Tuple[int, int]] = {
+    "<": (10, 11),
+    "<=": (10, 11),
+    ">": (10, 11),
+    ">=": (10, 11),
+    "==": (10, 11),
+    "!=": (10, 11),
+    "+": (20, 21),
+    "-": (20, 21),
+    "*": (30, 31),
+    "/": (30, 31),
+    "//": (30, 31),
+    "%": (30, 31),
+    "**": (41, 40),
+}
+_COMPARISONS = frozenset(("<", "<=", ">", ">=", "==", "!="))
+# Unary minus binds tighter than * but looser than **, as in Python.
+_UNARY_BP = 35
+_OPERAND_END = ("int", "name", ")")
 
 
-def parse_and_apply_lambda(expr: str, arg: int) -> Tuple[int, List[str]]:
+def tokenize(text: str) -> List[Token]:
     """
-    Parse a lambda expression and apply it to an argument.
+    Split a lambda expression into tokens in a single left-to-right pass.
+
+    A "-" written directly against the following operand ("-3", "-x") after a
+    space, "(" or another operator is tagged "neg": it negates in operand
+    position and still subtracts in infix position, so "(- x -3)" and
+    "(x -3)" both mean what they look like.
 
     Args:
-        expr (str): The lambda expression as a string.
-        arg (int): The argument to apply to the lambda expression.
+        text (str): The expression text.
 
     Returns:
-        Tuple[int, List[str]]: The result of applying the lambda expression and a list of evaluation steps.
+        List[Token]: (kind, text) pairs where kind is "int", "name", "neg" or
+        the operator/punctuation text itself.
 
     Raises:
-        ValueError: If the lambda expression is invalid or contains unknown operators.
+        ValueError: If the text contains a character that is not part of the
+        grammar.
+    """
+    tokens: List[Token] = []
+    for match in _TOKEN_RE.finditer(text):
+        number, name, symbol, other = match.groups()
+        if number:
+            tokens.append(("int", number))
+        elif name:
+            tokens.append(("name", name))
+        elif symbol == "-":
+            end = match.end()
+            glued = end < len(text) and (text[end].isalnum() or text[end] in "_(")
+            spaced = match.start(3) > match.start()
+            if glued and (spaced or not tokens or tokens[-1][0] not in _OPERAND_END):
+                tokens.append(("neg", "-"))
+            else:
+                tokens.append(("-", "-"))
+        elif symbol:
+            tokens.append((symbol, symbol))
+        elif other:
+            raise ValueError(f"Unexpected character: {other!r}")
+    return tokens
+
+
+class _Partial:
+    """A prefix operator applied to one operand, e.g. "(+ x)"."""
+
+    __slots__ = ("op", "left")
+
+    def __init__(self, op: str, left: Expression):
+        self.op = op
+        self.left = left
+
+
+def _complete(expr: Union[Expression, _Partial]) -> Expression:
+    if isinstance(expr, _Partial):
+        raise ValueError(f"Incomplete application of {expr.op!r}")
+    return expr
+
+
+class _Parser:
+    """
+    Pratt parser over a token list, one left-to-right pass.
+
+    Infix expressions use the binding powers above.  A parenthesised group
+    that starts with an operator is prefix form: "(+ x 1)", "(* 1 2 3)"
+    (folded left), or "(+ x)", a partial application completed by
+    juxtaposition as in "((+ x) 1)".
     """
-    # Extract the parameter and body of the lambda expression
-    match = re.match(r"λ(\w+)\.(.*)", expr)
-    if not match:
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> str:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else ""
+
+    def advance(self) -> Token:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Unexpected end of expression")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _power_follows(self) -> bool:
+        following = self.pos + 1
+        return following < len(self.tokens) and self.tokens[following][0] == "**"
+
+    def expect(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "end"
+            raise ValueError(f"Expected {kind!r} but found {found!r}")
+        return self.advance()[1]
+
+    def parse_lambda(self) -> Tuple[str, Expression]:
+        self.expect("λ")
+        param = self.expect("name")
+        self.expect(".")
+        body = _complete(self.parse_expr())
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected token: {self.tokens[self.pos][1]}")
+        return param, body
+
+    def parse_expr(self, min_bp: int = 0) -> Union[Expression, _Partial]:
+        left = self.parse_atom()
+        while True:
+            kind = self.peek()
+            op = "-" if kind == "neg" else kind
+            if op not in _BINDING_POWER:
+                return left
+            left_bp, right_bp = _BINDING_POWER[op]
+            if left_bp < min_bp:
+                return left
+            self.pos += 1
+            right = self.parse_expr(right_bp)
+            left = (op, _complete(left), _complete(right))
+
+    def parse_atom(self) -> Union[Expression, _Partial]:
+        kind, text = self.advance()
+        if kind == "int":
+            return int(text)
+        if kind == "name":
+            return text
+        if kind in ("neg", "-"):
+            # "-3" is a literal unless a power follows: -3 ** 2 is -(3 ** 2).
+            if kind == "neg" and self.peek() == "int" and not self._power_follows():
+                return -int(self.advance()[1])
+            return ("-", 0, _complete(self.parse_expr(_UNARY_BP)))
+        if kind == "(":
+            return self.parse_group()
+        raise ValueError(f"Unable to parse expression at {text!r}")
+
+    def parse_group(self) -> Union[Expression, _Partial]:
+        if self.peek() in _BINDING_POWER:
+            op = self.advance()[0]
+            operands = []
+            while self.peek() not in (")", ""):
+                operands.append(_complete(self.parse_atom()))
+            self.expect(")")
+            if not operands:
+                raise ValueError(f"Operator {op!r} has no operands")
+            if len(operands) == 1:
+                return _Partial(op, operands[0])
+            result = operands[0]
+            for operand in operands[1:]:
+                result = (op, result, operand)
+            return result
+
+        expr = self.parse_expr()
+        while self.peek() not in (")", ""):
+            if not isinstance(expr, _Partial):
+                raise ValueError(f"Unexpected token: {self.tokens[self.pos][1]}")
+            expr = (expr.op, expr.left, _complete(self.parse_atom()))
+        self.expect(")")
+        return expr
+
+
+def parse_lambda(expr: str) -> Tuple[str, Expression]:
+    """
+    Parse a lambda expression into its parameter and body.
+
+    Args:
+        expr (str): The lambda expression as a string, e.g. "λx.(x + 1)".
+
+    Returns:
+        Tuple[str, Expression]: The parameter name and the parsed body.
+
+    Raises:
+        ValueError: If the lambda expression is invalid or nested too deeply
+        for the recursive-descent parser.  Flat operator chains of any length
+        are fine; it is parentheses, unary minus and ** that nest.
+    """
+    if not expr.startswith("λ"):
         raise ValueError("Invalid lambda expression")
+    try:
+        return _Parser(tokenize(expr)).parse_lambda()
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply to parse") from None
+
+
+# A body flattened into postfix order.  Each step is (None, value) to push a
+# constant, (None, _ARG) to push the argument, or (op, fn) to pop two values
+# and push fn(left, right).  Walking a list instead of the tree keeps every
+# evaluator below free of recursion, so a left-deep chain such as
+# "x + x + ... + x" with thousands of terms evaluates like any other body.
+Program = List[Tuple[Optional[str], Any]]
+_ARG = object()
+_CLOSE = object()
 
-    param, body = match.groups()
 
-    def parse_expr(expr: str) -> Expression:
+def _postfix(expr: Expression, param: str) -> Program:
+    """Flatten a parsed body into a postfix program without recursion."""
+    program: Program = []
+    stack: List[Tuple[Expression, bool]] = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, int):
+            program.append((None, node))
+        elif isinstance(node, str):
+            # Unbound names evaluate to themselves, as they always have.
+            program.append((None, _ARG if node == param else node))
+        elif expanded:
+            program.append((node[0], _OPERATORS[node[0]]))
+        else:
+            op, left, right = node
+            if op not in _OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            stack.append((node, True))
+            stack.append((right, False))
+            stack.append((left, False))
+    return program
+
+
+def _build(expr: Expression, param: str) -> Callable[[int], Any]:
+    """
+    Turn a parsed body into a function of the argument, once.
+
+    Bodies up to CLOSURE_DEPTH deep become nested closures, the fastest
+    interpreter; calling those recurses once per level, so deeper bodies run
+    the postfix program on an explicit stack instead.
+    """
+    program = _postfix(expr, param)
+    closures: List[Tuple[Callable[[int], Any], int]] = []
+    for op, value in program:
+        if op is None:
+            closures.append((_leaf(value), 1))
+            continue
+        right_fn, right_depth = closures.pop()
+        left_fn, left_depth = closures.pop()
+        depth = max(left_depth, right_depth) + 1
+        if depth > CLOSURE_DEPTH:
+            return _run_program(program)
+        closures.append((_node(value, left_fn, right_fn), depth))
+    return closures[0][0]
+
+
+def _leaf(value: Any) -> Callable[[int], Any]:
+    if value is _ARG:
+        return lambda arg: arg
+    return lambda arg: value
+
+
+def _node(
+    fn: Callable[[Any, Any], Any],
+    left_fn: Callable[[int], Any],
+    right_fn: Callable[[int], Any],
+) -> Callable[[int], Any]:
+    return lambda arg: fn(left_fn(arg), right_fn(arg))
+
+
+def _run_program(program: Program) -> Callable[[int], Any]:
+    def evaluate(arg: int) -> Any:
+        stack: List[Any] = []
+        for op, value in program:
+            if op is None:
+                stack.append(arg if value is _ARG else value)
+            else:
+                right = stack.pop()
+                stack[-1] = value(stack[-1], right)
+        return stack[0]
+
+    return evaluate
+
+
+_AST_OPERATORS: Dict[str, Any] = {
+    "+": ast.Add,
+    "-": ast.Sub,
+    "*": ast.Mult,
+    "/": ast.Div,
+    "//": ast.FloorDiv,
+    "%": ast.Mod,
+    "**": ast.Pow,
+    "<": ast.Lt,
+    "<=": ast.LtE,
+    ">": ast.Gt,
+    ">=": ast.GtE,
+    "==": ast.Eq,
+    "!=": ast.NotEq,
+}
+_JIT_PARAM = "arg"
+_jit_cache: "OrderedDict[str, Callable[[int], Any]]" = OrderedDict()
+
+
+def _normalize(expr: Expression, param: str) -> str:
+    """Render a body in prefix form with the parameter renamed, e.g. "(+ $ 1)"."""
+    parts: List[str] = []
+    stack: List[Any] = [expr]
+    while stack:
+        node = stack.pop()
+        if node is _CLOSE:
+            parts[-1] += ")"
+        elif isinstance(node, int):
+            parts.append(str(node))
+        elif isinstance(node, str):
+            parts.append("$" if node == param else repr(node))
+        else:
+            op, left, right = node
+            parts.append(f"({op}")
+            stack.extend((_CLOSE, right, left))
+    return " ".join(parts)
+
+
+def _lower(program: Program) -> ast.expr:
+    """Translate a body into the equivalent Python expression AST."""
+    stack: List[ast.expr] = []
+    for op, value in program:
+        if op is None:
+            if value is _ARG:
+                stack.append(ast.Name(_JIT_PARAM, ast.Load()))
+            else:
+                stack.append(ast.Constant(value))
+            continue
+        node = _AST_OPERATORS[op]()
+        right = stack.pop()
+        if isinstance(node, ast.cmpop):
+            stack[-1] = ast.Compare(stack[-1], [node], [right])
+        else:
+            stack[-1] = ast.BinOp(stack[-1], node, right)
+    return stack[0]
+
+
+def jit_compile(param: str, body: Expression) -> Callable[[int], Any]:
+    """
+    Compile a parsed body to a native Python function of one argument.
+
+    The body is lowered to an ast.Lambda and passed through compile() once, so
+    evaluation runs as ordinary bytecode with no call per node.  Functions are
+    cached on the normalized body text, which ignores whitespace and the
+    parameter name: "λx.(x + 1)" and "λy.(+ y 1)" share one function.
+
+    Args:
+        param (str): The lambda parameter.
+        body (Expression): The parsed body.
+
+    Returns:
+        Callable[[int], Any]: The compiled function.  Bodies too deep for the
+        CPython compiler fall back to _build, which does not recurse.
+
+    Raises:
+        ValueError: If the body contains an unknown operator.
+    """
+    program = _postfix(body, param)
+    key = _normalize(body, param)
+    fn = _jit_cache.get(key)
+    if fn is not None:
+        _jit_cache.move_to_end(key)
+        return fn
+    args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(_JIT_PARAM)],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    tree = ast.Expression(ast.Lambda(args, _lower(program)))
+    try:
+        # fix_missing_locations recurses too, so it is guarded with compile.
+        code = compile(ast.fix_missing_locations(tree), f"<λ {key[:60]}>", "eval")
+    except RecursionError:
+        fn = _build(body, param)
+    else:
+        fn = eval(code, {"__builtins__": {}})
+    _jit_cache[key] = fn
+    if len(_jit_cache) > JIT_CACHE_SIZE:
+        _jit_cache.popitem(last=False)
+    return fn
+
+
+class CompiledLambda:
+    """
+    A parsed lambda expression that can be applied to many arguments.
+
+    Parsing and compilation happen once, in compile_lambda; calling the object
+    only evaluates, through jit_compile's native function unless jit is False.
+    Step traces always use the interpreter and are collected only on request.
+    """
+
+    def __init__(self, source: str, param: str, body: Expression, jit: bool = True):
+        self.source = source
+        self.param = param
+        self.body = body
+        self.returns_bool = isinstance(body, tuple) and body[0] in _COMPARISONS
+        self._fn = jit_compile(param, body) if jit else _build(body, param)
+
+    def __call__(self, arg: int) -> int:
+        return self._fn(arg)
+
+    def trace(self, arg: int) -> Tuple[int, List[str]]:
         """
-        Parse a single expression within the lambda body.
+        Evaluate the body step by step.
 
         Args:
-            expr (str): The expression to parse.
+            arg (int): The argument bound to the parameter.
 
         Returns:
-            Expression: The parsed expression as a nested structure.
-
-        Raises:
-            ValueError: If unable to parse the expression.
+            Tuple[int, List[str]]: The result and a list of evaluation steps.
         """
-        expr = expr.strip()
-        if expr.isdigit():
-            return int(expr)
-        elif expr.isalpha():
-            return expr
-        elif expr.startswith("(") and expr.endswith(")"):
-            # Remove outer parentheses
-            expr = expr[1:-1].strip()
-
-            # Find the main operator
-            paren_count = 0
-            for i, char in enumerate(expr):
-                if char == "(":
-                    paren_count += 1
-                elif char == ")":
-                    paren_count -= 1
-                elif char in "+-*" and paren_count == 0:
-                    op = char
-                    left = expr[:i].strip()
-                    right = expr[i + 1 :].strip()
-                    return (op, parse_expr(left), parse_expr(right))
-
-            # If no operator found at top level, parse the expression without outer parentheses
-            return parse_expr(expr)
-        else:
-            raise ValueError(f"Unable to parse expression: {expr}")
-
-    parsed_body = parse_expr(body)
+        steps: List[str] = []
+        stack: List[Any] = []
+        for op, value in _postfix(self.body, self.param):
+            if op is None:
+                stack.append(arg if value is _ARG else value)
+                continue
+            right = stack.pop()
+            left = stack[-1]
+            stack[-1] = result = value(left, right)
+            steps.append(f"({op} {left} {right}) = {result}")
+        return stack[0], steps
 
-    def evaluate_step_by_step(
-        expr: Expression, env: Dict[str, int]
-    ) -> Tuple[int, List[str]]:
+    def batch(self, args: Iterable[int], use_numpy: bool = NUMPY_AVAILABLE) -> Column:
         """
-        Evaluate the parsed expression step by step.
+        Evaluate the body for a whole column of arguments at once.
+
+        The tree is walked once per call rather than once per argument; each
+        operator node combines entire columns.  Columns hold int64 values, or
+        float64 once "/" or a negative power is involved.  Where a column
+        result could differ from calling the expression on each argument
+        (int64 overflow, division by zero, a power that is an int for some
+        arguments and a float for others) ArithmeticError is raised instead;
+        apply_batch and --batch then evaluate that chunk argument by argument.
+        array('q') stores comparison results as 1 and 0.
 
         Args:
-            expr (Expression): The parsed expression to evaluate.
-            env (Dict[str, int]): The environment containing variable bindings.
+            args (Iterable[int]): The arguments, ideally an array('q').
+            use_numpy (bool): Evaluate with NumPy when it is installed.
 
         Returns:
-            Tuple[int, List[str]]: The result of the evaluation and a list of evaluation steps.
+            Column: An ndarray with NumPy, otherwise an array('q') or array('d').
 
         Raises:
-            ValueError: If an unknown operator is encountered.
+            ValueError: If the body refers to a name other than the parameter.
+            ArithmeticError: If a column result would not match the scalar one.
         """
-        steps = []
+        column = args if isinstance(args, array) else array("q", args)
+        if use_numpy:
+            values = np.frombuffer(column, dtype=np.int64)
+            # The checks in _numpy_op cover integer overflow; errstate makes
+            # anything they miss raise rather than wrap or turn into inf/nan.
+            with np.errstate(all="raise"):
+                result = _eval_column(self.body, self.param, values, _numpy_op)
+            return np.broadcast_to(result, values.shape).copy()
+        result = _eval_column(self.body, self.param, column, _array_op)
+        if not isinstance(result, array):
+            return _to_column(lambda: itertools.repeat(result, len(column)))
+        return result
+
+    def __repr__(self) -> str:
+        return f"CompiledLambda({self.source!r})"
+
+
+_INT64_MIN = -(1 << 63)
+# Integers up to 2**53 convert to float64 exactly
+_FLOAT_EXACT = 1 << 53
+
+
+class _InexactColumn(ArithmeticError):
+    """A column operation whose result could differ from Python's."""
+
+
+def _as_numpy(value: Column) -> Column:
+    # Comparison columns are bool; Python adds and multiplies bools as ints.
+    if isinstance(value, np.ndarray):
+        return value.astype(np.int64) if value.dtype == np.bool_ else value
+    if isinstance(value, float):
+        return np.float64(value)
+    return np.int64(value)  # OverflowError past int64
+
+
+def _exact_float(values: Column) -> bool:
+    return bool(((values >= -_FLOAT_EXACT) & (values <= _FLOAT_EXACT)).all())
+
+
+def _numpy_op(op: str, left: Column, right: Column) -> Column:
+    fn = _OPERATORS[op]
+    if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+        return fn(left, right)
+    left, right = _as_numpy(left), _as_numpy(right)
+    if left.dtype.kind == "f" or right.dtype.kind == "f":
+        return _numpy_float_op(op, left, right)
+    if op in _COMPARISONS:
+        return fn(left, right)
+    if op in ("//", "%", "/") and (right == 0).any():
+        raise ZeroDivisionError(f"{op} by zero")
+    if op == "/":
+        # Python divides ints exactly; float64 only agrees below 2**53.
+        if not (_exact_float(left) and _exact_float(right)):
+            raise _InexactColumn("true division of large integers")
+        return left / right
+    if op in ("//", "%"):
+        if ((left == _INT64_MIN) & (right == -1)).any():
+            raise OverflowError("int64 overflow")
+        return fn(left, right)
+    if op == "**":
+        return _numpy_int_power(left, right)
+    result = fn(left, right)
+    if op == "+":
+        overflow = ((left ^ result) & (right ^ result)) < 0
+    elif op == "-":
+        overflow = ((left ^ right) & (left ^ result)) < 0
+    elif (np.abs(left.astype(np.float64) * right) < 2.0**62).all():
+        return result
+    else:
+        # Without overflow result // left == right; -1 is checked separately
+        # because _INT64_MIN // -1 itself overflows.
+        checkable = (left != 0) & (left != -1)
+        quotient = result // np.where(checkable, left, 1)
+        overflow = (checkable & (quotient != right)) | (
+            (left == -1) & (right == _INT64_MIN)
+        )
+    if overflow.any():
+        raise OverflowError("int64 overflow")
+    return result
+
+
+def _numpy_int_power(left: Column, right: Column) -> Column:
+    negative = right < 0
+    if negative.any():
+        # int ** negative int is a float in Python, computed as float ** float
+        if not negative.all():
+            raise _InexactColumn("mixed int and float powers")
+        if (left == 0).any():
+            raise ZeroDivisionError("0 ** negative power")
+        return np.power(left.astype(np.float64), right.astype(np.float64))
+    with np.errstate(over="ignore"):
+        estimate = np.abs(left.astype(np.float64)) ** right.astype(np.float64)
+    if (estimate >= 2.0**62).any():
+        raise OverflowError("int64 overflow")
+    return np.power(left, right)
+
+
+def _numpy_float_op(op: str, left: Column, right: Column) -> Column:
+    # IEEE arithmetic matches Python for + - * and /; Python's float //, %
+    # and ** have their own edge cases, so those are left to the scalar path.
+    if op in ("//", "%", "**"):
+        raise _InexactColumn(f"float {op}")
+    if op == "/" and (right == 0).any():
+        raise ZeroDivisionError("float division by zero")
+    if op in _COMPARISONS:
+        # Python compares ints with floats exactly, NumPy converts the int.
+        for side in (left, right):
+            if side.dtype.kind != "f" and not _exact_float(side):
+                raise _InexactColumn("comparison of a large integer with a float")
+    return _OPERATORS[op](left, right)
+
+
+def _to_column(values: Callable[[], Iterator[Any]]) -> Column:
+    # Integer results (bools included) stay in array('q'); true division and
+    # negative powers produce floats, which need array('d').
+    items = list(values())
+    try:
+        return array("q", items)
+    except TypeError:
+        if not all(isinstance(item, float) for item in items):
+            raise _InexactColumn("column mixes ints and floats") from None
+        return array("d", items)
+
+
+def _array_op(op: str, left: Column, right: Column) -> Column:
+    fn = _OPERATORS[op]
+    left_scalar = not isinstance(left, array)
+    right_scalar = not isinstance(right, array)
+    if left_scalar and right_scalar:
+        return fn(left, right)
+    if left_scalar:
+        return _to_column(lambda: map(fn, itertools.repeat(left), right))
+    if right_scalar:
+        return _to_column(lambda: map(fn, left, itertools.repeat(right)))
+    return _to_column(lambda: map(fn, left, right))
+
+
+def _eval_column(
+    expr: Expression,
+    param: str,
+    column: Column,
+    apply_op: Callable[[str, Column, Column], Column],
+) -> Column:
+    stack: List[Column] = []
+    for op, value in _postfix(expr, param):
+        if op is not None:
+            right = stack.pop()
+            stack[-1] = apply_op(op, stack[-1], right)
+        elif value is _ARG:
+            stack.append(column)
+        elif isinstance(value, str):
+            raise ValueError(f"Cannot batch-evaluate unbound name: {value}")
+        else:
+            stack.append(value)
+    return stack[0]
+
+
+def apply_batch(
+    expr: Union[str, CompiledLambda],
+    args: Iterable[int],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Iterator[int]:
+    """
+    Apply one lambda expression to a stream of integer arguments.
+
+    Arguments are consumed chunk_size at a time and each chunk is evaluated
+    column-wise, so arbitrarily long inputs run in constant memory.
+
+    Args:
+        expr (Union[str, CompiledLambda]): The expression or its compiled form.
+        args (Iterable[int]): The arguments.
+        chunk_size (int): Arguments evaluated per column.
+
+    Returns:
+        Iterator[int]: The results, in argument order.
+    """
+    compiled = compile_lambda(expr) if isinstance(expr, str) else expr
+    iterator = iter(args)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield from _evaluate_chunk(compiled, chunk)
+
+
+def _evaluate_chunk(
+    compiled: CompiledLambda, chunk: List[int], use_numpy: bool = NUMPY_AVAILABLE
+) -> List[Any]:
+    """Evaluate a chunk column-wise, giving exactly what compiled(arg) would."""
+    try:
+        results = compiled.batch(array("q", chunk), use_numpy=use_numpy).tolist()
+    except ArithmeticError:
+        # Overflow, zero division or a value int64/float64 cannot represent
+        # exactly: the scalar function has Python's semantics, errors included.
+        return [compiled(arg) for arg in chunk]
+    if compiled.returns_bool:
+        return [bool(result) for result in results]
+    return results
+
+
+def _stream_batch(
+    compiled: CompiledLambda, lines: IO[str], chunk_size: int = BATCH_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Read one integer per line and yield blocks of result lines.
+
+    Output lines match input lines one to one: a blank input line produces a
+    blank output line.
+    """
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        values = [int(line) for line in chunk if line.strip()]
+        results = iter(_evaluate_chunk(compiled, values) if values else ())
+        yield "\n".join(str(next(results)) if line.strip() else "" for line in chunk)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_lambda(expr: str, jit: bool = True) -> CompiledLambda:
+    """
+    Parse a lambda expression once and return a reusable callable.
+
+    Results are kept in an LRU cache keyed on the expression text, so compiling
+    the same text again is a dictionary lookup.
+
+    Args:
+        expr (str): The lambda expression as a string.
+        jit (bool): Compile the body to bytecode; False keeps the closure
+            interpreter.
+
+    Returns:
+        CompiledLambda: Call it with an argument to evaluate the expression.
+
+    Raises:
+        ValueError: If the lambda expression is invalid or contains unknown operators.
+    """
+    param, body = parse_lambda(expr)
+    return CompiledLambda(expr, param, body, jit=jit)
+
 
-        def evaluate(expr: Expression, env: Dict[str, int]) -> int:
-            if isinstance(expr, int):
-                return expr
-            elif isinstance(expr, str):
-                return env.get(expr, expr)
+def parse_and_apply_lambda(
+    expr: str, arg: int, trace: bool = True
+) -> Tuple[int, List[str]]:
+    """
+    Parse a lambda expression and apply it to an argument.
+
+    Args:
+        expr (str): The lambda expression as a string.
+        arg (int): The argument to apply to the lambda expression.
+        trace (bool): Collect evaluation steps; when False the list is empty.
+
+    Returns:
+        Tuple[int, List[str]]: The result of applying the lambda expression
+        and a list of evaluation steps.
+
+    Raises:
+        ValueError: If the lambda expression is invalid or contains unknown operators.
+    """
+    compiled = compile_lambda(expr)
+    if trace:
+        return compiled.trace(arg)
+    return compiled(arg), []
+
+
+def _random_expression(
+    nodes: int, rng: random.Random, prefix: bool, parts: List[str]
+) -> None:
+    # Balanced split keeps generation (and parsing) depth logarithmic in nodes.
+    if nodes <= 1:
+        parts.append(rng.choice(("x", str(rng.randrange(1, 100)), "-7")))
+        return
+    op = rng.choice(tuple(_BINDING_POWER))
+    left = (nodes - 1) // 2 | 1
+    parts.append(f"({op} " if prefix else "(")
+    _random_expression(left, rng, prefix, parts)
+    parts.append(" " if prefix else f" {op} ")
+    _random_expression(nodes - 1 - left, rng, prefix, parts)
+    parts.append(")")
+
+
+def _random_chain(nodes: int, rng: random.Random, parts: List[str]) -> None:
+    # A flat "a + b - c ..." chain: one left-deep tree as tall as it is wide.
+    parts.append(rng.choice(("x", str(rng.randrange(1, 100)))))
+    for _ in range(nodes // 2):
+        parts.append(f" {rng.choice('+-')} ")
+        parts.append(rng.choice(("x", str(rng.randrange(1, 100)))))
+
+
+def benchmark_parser(
+    node_counts: Iterable[int] = (10_000, 100_000), seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Time tokenize + parse on random expressions of the given sizes.
+
+    Each size is generated as a balanced infix tree, a balanced prefix tree
+    and a flat infix chain; the chain's left-deep tree is also evaluated once
+    through the closure interpreter, to show depth does not matter there.
+
+    Args:
+        node_counts (Iterable[int]): Operator plus operand counts to generate.
+        seed (int): Seed for the expression generator.
+
+    Returns:
+        List[Dict[str, Any]]: One record per size and notation with the node
+        count, source length, seconds and nodes parsed per second.
+    """
+    rng = random.Random(seed)
+    results = []
+    for nodes in node_counts:
+        for notation in ("infix", "prefix", "chain"):
+            parts: List[str] = ["λx."]
+            if notation == "chain":
+                _random_chain(nodes, rng, parts)
             else:
-                op, left, right = expr
-                left_val = evaluate(left, env)
-                right_val = evaluate(right, env)
-                result = None
-                if op == "+":
-                    result = left_val + right_val
-                elif op == "-":
-                    result = left_val - right_val
-                elif op == "*":
-                    result = left_val * right_val
-                else:
-                    raise ValueError(f"Unknown operator: {op}")
-                steps.append(f"({op} {left_val} {right_val}) = {result}")
-                return result
-
-        result = evaluate(parsed_body, env)
-        return result, steps
-
-    return evaluate_step_by_step(parsed_body, {param: arg})
+                _random_expression(nodes, rng, notation == "prefix", parts)
+            source = "".join(parts)
+            start = time.perf_counter()
+            param, body = parse_lambda(source)
+            elapsed = time.perf_counter() - start
+            if notation == "chain":
+                _build(body, param)(1)
+            results.append(
+                {
+                    "nodes": nodes,
+                    "notation": notation,
+                    "chars": len(source),
+                    "seconds": elapsed,
+                    "nodes_per_second": nodes / elapsed,
+                }
+            )
+    return results
+
+
+def benchmark_jit(
+    expr: str = "λx.((x * x) + ((3 * x) - 5)) % 7", calls: int = 100_000
+) -> Dict[str, float]:
+    """
+    Time repeated calls to one expression under the interpreter and the JIT.
+
+    Args:
+        expr (str): The lambda expression to evaluate.
+        calls (int): Number of calls per mode.
+
+    Returns:
+        Dict[str, float]: Seconds for "interpreted" and "jit" evaluation.
+    """
+    results = {}
+    for mode, jit in (("interpreted", False), ("jit", True)):
+        fn = compile_lambda(expr, jit=jit)
+        start = time.perf_counter()
+        for arg in range(calls):
+            fn(arg)
+        results[mode] = time.perf_counter() - start
+    return results
 
 
 @click.command()
 @click.argument("expression", default="λx.x")
 @click.argument("argument", type=int, default=1)
-def main(expression: str, argument: int):
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.File("r"),
+    help="Apply the expression to one integer per line of FILE ('-' for stdin) "
+    "and print one result per line; blank lines stay blank.",
+)
+@click.option(
+    "--benchmark",
+    is_flag=True,
+    help="Report parser throughput on random 10^4 and 10^5 node expressions, "
+    "balanced and flat, and interpreted vs JIT evaluation speed.",
+)
+def main(
+    expression: str, argument: int, batch_file: Optional[IO[str]], benchmark: bool
+):
     """
     Parse and evaluate a lambda expression with a given argument.
 
     EXPRESSION: The lambda expression as a string.
     ARGUMENT: The integer argument to apply to the lambda expression.
     """
+    if benchmark:
+        for row in benchmark_parser():
+            click.echo(
+                f"{row['notation']:>6} {row['nodes']:>8} nodes: "
+                f"{row['seconds']:.3f}s ({row['nodes_per_second']:,.0f} nodes/s)"
+            )
+        for mode, seconds in benchmark_jit().items():
+            click.echo(f"{mode:>11} evaluation: {seconds:.3f}s per 100,000 calls")
+        return
+    if batch_file is not None:
+        try:
+            compiled = compile_lambda(expression)
+            for block in _stream_batch(compiled, batch_file):
+                click.echo(block)
+        except (ValueError, ArithmeticError) as e:
+            click.echo(f"Error: {str(e)}", err=True)
+        return
     try:
         result, steps = parse_and_apply_lambda(expression, argument)
         click.echo(f"Expression: {expression}")
@@ -132,7 +923,7 @@ def main(expression: str, argument: int):
         for step in steps:
             click.echo(f"  {step}")
         click.echo(f"Final result: {result}")
-    except ValueError as e:
+    except (ValueError, ArithmeticError) as e:
         click.echo(f"Error: {str(e)}", err=True)
 
 
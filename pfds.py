@@ -1,128 +1,1309 @@
+import functools
 import heapq
+import random
+import time
+import tracemalloc
 from collections import deque
-from typing import Any, Callable, List, Tuple
+from collections.abc import Mapping, MutableMapping, Sequence
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
 
 
 # Banker's Queue
+#
+# Both lists keep the next element to leave at the end: ``front[-1]`` is the
+# head and ``rear[0]`` the most recent snoc.  When front runs dry the rear
+# already has the right orientation and simply becomes the new front.
 class BankersQueue:
-    def __init__(self, front: List[Any] = [], rear: List[Any] = []):
-        self.front = front
-        self.rear = rear
+    def __init__(
+        self, front: Optional[List[Any]] = None, rear: Optional[List[Any]] = None
+    ):
+        self.front = front if front is not None else []
+        self.rear = rear if rear is not None else []
+
+    def is_empty(self) -> bool:
+        return not self.front and not self.rear
 
     def snoc(self, x: Any) -> "BankersQueue":
         return BankersQueue(self.front, [x] + self.rear)
 
     def head(self) -> Any:
         if not self.front:
-            return BankersQueue(list(reversed(self.rear)), [])
+            if not self.rear:
+                raise IndexError("head of empty queue")
+            return self.rear[-1]
         return self.front[-1]
 
     def tail(self) -> "BankersQueue":
         if not self.front:
-            return BankersQueue(list(reversed(self.rear))[1:], [])
+            if not self.rear:
+                raise IndexError("tail of empty queue")
+            return BankersQueue(self.rear[:-1], [])
         return BankersQueue(self.front[:-1], self.rear)
 
 
 # Skew Binary Random-Access List
+#
+# A list of complete binary trees whose sizes are skew binary numbers
+# (2^k - 1).  Only the two smallest trees may share a size, so cons, head and
+# tail touch at most the first two trees, and lookup/update walk one spine of
+# O(log n) trees followed by one root-to-leaf path of O(log n) nodes.
+#
+# A tree is a tuple: ``(x,)`` for a leaf, ``(x, left, right)`` for a node, with
+# elements stored in preorder.  The spine is a cons list of
+# ``(weight, tree, rest)`` cells so cons/tail never copy it.
+_Tree = Tuple[Any, ...]
+_Spine = Optional[Tuple[int, _Tree, Any]]
+
+
 class SkewBinaryList:
-    def __init__(self, trees: List[Tuple[int, List[Any]]] = []):
-        self.trees = trees
+    __slots__ = ("_trees", "_size")
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        trees: _Spine = None
+        size = 0
+        for x in reversed(list(elements)):
+            trees = SkewBinaryList._cons(x, trees)
+            size += 1
+        self._trees = trees
+        self._size = size
+
+    @classmethod
+    def _make(cls, trees: _Spine, size: int) -> "SkewBinaryList":
+        lst = cls.__new__(cls)
+        lst._trees = trees
+        lst._size = size
+        return lst
+
+    @staticmethod
+    def _cons(x: Any, trees: _Spine) -> _Spine:
+        if trees is not None and trees[2] is not None:
+            w1, t1, (w2, t2, rest) = trees
+            if w1 == w2:
+                return (1 + w1 + w2, (x, t1, t2), rest)
+        return (1, (x,), trees)
+
+    def is_empty(self) -> bool:
+        return self._trees is None
 
     def cons(self, x: Any) -> "SkewBinaryList":
-        if len(self.trees) >= 2 and self.trees[0][0] == self.trees[1][0]:
-            t1, t2, *rest = self.trees
-            return SkewBinaryList([(1 + t1[0] + t2[0], [x, t1[1], t2[1]])] + rest)
-        return SkewBinaryList([(1, [x])] + self.trees)
+        trees = SkewBinaryList._cons(x, self._trees)
+        return SkewBinaryList._make(trees, self._size + 1)
 
     def head(self) -> Any:
-        return self.trees[0][1][0]
+        if self._trees is None:
+            raise IndexError("head of empty list")
+        return self._trees[1][0]
 
     def tail(self) -> "SkewBinaryList":
-        _, [_, *t], *ts = self.trees
-        if t:
-            return SkewBinaryList([(len(t), t)] + ts)
-        return SkewBinaryList(ts)
+        if self._trees is None:
+            raise IndexError("tail of empty list")
+        w, t, rest = self._trees
+        if w == 1:
+            return SkewBinaryList._make(rest, self._size - 1)
+        half = w // 2
+        return SkewBinaryList._make((half, t[1], (half, t[2], rest)), self._size - 1)
 
-    def lookup(self, i: int) -> Any:
-        def look(i: int, trees: List[Tuple[int, List[Any]]]) -> Any:
-            w, t, *ts = trees
-            if i < w:
-                return t[i]
-            return look(i - w, ts)
+    def _check_index(self, i: int) -> int:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("list index out of range")
+        return i
 
-        return look(i, self.trees)
+    def lookup(self, i: int) -> Any:
+        i = self._check_index(i)
+        trees = self._trees
+        assert trees is not None
+        w, t, rest = trees
+        while i >= w:
+            i -= w
+            w, t, rest = rest
+        while i:
+            w //= 2
+            if i <= w:
+                t = t[1]
+                i -= 1
+            else:
+                t = t[2]
+                i -= 1 + w
+        return t[0]
 
     def update(self, i: int, y: Any) -> "SkewBinaryList":
-        def upd(
-            i: int, trees: List[Tuple[int, List[Any]]]
-        ) -> List[Tuple[int, List[Any]]]:
-            (w, t), *ts = trees
-            if i < w:
-                return [(w, [y if j == i else x for j, x in enumerate(t)])] + ts
-            return [(w, t)] + upd(i - w, ts)
+        i = self._check_index(i)
+        # Walk the spine, remembering the trees we pass so they can be re-linked
+        # in front of the rebuilt one; everything after it is shared as is.
+        skipped: List[Tuple[int, _Tree]] = []
+        trees = self._trees
+        assert trees is not None
+        w, t, rest = trees
+        while i >= w:
+            skipped.append((w, t))
+            i -= w
+            w, t, rest = rest
+        # Walk down to the target, then rebuild the path bottom-up.
+        path: List[Tuple[_Tree, bool]] = []
+        node, size = t, w
+        while i:
+            size //= 2
+            if i <= size:
+                path.append((node, True))
+                node = node[1]
+                i -= 1
+            else:
+                path.append((node, False))
+                node = node[2]
+                i -= 1 + size
+        new: _Tree = (y,) if len(node) == 1 else (y, node[1], node[2])
+        for parent, went_left in reversed(path):
+            if went_left:
+                new = (parent[0], new, parent[2])
+            else:
+                new = (parent[0], parent[1], new)
+        spine: _Spine = (w, new, rest)
+        for sw, st in reversed(skipped):
+            spine = (sw, st, spine)
+        return SkewBinaryList._make(spine, self._size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        trees = self._trees
+        while trees is not None:
+            _, t, trees = trees
+            stack = [t]
+            while stack:
+                node = stack.pop()
+                yield node[0]
+                if len(node) == 3:
+                    stack.append(node[2])
+                    stack.append(node[1])
 
-        return SkewBinaryList(upd(i, self.trees))
+    @overload
+    def __getitem__(self, i: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "SkewBinaryList": ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return SkewBinaryList(list(self)[i])
+        return self.lookup(i)
+
+    def __repr__(self) -> str:
+        return f"SkewBinaryList({list(self)!r})"
+
+
+def benchmark_random_access(
+    sizes: Sequence[int] = (10**5, 10**6), ops: int = 1000, seed: int = 0
+) -> Dict[int, Dict[str, float]]:
+    # Persistent update keeps the old version alive, so the list baseline has to
+    # copy on every write to offer the same guarantee.
+    rng = random.Random(seed)
+    results: Dict[int, Dict[str, float]] = {}
+    for n in sizes:
+        indices = [rng.randrange(n) for _ in range(ops)]
+        sbl = SkewBinaryList(range(n))
+        plain = list(range(n))
+
+        start = time.perf_counter()
+        for i in indices:
+            sbl.lookup(i)
+        sbl_lookup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        version = sbl
+        for i in indices:
+            version = version.update(i, -i)
+        sbl_update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in indices:
+            plain[i]
+        list_lookup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        copy = plain
+        for i in indices:
+            copy = copy.copy()
+            copy[i] = -i
+        list_update = time.perf_counter() - start
+
+        results[n] = {
+            "skew_lookup": sbl_lookup / ops,
+            "skew_update": sbl_update / ops,
+            "list_lookup": list_lookup / ops,
+            "list_copy_update": list_update / ops,
+        }
+    return results
 
 
 # Skew Binomial Heap
+#
+# Okasaki's skew binomial heap: a cons list of skew binomial trees in
+# increasing rank order where only the first two trees may share a rank.
+# insert is a single skew link (O(1)), merge/delete_min are O(log n), and the
+# heap caches its minimum so find_min is O(1).
+class _SkewNode(NamedTuple):
+    rank: int
+    root: Any
+    aux: Any  # cons list of extra elements folded in by skew links
+    children: Any  # cons list of _SkewNode in decreasing rank order
+
+
+_Heap = Optional[Tuple[_SkewNode, Any]]
+
+
+def _link(t1: _SkewNode, t2: _SkewNode) -> _SkewNode:
+    if t2.root < t1.root:
+        t1, t2 = t2, t1
+    return _SkewNode(t1.rank + 1, t1.root, t1.aux, (t2, t1.children))
+
+
+def _skew_link(x: Any, t1: _SkewNode, t2: _SkewNode) -> _SkewNode:
+    t = _link(t1, t2)
+    if t.root < x:
+        return _SkewNode(t.rank, t.root, (x, t.aux), t.children)
+    return _SkewNode(t.rank, x, (t.root, t.aux), t.children)
+
+
+def _heap_insert(x: Any, ts: _Heap) -> _Heap:
+    if ts is not None and ts[1] is not None:
+        t1, (t2, rest) = ts
+        if t1.rank == t2.rank:
+            return (_skew_link(x, t1, t2), rest)
+    return (_SkewNode(0, x, None, None), ts)
+
+
+def _ins_tree(t: _SkewNode, ts: _Heap) -> _Heap:
+    while ts is not None and ts[0].rank <= t.rank:
+        t = _link(t, ts[0])
+        ts = ts[1]
+    return (t, ts)
+
+
+def _merge_trees(ts1: _Heap, ts2: _Heap) -> _Heap:
+    if ts1 is None:
+        return ts2
+    if ts2 is None:
+        return ts1
+    t1, rest1 = ts1
+    t2, rest2 = ts2
+    if t1.rank < t2.rank:
+        return (t1, _merge_trees(rest1, ts2))
+    if t2.rank < t1.rank:
+        return (t2, _merge_trees(ts1, rest2))
+    return _ins_tree(_link(t1, t2), _merge_trees(rest1, rest2))
+
+
+def _normalize(ts: _Heap) -> _Heap:
+    if ts is None:
+        return None
+    return _ins_tree(ts[0], ts[1])
+
+
+def _heap_min(ts: _Heap) -> Any:
+    assert ts is not None
+    best = ts[0].root
+    ts = ts[1]
+    while ts is not None:
+        if ts[0].root < best:
+            best = ts[0].root
+        ts = ts[1]
+    return best
+
+
 class SkewBinomialHeap:
-    def __init__(self, trees: List[Tuple[int, Any, List["SkewBinomialHeap"]]] = []):
-        self.trees = trees
+    __slots__ = ("_trees", "_size", "_min")
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        trees: _Heap = None
+        size = 0
+        smallest: Any = None
+        for x in elements:
+            if trees is None or x < smallest:
+                smallest = x
+            trees = _heap_insert(x, trees)
+            size += 1
+        self._trees = trees
+        self._size = size
+        self._min = smallest
+
+    @classmethod
+    def heapify(cls, elements: Iterable[Any]) -> "SkewBinomialHeap":
+        return cls(elements)
+
+    @classmethod
+    def _make(cls, trees: _Heap, size: int, smallest: Any) -> "SkewBinomialHeap":
+        heap = cls.__new__(cls)
+        heap._trees = trees
+        heap._size = size
+        heap._min = smallest
+        return heap
+
+    def is_empty(self) -> bool:
+        return self._trees is None
 
     def insert(self, x: Any) -> "SkewBinomialHeap":
-        def ins(ts):
-            if len(ts) >= 2 and ts[0][0] == ts[1][0]:
-                t1, t2, *rest = ts
-                return [
-                    (
-                        1 + t1[0] + t2[0],
-                        min(x, t1[1], t2[1]),
-                        [SkewBinomialHeap([t1]), SkewBinomialHeap([t2])],
-                    )
-                ] + rest
-            return [(1, x, [])] + ts
-
-        return SkewBinomialHeap(ins(self.trees))
+        smallest = x if self._trees is None or x < self._min else self._min
+        trees = _heap_insert(x, self._trees)
+        return SkewBinomialHeap._make(trees, self._size + 1, smallest)
+
+    def merge(self, other: "SkewBinomialHeap") -> "SkewBinomialHeap":
+        if other._trees is None:
+            return self
+        if self._trees is None:
+            return other
+        trees = _merge_trees(_normalize(self._trees), _normalize(other._trees))
+        smallest = other._min if other._min < self._min else self._min
+        return SkewBinomialHeap._make(trees, self._size + other._size, smallest)
 
     def find_min(self) -> Any:
-        return min(t[1] for t in self.trees)
+        if self._trees is None:
+            raise IndexError("find_min from empty heap")
+        return self._min
 
     def delete_min(self) -> "SkewBinomialHeap":
-        def merge(h1: "SkewBinomialHeap", h2: "SkewBinomialHeap") -> "SkewBinomialHeap":
-            if not h1.trees:
-                return h2
-            if not h2.trees:
-                return h1
-            if h1.trees[0][0] < h2.trees[0][0]:
-                return SkewBinomialHeap(
-                    [h1.trees[0]] + merge(SkewBinomialHeap(h1.trees[1:]), h2).trees
+        if self._trees is None:
+            raise IndexError("delete_min from empty heap")
+        # Unlink the first tree whose root is not above the cached minimum,
+        # copying only the trees in front of it.
+        before: List[_SkewNode] = []
+        ts = self._trees
+        while self._min < ts[0].root:
+            before.append(ts[0])
+            ts = ts[1]
+        found, rest = ts
+        for t in reversed(before):
+            rest = (t, rest)
+
+        children: _Heap = None
+        kids = found.children
+        while kids is not None:
+            children = (kids[0], children)
+            kids = kids[1]
+        trees = _merge_trees(children, _normalize(rest))
+        aux = found.aux
+        while aux is not None:
+            trees = _heap_insert(aux[0], trees)
+            aux = aux[1]
+
+        if trees is None:
+            return SkewBinomialHeap()
+        return SkewBinomialHeap._make(trees, self._size - 1, _heap_min(trees))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        if self._trees is None:
+            return "SkewBinomialHeap()"
+        return f"SkewBinomialHeap(<{self._size} items, min={self._min!r}>)"
+
+
+def benchmark_priority_queue(
+    n: int = 10**5, snapshots: int = 10, seed: int = 0
+) -> Dict[str, float]:
+    rng = random.Random(seed)
+    data = [rng.random() for _ in range(n)]
+
+    # Ephemeral use: push everything, then pop everything.
+    start = time.perf_counter()
+    heap = SkewBinomialHeap()
+    for x in data:
+        heap = heap.insert(x)
+    while not heap.is_empty():
+        heap.find_min()
+        heap = heap.delete_min()
+    skew_push_pop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plain: List[float] = []
+    for x in data:
+        heapq.heappush(plain, x)
+    while plain:
+        heapq.heappop(plain)
+    heapq_push_pop = time.perf_counter() - start
+
+    # Persistent snapshots: keep a version every n // snapshots inserts and
+    # drain each of them afterwards.  heapq has to copy to get the same thing.
+    every = max(1, n // snapshots)
+    start = time.perf_counter()
+    versions = []
+    heap = SkewBinomialHeap()
+    for i, x in enumerate(data, 1):
+        heap = heap.insert(x)
+        if i % every == 0:
+            versions.append(heap)
+    for version in versions:
+        for _ in range(min(every, len(version))):
+            version = version.delete_min()
+    skew_snapshots = time.perf_counter() - start
+
+    start = time.perf_counter()
+    copies = []
+    plain = []
+    for i, x in enumerate(data, 1):
+        heapq.heappush(plain, x)
+        if i % every == 0:
+            copies.append(list(plain))
+    for copy in copies:
+        for _ in range(min(every, len(copy))):
+            heapq.heappop(copy)
+    heapq_snapshots = time.perf_counter() - start
+
+    return {
+        "skew_push_pop": skew_push_pop,
+        "heapq_push_pop": heapq_push_pop,
+        "skew_snapshots": skew_snapshots,
+        "heapq_copy_snapshots": heapq_snapshots,
+    }
+
+
+# Hash Array Mapped Trie
+#
+# A persistent map (Bagwell's HAMT, as used by Clojure).  Each level consumes
+# five bits of the key's hash, so a lookup visits at most 13 nodes and an
+# assoc/dissoc copies only that path; everything else is shared between
+# versions.  Bitmap nodes keep a flat ``[key, value, key, value, ...]`` array
+# with one pair per set bit; a pair whose key is ``_NODE`` holds a child node.
+# Keys whose full hashes collide share a collision node.
+#
+# Nodes carry the edit token of the transient that created them.  A transient
+# may mutate its own nodes in place, which makes bulk loads much cheaper;
+# calling ``persistent()`` retires the token so the nodes become immutable.
+_HAMT_BITS = 5
+_HAMT_MASK = (1 << _HAMT_BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+_NODE = object()
+_MISSING = object()
+
+
+class _BitmapNode:
+    __slots__ = ("bitmap", "array", "edit")
+
+    def __init__(self, bitmap: int, array: List[Any], edit: Optional[object]):
+        self.bitmap = bitmap
+        self.array = array
+        self.edit = edit
+
+
+class _CollisionNode:
+    __slots__ = ("hash", "array", "edit")
+
+    def __init__(self, hash: int, array: List[Any], edit: Optional[object]):
+        self.hash = hash
+        self.array = array
+        self.edit = edit
+
+
+_HamtNode = Union[_BitmapNode, _CollisionNode]
+
+
+def _hamt_hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _with_array(
+    node: _HamtNode, edit: Optional[object], array: List[Any], bitmap: int = 0
+) -> _HamtNode:
+    if edit is not None and node.edit is edit:
+        node.array = array
+        if isinstance(node, _BitmapNode):
+            node.bitmap = bitmap
+        return node
+    if isinstance(node, _BitmapNode):
+        return _BitmapNode(bitmap, array, edit)
+    return _CollisionNode(node.hash, array, edit)
+
+
+def _with_slot(
+    node: _HamtNode, edit: Optional[object], idx: int, value: Any
+) -> _HamtNode:
+    if edit is not None and node.edit is edit:
+        node.array[idx] = value
+        return node
+    array = node.array.copy()
+    array[idx] = value
+    bitmap = node.bitmap if isinstance(node, _BitmapNode) else 0
+    return _with_array(node, edit, array, bitmap)
+
+
+def _pair_node(
+    shift: int,
+    h1: int,
+    k1: Any,
+    v1: Any,
+    h2: int,
+    k2: Any,
+    v2: Any,
+    edit: Optional[object],
+) -> _HamtNode:
+    if h1 == h2:
+        return _CollisionNode(h1, [k1, v1, k2, v2], edit)
+    i1 = (h1 >> shift) & _HAMT_MASK
+    i2 = (h2 >> shift) & _HAMT_MASK
+    if i1 == i2:
+        child = _pair_node(shift + _HAMT_BITS, h1, k1, v1, h2, k2, v2, edit)
+        return _BitmapNode(1 << i1, [_NODE, child], edit)
+    if i1 < i2:
+        return _BitmapNode((1 << i1) | (1 << i2), [k1, v1, k2, v2], edit)
+    return _BitmapNode((1 << i1) | (1 << i2), [k2, v2, k1, v1], edit)
+
+
+def _hamt_assoc(
+    node: _HamtNode, shift: int, h: int, key: Any, value: Any, edit: Optional[object]
+) -> Tuple[_HamtNode, bool]:
+    if isinstance(node, _CollisionNode):
+        if h != node.hash:
+            # Push the collision node one level down behind a bitmap node.
+            bit = 1 << ((node.hash >> shift) & _HAMT_MASK)
+            wrapper = _BitmapNode(bit, [_NODE, node], edit)
+            return _hamt_assoc(wrapper, shift, h, key, value, edit)
+        array = node.array
+        for idx in range(0, len(array), 2):
+            k = array[idx]
+            if k is key or k == key:
+                if array[idx + 1] is value:
+                    return node, False
+                return _with_slot(node, edit, idx + 1, value), False
+        return _with_array(node, edit, array + [key, value]), True
+
+    bit = 1 << ((h >> shift) & _HAMT_MASK)
+    idx = 2 * (node.bitmap & (bit - 1)).bit_count()
+    array = node.array
+    if not node.bitmap & bit:
+        if edit is not None and node.edit is edit:
+            array[idx:idx] = [key, value]
+            node.bitmap |= bit
+            return node, True
+        return _BitmapNode(
+            node.bitmap | bit, array[:idx] + [key, value] + array[idx:], edit
+        ), True
+    k = array[idx]
+    v = array[idx + 1]
+    if k is _NODE:
+        child, added = _hamt_assoc(v, shift + _HAMT_BITS, h, key, value, edit)
+        if child is v:
+            return node, added
+        return _with_slot(node, edit, idx + 1, child), added
+    if k is key or k == key:
+        if v is value:
+            return node, False
+        return _with_slot(node, edit, idx + 1, value), False
+    child = _pair_node(shift + _HAMT_BITS, _hamt_hash(k), k, v, h, key, value, edit)
+    if edit is not None and node.edit is edit:
+        array[idx] = _NODE
+        array[idx + 1] = child
+        return node, True
+    array = array.copy()
+    array[idx] = _NODE
+    array[idx + 1] = child
+    return _BitmapNode(node.bitmap, array, edit), True
+
+
+def _hamt_dissoc(
+    node: _HamtNode, shift: int, h: int, key: Any, edit: Optional[object]
+) -> Tuple[Optional[_HamtNode], bool]:
+    array = node.array
+    if isinstance(node, _CollisionNode):
+        for idx in range(0, len(array), 2):
+            k = array[idx]
+            if k is key or k == key:
+                if len(array) == 2:
+                    return None, True
+                return _with_array(node, edit, array[:idx] + array[idx + 2 :]), True
+        return node, False
+
+    bit = 1 << ((h >> shift) & _HAMT_MASK)
+    if not node.bitmap & bit:
+        return node, False
+    idx = 2 * (node.bitmap & (bit - 1)).bit_count()
+    k = array[idx]
+    if k is _NODE:
+        child, removed = _hamt_dissoc(
+            array[idx + 1], shift + _HAMT_BITS, h, key, edit
+        )
+        if not removed:
+            return node, False
+        if child is not None:
+            if len(child.array) == 2 and child.array[0] is not _NODE:
+                # Pull a lone key/value pair back up into this node.
+                array = array.copy()
+                array[idx : idx + 2] = child.array
+                return _with_array(node, edit, array, node.bitmap), True
+            return _with_slot(node, edit, idx + 1, child), True
+    elif not (k is key or k == key):
+        return node, False
+    if node.bitmap == bit:
+        return None, True
+    array = array[:idx] + array[idx + 2 :]
+    return _with_array(node, edit, array, node.bitmap ^ bit), True
+
+
+def _hamt_lookup(root: Optional[_HamtNode], key: Any, default: Any) -> Any:
+    h = _hamt_hash(key)
+    node = root
+    shift = 0
+    while node is not None:
+        array = node.array
+        if isinstance(node, _CollisionNode):
+            if node.hash == h:
+                for idx in range(0, len(array), 2):
+                    k = array[idx]
+                    if k is key or k == key:
+                        return array[idx + 1]
+            return default
+        bit = 1 << ((h >> shift) & _HAMT_MASK)
+        if not node.bitmap & bit:
+            return default
+        idx = 2 * (node.bitmap & (bit - 1)).bit_count()
+        k = array[idx]
+        if k is _NODE:
+            node = array[idx + 1]
+            shift += _HAMT_BITS
+        elif k is key or k == key:
+            return array[idx + 1]
+        else:
+            return default
+    return default
+
+
+def _hamt_items(root: Optional[_HamtNode]) -> Iterator[Tuple[Any, Any]]:
+    if root is None:
+        return
+    stack = [root.array]
+    while stack:
+        array = stack.pop()
+        for idx in range(0, len(array), 2):
+            k = array[idx]
+            if k is _NODE:
+                stack.append(array[idx + 1].array)
+            else:
+                yield k, array[idx + 1]
+
+
+class HashArrayMappedTrie(Mapping[Any, Any]):
+    __slots__ = ("_root", "_size")
+
+    def __init__(
+        self, items: Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]] = ()
+    ):
+        self._root: Optional[_HamtNode] = None
+        self._size = 0
+        if items:
+            transient = self.transient()
+            transient.update(items)
+            built = transient.persistent()
+            self._root = built._root
+            self._size = built._size
+
+    @classmethod
+    def _make(cls, root: Optional[_HamtNode], size: int) -> "HashArrayMappedTrie":
+        hamt = cls.__new__(cls)
+        hamt._root = root
+        hamt._size = size
+        return hamt
+
+    def assoc(self, key: Any, value: Any) -> "HashArrayMappedTrie":
+        h = _hamt_hash(key)
+        if self._root is None:
+            i = h & _HAMT_MASK
+            return HashArrayMappedTrie._make(_BitmapNode(1 << i, [key, value], None), 1)
+        root, added = _hamt_assoc(self._root, 0, h, key, value, None)
+        if root is self._root:
+            return self
+        return HashArrayMappedTrie._make(root, self._size + added)
+
+    def dissoc(self, key: Any) -> "HashArrayMappedTrie":
+        if self._root is None:
+            return self
+        root, removed = _hamt_dissoc(self._root, 0, _hamt_hash(key), key, None)
+        if not removed:
+            return self
+        return HashArrayMappedTrie._make(root, self._size - 1)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return _hamt_lookup(self._root, key, default)
+
+    def transient(self) -> "TransientHashArrayMappedTrie":
+        return TransientHashArrayMappedTrie(self._root, self._size)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = _hamt_lookup(self._root, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return _hamt_lookup(self._root, key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        for k, _ in _hamt_items(self._root):
+            yield k
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{k!r}: {v!r}" for k, v in _hamt_items(self._root))
+        return f"HashArrayMappedTrie({{{items}}})"
+
+
+class TransientHashArrayMappedTrie(MutableMapping[Any, Any]):
+    __slots__ = ("_root", "_size", "_edit")
+
+    def __init__(self, root: Optional[_HamtNode] = None, size: int = 0):
+        self._root = root
+        self._size = size
+        self._edit: Optional[object] = object()
+
+    def _check_edit(self) -> object:
+        if self._edit is None:
+            raise RuntimeError("transient used after persistent() call")
+        return self._edit
+
+    def persistent(self) -> HashArrayMappedTrie:
+        self._check_edit()
+        self._edit = None
+        return HashArrayMappedTrie._make(self._root, self._size)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        edit = self._check_edit()
+        h = _hamt_hash(key)
+        if self._root is None:
+            i = h & _HAMT_MASK
+            self._root = _BitmapNode(1 << i, [key, value], edit)
+            self._size = 1
+            return
+        self._root, added = _hamt_assoc(self._root, 0, h, key, value, edit)
+        self._size += added
+
+    def __delitem__(self, key: Any) -> None:
+        edit = self._check_edit()
+        removed = False
+        if self._root is not None:
+            self._root, removed = _hamt_dissoc(
+                self._root, 0, _hamt_hash(key), key, edit
+            )
+        if not removed:
+            raise KeyError(key)
+        self._size -= 1
+
+    def __getitem__(self, key: Any) -> Any:
+        self._check_edit()
+        value = _hamt_lookup(self._root, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        self._check_edit()
+        for k, _ in _hamt_items(self._root):
+            yield k
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def benchmark_versioned_map(
+    keys: int = 10**5, versions: int = 10**3, seed: int = 0
+) -> Dict[str, float]:
+    # Each revision changes one key and every revision stays reachable.  Keeping
+    # 10^3 full dict copies alive would need gigabytes, so the dict baseline's
+    # memory is one measured copy times the number of versions.
+    rng = random.Random(seed)
+    base = {f"key{i}": i for i in range(keys)}
+    edits = [(f"key{rng.randrange(keys)}", -v) for v in range(versions)]
+
+    start = time.perf_counter()
+    hamt = HashArrayMappedTrie(base)
+    hamt_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    history = [hamt]
+    for key, value in edits:
+        history.append(history[-1].assoc(key, value))
+    hamt_versions = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = base
+    for key, value in edits:
+        current = dict(current)
+        current[key] = value
+    dict_versions = time.perf_counter() - start
+
+    del history
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = [hamt]
+    for key, value in edits:
+        history.append(history[-1].assoc(key, value))
+    hamt_bytes = tracemalloc.get_traced_memory()[0] - before
+    before = tracemalloc.get_traced_memory()[0]
+    copy = dict(base)
+    dict_bytes = (tracemalloc.get_traced_memory()[0] - before) * versions
+    tracemalloc.stop()
+    del copy
+
+    return {
+        "hamt_build_seconds": hamt_build,
+        "hamt_seconds_per_version": hamt_versions / versions,
+        "dict_copy_seconds_per_version": dict_versions / versions,
+        "hamt_version_bytes": hamt_bytes,
+        "dict_copy_version_bytes_estimated": dict_bytes,
+    }
+
+
+# Persistent Vector
+#
+# A 32-way bit-partitioned trie (Clojure's PersistentVector).  Index ``i`` is
+# split into 5-bit digits that select one child per level, so lookups and
+# updates touch O(log32 n) nodes.  The last partial chunk lives in a separate
+# tail list, which makes most appends a copy of at most 32 slots; a full tail
+# is pushed into the trie as a new leaf.  Nodes carry an edit token exactly
+# like the HAMT nodes above so TransientVector can build in place.
+#
+# This is not an RRB tree: slicing and concatenation build a new vector
+# through a transient in O(k) for k copied elements, leaving the source intact.
+_VEC_BITS = 5
+_VEC_WIDTH = 1 << _VEC_BITS
+_VEC_MASK = _VEC_WIDTH - 1
+
+
+class _VectorNode:
+    __slots__ = ("array", "edit")
+
+    def __init__(self, array: List[Any], edit: Optional[object]):
+        self.array = array
+        self.edit = edit
+
+
+def _vec_editable(node: _VectorNode, edit: Optional[object]) -> _VectorNode:
+    if edit is not None and node.edit is edit:
+        return node
+    return _VectorNode(node.array.copy(), edit)
+
+
+def _vec_new_path(
+    level: int, node: _VectorNode, edit: Optional[object]
+) -> _VectorNode:
+    while level:
+        node = _VectorNode([node], edit)
+        level -= _VEC_BITS
+    return node
+
+
+def _vec_push_tail(
+    count: int,
+    level: int,
+    parent: _VectorNode,
+    tail_node: _VectorNode,
+    edit: Optional[object],
+) -> _VectorNode:
+    parent = _vec_editable(parent, edit)
+    sub = ((count - 1) >> level) & _VEC_MASK
+    if level == _VEC_BITS:
+        child = tail_node
+    elif sub < len(parent.array):
+        child = _vec_push_tail(
+            count, level - _VEC_BITS, parent.array[sub], tail_node, edit
+        )
+    else:
+        child = _vec_new_path(level - _VEC_BITS, tail_node, edit)
+    if sub < len(parent.array):
+        parent.array[sub] = child
+    else:
+        parent.array.append(child)
+    return parent
+
+
+def _vec_assoc(
+    level: int, node: _VectorNode, i: int, x: Any, edit: Optional[object]
+) -> _VectorNode:
+    node = _vec_editable(node, edit)
+    if level == 0:
+        node.array[i & _VEC_MASK] = x
+    else:
+        sub = (i >> level) & _VEC_MASK
+        node.array[sub] = _vec_assoc(level - _VEC_BITS, node.array[sub], i, x, edit)
+    return node
+
+
+def _vec_tailoff(count: int) -> int:
+    if count < _VEC_WIDTH:
+        return 0
+    return ((count - 1) >> _VEC_BITS) << _VEC_BITS
+
+
+class _VectorState:
+    # Shared by PersistentVector and TransientVector, which differ only in
+    # whether appends and updates copy or mutate.
+    __slots__ = ("_count", "_shift", "_root", "_tail")
+
+    _count: int
+    _shift: int
+    _root: _VectorNode
+    _tail: List[Any]
+
+    def _leaf_for(self, i: int) -> List[Any]:
+        if i >= _vec_tailoff(self._count):
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level:
+            node = node.array[(i >> level) & _VEC_MASK]
+            level -= _VEC_BITS
+        return node.array
+
+    def _check_index(self, i: int) -> int:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("vector index out of range")
+        return i
+
+    def _iter_range(self, start: int, stop: int) -> Iterator[Any]:
+        i = start
+        while i < stop:
+            leaf = self._leaf_for(i)
+            offset = i & _VEC_MASK
+            end = min(len(leaf), offset + stop - i)
+            yield from leaf[offset:end]
+            i += end - offset
+
+    def _append(self, x: Any, edit: Optional[object]) -> None:
+        count = self._count
+        if count - _vec_tailoff(count) < _VEC_WIDTH:
+            if edit is None:
+                self._tail = self._tail + [x]
+            else:
+                self._tail.append(x)
+        else:
+            tail_node = _VectorNode(self._tail, edit)
+            if (count >> _VEC_BITS) > (1 << self._shift):
+                path = _vec_new_path(self._shift, tail_node, edit)
+                self._root = _VectorNode([self._root, path], edit)
+                self._shift += _VEC_BITS
+            else:
+                self._root = _vec_push_tail(
+                    count, self._shift, self._root, tail_node, edit
                 )
-            if h2.trees[0][0] < h1.trees[0][0]:
-                return SkewBinomialHeap(
-                    [h2.trees[0]] + merge(h1, SkewBinomialHeap(h2.trees[1:])).trees
+            self._tail = [x]
+        self._count = count + 1
+
+    def _assoc(self, i: int, x: Any, edit: Optional[object]) -> None:
+        if i >= _vec_tailoff(self._count):
+            if edit is None:
+                self._tail = self._tail.copy()
+            self._tail[i & _VEC_MASK] = x
+        else:
+            self._root = _vec_assoc(self._shift, self._root, i, x, edit)
+
+
+class PersistentVector(_VectorState, Sequence[Any]):
+    __slots__ = ()
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        self._count = 0
+        self._shift = _VEC_BITS
+        self._root = _VectorNode([], None)
+        self._tail = []
+        if elements:
+            built = self.transient().extend(elements).persistent()
+            self._count = built._count
+            self._shift = built._shift
+            self._root = built._root
+            self._tail = built._tail
+
+    def _copy(self) -> "PersistentVector":
+        vec = PersistentVector.__new__(PersistentVector)
+        vec._count = self._count
+        vec._shift = self._shift
+        vec._root = self._root
+        vec._tail = self._tail
+        return vec
+
+    def append(self, x: Any) -> "PersistentVector":
+        vec = self._copy()
+        vec._append(x, None)
+        return vec
+
+    def set(self, i: int, x: Any) -> "PersistentVector":
+        i = self._check_index(i)
+        vec = self._copy()
+        vec._assoc(i, x, None)
+        return vec
+
+    def transient(self) -> "TransientVector":
+        return TransientVector(self)
+
+    @overload
+    def __getitem__(self, i: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "PersistentVector": ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._count)
+            if step == 1:
+                items: Iterable[Any] = self._iter_range(start, max(start, stop))
+            else:
+                items = (
+                    self._leaf_for(j)[j & _VEC_MASK] for j in range(start, stop, step)
                 )
-            return merge(
-                SkewBinomialHeap(h1.trees[1:]), SkewBinomialHeap(h2.trees[1:])
-            ).insert(min(h1.trees[0][1], h2.trees[0][1]))
+            return PersistentVector().transient().extend(items).persistent()
+        i = self._check_index(i)
+        return self._leaf_for(i)[i & _VEC_MASK]
 
-        _, x, ts = min(self.trees, key=lambda t: t[1])
-        return merge(
-            SkewBinomialHeap(self.trees[1:]), SkewBinomialHeap([t for _, _, t in ts])
-        )
+    def __add__(self, other: Iterable[Any]) -> "PersistentVector":
+        return self.transient().extend(other).persistent()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iter_range(0, self._count)
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({list(self)!r})"
+
+
+class TransientVector(_VectorState):
+    __slots__ = ("_edit",)
+
+    def __init__(self, vector: PersistentVector):
+        self._edit: Optional[object] = object()
+        self._count = vector._count
+        self._shift = vector._shift
+        self._root = _VectorNode(vector._root.array.copy(), self._edit)
+        self._tail = vector._tail.copy()
+
+    def _check_edit(self) -> object:
+        if self._edit is None:
+            raise RuntimeError("transient used after persistent() call")
+        return self._edit
+
+    def append(self, x: Any) -> "TransientVector":
+        self._append(x, self._check_edit())
+        return self
+
+    def extend(self, elements: Iterable[Any]) -> "TransientVector":
+        edit = self._check_edit()
+        for x in elements:
+            self._append(x, edit)
+        return self
+
+    def __setitem__(self, i: int, x: Any) -> None:
+        edit = self._check_edit()
+        self._assoc(self._check_index(i), x, edit)
+
+    def __getitem__(self, i: int) -> Any:
+        self._check_edit()
+        i = self._check_index(i)
+        return self._leaf_for(i)[i & _VEC_MASK]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def persistent(self) -> PersistentVector:
+        self._check_edit()
+        self._edit = None
+        vec = PersistentVector.__new__(PersistentVector)
+        vec._count = self._count
+        vec._shift = self._shift
+        vec._root = self._root
+        vec._tail = self._tail
+        return vec
+
+
+def benchmark_indexed_sequences(
+    sizes: Sequence[int] = (10**5, 10**6), ops: int = 1000, seed: int = 0
+) -> Dict[int, Dict[str, float]]:
+    rng = random.Random(seed)
+    results: Dict[int, Dict[str, float]] = {}
+    for n in sizes:
+        indices = [rng.randrange(n) for _ in range(ops)]
+        timings: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        vec = PersistentVector(range(n))
+        timings["vector_build"] = time.perf_counter() - start
+        start = time.perf_counter()
+        sbl = SkewBinaryList(range(n))
+        timings["skew_build"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        appended = PersistentVector()
+        for i in range(ops):
+            appended = appended.append(i)
+        timings["vector_append"] = (time.perf_counter() - start) / ops
+
+        for name, seq in (("vector", vec), ("skew", sbl), ("list", list(range(n)))):
+            start = time.perf_counter()
+            for i in indices:
+                seq[i]
+            timings[f"{name}_lookup"] = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        version = vec
+        for i in indices:
+            version = version.set(i, -i)
+        timings["vector_update"] = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        skew_version = sbl
+        for i in indices:
+            skew_version = skew_version.update(i, -i)
+        timings["skew_update"] = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        copy = list(range(n))
+        for i in indices:
+            copy = copy.copy()
+            copy[i] = -i
+        timings["list_copy_update"] = (time.perf_counter() - start) / ops
+
+        results[n] = timings
+    return results
 
 
 # Sortable Collection
+#
+# Okasaki's bottom-up mergesort.  A collection of size n holds one sorted
+# segment per set bit of n, smallest first; add merges the new singleton with
+# segments while the low bits carry, which is O(log n) amortized, and sort
+# merges the O(log n) segments in O(n).  Segments and the sorted result are
+# lazy and memoized, so every version derived from the same collection shares
+# that work instead of redoing it.
+#
+# Merging two sorted runs is delegated to ``sorted``, whose run detection makes
+# it a linear merge.  With ``key=`` the segments hold ``(key(x), x)`` pairs and
+# compare through ``itemgetter(0)``, so keys are computed once per element and
+# no Python-level comparison function runs; ``compare=`` falls back to
+# ``functools.cmp_to_key``.
+class _Lazy:
+    __slots__ = ("_thunk", "_value")
+
+    def __init__(self, thunk: Optional[Callable[[], Any]], value: Any = None):
+        self._thunk = thunk
+        self._value = value
+
+    def force(self) -> Any:
+        if self._thunk is not None:
+            self._value = self._thunk()
+            self._thunk = None
+        return self._value
+
+
+_first = itemgetter(0)
+_second = itemgetter(1)
+
+
 class SortableCollection:
+    __slots__ = ("_size", "_segments", "_sorted", "compare", "key")
+
     def __init__(
         self,
-        elements: List[Any] = [],
-        compare: Callable[[Any, Any], int] = lambda x, y: x - y,
+        elements: Iterable[Any] = (),
+        compare: Optional[Callable[[Any, Any], int]] = None,
+        key: Optional[Callable[[Any], Any]] = None,
     ):
-        self.elements = elements
+        if compare is not None and key is not None:
+            raise ValueError("pass either compare or key, not both")
         self.compare = compare
+        self.key = key
+        self._size = 0
+        self._segments = _Lazy(None)
+        built = self
+        for x in elements:
+            built = built.add(x)
+        self._size = built._size
+        self._segments = built._segments
+        self._sorted = _Lazy(self._merge_all)
+
+    def _derive(self, size: int, segments: _Lazy) -> "SortableCollection":
+        coll = SortableCollection.__new__(SortableCollection)
+        coll.compare = self.compare
+        coll.key = self.key
+        coll._size = size
+        coll._segments = segments
+        coll._sorted = _Lazy(coll._merge_all)
+        return coll
+
+    def _merge(self, older: List[Any], newer: List[Any]) -> List[Any]:
+        # sorted is stable, so on ties the older elements stay in front.
+        if self.key is not None:
+            return sorted(older + newer, key=_first)
+        if self.compare is not None:
+            return sorted(older + newer, key=functools.cmp_to_key(self.compare))
+        return sorted(older + newer)
+
+    def _merge_all(self) -> Tuple[Any, ...]:
+        merged: List[Any] = []
+        segments = self._segments.force()
+        while segments is not None:
+            merged = self._merge(segments[0], merged)
+            segments = segments[1]
+        if self.key is not None:
+            return tuple(map(_second, merged))
+        return tuple(merged)
 
     def add(self, x: Any) -> "SortableCollection":
-        return SortableCollection(self.elements + [x], self.compare)
+        item = (self.key(x), x) if self.key is not None else x
+        size = self._size
+        # Forcing the parent here keeps suspensions one level deep, so a long
+        # chain of unforced adds cannot exhaust the recursion limit.
+        parent = self._segments.force()
+
+        def add_segment() -> Any:
+            segment = [item]
+            segments = parent
+            carry = size
+            while carry & 1:
+                segment = self._merge(segments[0], segment)
+                segments = segments[1]
+                carry >>= 1
+            return (segment, segments)
+
+        return self._derive(size + 1, _Lazy(add_segment))
 
     def sort(self) -> List[Any]:
-        return sorted(self.elements, key=functools.cmp_to_key(self.compare))
+        return list(self._sorted.force())
+
+    def __len__(self) -> int:
+        return self._size
+
+
+if __name__ == "__main__":
+    print("SkewBinaryList vs list copy-on-write (seconds per op):")
+    for n, timings in benchmark_random_access().items():
+        row = ", ".join(f"{name}={t:.2e}" for name, t in timings.items())
+        print(f"  n={n}: {row}")
+
+    print("SkewBinomialHeap vs heapq (seconds):")
+    for name, t in benchmark_priority_queue().items():
+        print(f"  {name}: {t:.3f}")
+
+    print("HashArrayMappedTrie vs dict copy per version:")
+    for name, value in benchmark_versioned_map().items():
+        print(f"  {name}: {value:.3g}")
+
+    print("PersistentVector vs SkewBinaryList vs list copy (seconds):")
+    for n, timings in benchmark_indexed_sequences().items():
+        row = ", ".join(f"{name}={t:.2e}" for name, t in timings.items())
+        print(f"  n={n}: {row}")
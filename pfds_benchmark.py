@@ -0,0 +1,273 @@
+"""
+Benchmark harness for the persistent data structures in pfds.py.
+
+Every structure is measured under three workloads:
+
+- ephemeral: one version at a time, the way a mutable structure would be used
+- persistent: many live versions branching off earlier ones, each still read
+  after the others were created
+- memory: tracemalloc peak and retained bytes of the persistent workload
+
+Results are written as JSON so runs can be compared across commits:
+
+    python pfds_benchmark.py --size 10000 --output results.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from pfds import BankersQueue, SkewBinaryList, SkewBinomialHeap, SortableCollection
+
+Workload = Callable[[int, int, random.Random], Any]
+
+
+# ----- BankersQueue -----
+
+
+def queue_ephemeral(n: int, versions: int, rng: random.Random) -> Any:
+    q = BankersQueue()
+    for i in range(n):
+        q = q.snoc(i)
+    while not q.is_empty():
+        q.head()
+        q = q.tail()
+    return q
+
+
+def queue_persistent(n: int, versions: int, rng: random.Random) -> Any:
+    history = [BankersQueue()]
+    for i in range(n):
+        history.append(history[-1].snoc(i))
+    live = []
+    for v in range(versions):
+        q = history[rng.randrange(1, len(history))]
+        live.append(q.tail().snoc(v) if rng.random() < 0.5 else q.snoc(v))
+    for q in live:
+        q.head()
+    return history, live
+
+
+# ----- SkewBinaryList -----
+
+
+def skew_list_ephemeral(n: int, versions: int, rng: random.Random) -> Any:
+    lst = SkewBinaryList()
+    for i in range(n):
+        lst = lst.cons(i)
+    for _ in range(n):
+        lst.lookup(rng.randrange(n))
+    while not lst.is_empty():
+        lst = lst.tail()
+    return lst
+
+
+def skew_list_persistent(n: int, versions: int, rng: random.Random) -> Any:
+    live = [SkewBinaryList(range(n))]
+    for v in range(versions):
+        base = live[rng.randrange(len(live))]
+        live.append(base.update(rng.randrange(n), -v))
+    for lst in live:
+        lst.lookup(rng.randrange(n))
+    return live
+
+
+# ----- SkewBinomialHeap -----
+
+
+def heap_ephemeral(n: int, versions: int, rng: random.Random) -> Any:
+    heap = SkewBinomialHeap()
+    for _ in range(n):
+        heap = heap.insert(rng.random())
+    while not heap.is_empty():
+        heap.find_min()
+        heap = heap.delete_min()
+    return heap
+
+
+def heap_persistent(n: int, versions: int, rng: random.Random) -> Any:
+    live = [SkewBinomialHeap.heapify(rng.random() for _ in range(n))]
+    for _ in range(versions):
+        base = live[rng.randrange(len(live))]
+        if len(base) and rng.random() < 0.5:
+            live.append(base.delete_min())
+        else:
+            live.append(base.insert(rng.random()))
+    for heap in live:
+        if not heap.is_empty():
+            heap.find_min()
+    return live
+
+
+# ----- SortableCollection -----
+
+
+def sortable_ephemeral(n: int, versions: int, rng: random.Random) -> Any:
+    coll = SortableCollection()
+    for _ in range(n):
+        coll = coll.add(rng.random())
+    return coll.sort()
+
+
+def sortable_persistent(n: int, versions: int, rng: random.Random) -> Any:
+    base = SortableCollection(rng.random() for _ in range(n))
+    base.sort()
+    live = [base]
+    for _ in range(versions):
+        live.append(live[rng.randrange(len(live))].add(rng.random()))
+    # Only a sample is sorted: sorting every version would measure n * versions
+    # of merging rather than the structure's sharing.
+    for coll in rng.sample(live, min(len(live), 10)):
+        coll.sort()
+    return live
+
+
+WORKLOADS: Dict[str, Dict[str, Workload]] = {
+    "BankersQueue": {"ephemeral": queue_ephemeral, "persistent": queue_persistent},
+    "SkewBinaryList": {
+        "ephemeral": skew_list_ephemeral,
+        "persistent": skew_list_persistent,
+    },
+    "SkewBinomialHeap": {"ephemeral": heap_ephemeral, "persistent": heap_persistent},
+    "SortableCollection": {
+        "ephemeral": sortable_ephemeral,
+        "persistent": sortable_persistent,
+    },
+}
+
+
+def time_workload(
+    workload: Workload, n: int, versions: int, repeat: int, seed: int
+) -> Dict[str, float]:
+    """Run a workload `repeat` times with a fresh RNG and summarise the timings."""
+    timings = []
+    for _ in range(repeat):
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        workload(n, versions, rng)
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def measure_memory(
+    workload: Workload, n: int, versions: int, seed: int
+) -> Dict[str, int]:
+    """Return tracemalloc's peak and retained bytes while the result is alive."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = workload(n, versions, random.Random(seed))
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"retained_bytes": current - before, "peak_bytes": peak - before}
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_benchmarks(
+    n: int = 10_000,
+    versions: int = 1_000,
+    repeat: int = 3,
+    seed: int = 0,
+    structures: Optional[List[str]] = None,
+    memory: bool = True,
+) -> Dict[str, Any]:
+    """Run every selected workload and return a JSON-serialisable report."""
+    results = []
+    for name in structures or list(WORKLOADS):
+        workloads = WORKLOADS[name]
+        for kind, workload in workloads.items():
+            results.append(
+                {
+                    "structure": name,
+                    "workload": kind,
+                    "n": n,
+                    "versions": versions if kind == "persistent" else 1,
+                    "seconds": time_workload(workload, n, versions, repeat, seed),
+                }
+            )
+        if memory:
+            results.append(
+                {
+                    "structure": name,
+                    "workload": "memory",
+                    "n": n,
+                    "versions": versions,
+                    "bytes": measure_memory(workloads["persistent"], n, versions, seed),
+                }
+            )
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pfds structures")
+    parser.add_argument("--size", type=int, default=10_000, help="Elements per run")
+    parser.add_argument(
+        "--versions", type=int, default=1_000, help="Live versions to create"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--structure",
+        action="append",
+        choices=sorted(WORKLOADS),
+        help="Structure to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc pass"
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        n=args.size,
+        versions=args.versions,
+        repeat=args.repeat,
+        seed=args.seed,
+        structures=args.structure,
+        memory=not args.no_memory,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Repository-wide AST and bytecode metrics.
+
+Every Python file under a directory is parsed and compiled in a process pool,
+and each code object (module body, function, lambda, comprehension, class
+body) becomes one row of the report:
+
+- ast_nodes: nodes in the function's AST subtree, nested functions included
+- instructions: bytecode instructions in the code object itself
+- stacksize, freevars, cellvars, consts: from the code object
+
+The report is columnar JSON, one list per column, so it loads straight into a
+dataframe:
+
+    python repo_analysis.py . --output analysis.json
+
+Files whose mtime and size are unchanged since the previous run are taken from
+a cache; files that were touched but whose content hash still matches are not
+re-analysed either.
+"""
+import argparse
+import ast
+import dis
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from importlib.util import MAGIC_NUMBER
+from types import CodeType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+COLUMNS = (
+    "file",
+    "function",
+    "lineno",
+    "ast_nodes",
+    "instructions",
+    "stacksize",
+    "freevars",
+    "cellvars",
+    "consts",
+)
+DEFAULT_CACHE = ".repo_analysis_cache.json"
+EXCLUDED_DIRS = frozenset(
+    {".git", "__pycache__", ".venv", "venv", ".tox", ".nox", "node_modules"}
+)
+
+Row = List[Any]
+
+_SCOPE_NAMES = {
+    ast.Lambda: "<lambda>",
+    ast.ListComp: "<listcomp>",
+    ast.SetComp: "<setcomp>",
+    ast.DictComp: "<dictcomp>",
+    ast.GeneratorExp: "<genexpr>",
+}
+
+
+def iter_python_files(root: str) -> Iterator[str]:
+    """Yield .py files under root in a stable order, skipping tool directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                yield os.path.join(dirpath, name)
+
+
+def _scope_sizes(tree: ast.AST) -> Dict[Tuple[str, int], List[int]]:
+    """
+    Map (code object name, first line) to AST subtree sizes, in source order.
+
+    Sizes come from one iterative depth-first pass.  Scopes are listed when
+    they are entered (pre-order), the order _iter_code yields code objects,
+    so scopes nested on one line, such as lambda: lambda: 1, line up with
+    their code objects.  The first line follows the compiler: a decorated
+    def or class starts at its first decorator.
+    """
+    keys: List[Tuple[str, int]] = []
+    totals: List[int] = []
+    stack: List[List[Any]] = []
+
+    def enter(node: ast.AST) -> None:
+        key = _scope_key(node)
+        if key is not None:
+            keys.append(key)
+            totals.append(0)
+        slot = len(keys) - 1 if key is not None else None
+        stack.append([node, ast.iter_child_nodes(node), 1, slot])
+
+    enter(tree)
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is not None:
+            enter(child)
+            continue
+        stack.pop()
+        _, _, size, slot = frame
+        if stack:
+            stack[-1][2] += size
+        if slot is not None:
+            totals[slot] = size
+    sizes: Dict[Tuple[str, int], List[int]] = {}
+    for key, size in zip(keys, totals):
+        sizes.setdefault(key, []).append(size)
+    return sizes
+
+
+def _scope_key(node: ast.AST) -> Optional[Tuple[str, int]]:
+    """(code object name, first line) if node compiles to its own code object."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        lines = [node.lineno] + [d.lineno for d in node.decorator_list]
+        return node.name, min(lines)
+    if type(node) in _SCOPE_NAMES:
+        return _SCOPE_NAMES[type(node)], node.lineno
+    if isinstance(node, ast.Module):
+        return "<module>", 1
+    return None
+
+
+def _iter_code(code: CodeType) -> Iterator[CodeType]:
+    """Yield a code object and every code object nested in its constants."""
+    stack = [code]
+    while stack:
+        code = stack.pop()
+        yield code
+        stack.extend(
+            reversed([c for c in code.co_consts if isinstance(c, CodeType)])
+        )
+
+
+def analyze_source(source: str, filename: str) -> List[Row]:
+    """
+    Return one metrics row per code object compiled from source.
+
+    Raises:
+        SyntaxError: If the source does not parse.
+    """
+    tree = ast.parse(source, filename)
+    sizes = _scope_sizes(tree)
+    rows = []
+    for code in _iter_code(compile(tree, filename, "exec")):
+        name = code.co_name
+        lineno = 1 if name == "<module>" else code.co_firstlineno
+        candidates = sizes.get((name, lineno))
+        ast_nodes = candidates.pop(0) if candidates else None
+        rows.append(
+            [
+                filename,
+                getattr(code, "co_qualname", name),
+                lineno,
+                ast_nodes,
+                sum(1 for _ in dis.get_instructions(code)),
+                code.co_stacksize,
+                len(code.co_freevars),
+                len(code.co_cellvars),
+                len(code.co_consts),
+            ]
+        )
+    return rows
+
+
+def _analyze_file(task: Tuple[str, str, Optional[str]]) -> Dict[str, Any]:
+    """Worker: hash a file and analyse it unless the hash is already known."""
+    path, relpath, known_hash = task
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        # Deleted or unreadable since the directory walk.
+        return {
+            "file": relpath,
+            "sha256": None,
+            "rows": [],
+            "error": f"{type(e).__name__}: {e}",
+        }
+    digest = hashlib.sha256(data).hexdigest()
+    result: Dict[str, Any] = {"file": relpath, "sha256": digest, "rows": None}
+    if digest == known_hash:
+        return result
+    try:
+        result["rows"] = analyze_source(data.decode("utf-8"), relpath)
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        result["rows"] = []
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _load_cache(path: Optional[str]) -> Dict[str, Any]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        cache = json.load(f)
+    # Bytecode metrics are only comparable within one interpreter version.
+    if cache.get("magic") != MAGIC_NUMBER.hex():
+        return {}
+    return cache.get("files", {})
+
+
+def analyze_repository(
+    root: str = ".",
+    jobs: Optional[int] = None,
+    cache_path: Optional[str] = DEFAULT_CACHE,
+) -> Dict[str, Any]:
+    """
+    Collect per-code-object metrics for every Python file under root.
+
+    Args:
+        root: Directory to walk.
+        jobs: Worker processes; defaults to every core.
+        cache_path: JSON file remembering results between runs, or None.
+
+    Returns:
+        A report with "meta", "columns" (column name -> list of values, one
+        entry per code object) and "errors" (file -> message).
+    """
+    start = time.perf_counter()
+    cache = _load_cache(cache_path)
+    entries: Dict[str, Dict[str, Any]] = {}
+    tasks = []
+    for path in iter_python_files(root):
+        relpath = os.path.relpath(path, root)
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            # A broken symlink, or deleted since the directory walk.
+            entries[relpath] = {"rows": [], "error": f"{type(e).__name__}: {e}"}
+            continue
+        cached = cache.get(relpath)
+        stamp = {"mtime": st.st_mtime_ns, "size": st.st_size}
+        if cached and all(cached.get(key) == value for key, value in stamp.items()):
+            entries[relpath] = cached
+            continue
+        entries[relpath] = stamp
+        tasks.append((path, relpath, cached.get("sha256") if cached else None))
+
+    reanalysed = 0
+    if tasks:
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (workers * 4))
+        # multiprocessing rather than concurrent.futures: the latter imports the
+        # stdlib logging module, which this repository's logging.py shadows.
+        with multiprocessing.Pool(workers) as pool:
+            for result in pool.imap_unordered(_analyze_file, tasks, chunksize):
+                entry = entries[result["file"]]
+                entry["sha256"] = result["sha256"]
+                if result["rows"] is None:
+                    entry["rows"] = cache[result["file"]]["rows"]
+                    entry["error"] = cache[result["file"]].get("error")
+                else:
+                    reanalysed += 1
+                    entry["rows"] = result["rows"]
+                    entry["error"] = result.get("error")
+
+    if cache_path:
+        with open(cache_path, "w") as f:
+            json.dump({"magic": MAGIC_NUMBER.hex(), "files": entries}, f)
+
+    columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+    for relpath in sorted(entries):
+        for row in entries[relpath]["rows"]:
+            for name, value in zip(COLUMNS, row):
+                columns[name].append(value)
+    return {
+        "meta": {
+            "root": os.path.abspath(root),
+            "python": sys.version,
+            "files": len(entries),
+            "reanalysed": reanalysed,
+            "cached": len(entries) - reanalysed,
+            "seconds": time.perf_counter() - start,
+        },
+        "columns": columns,
+        "errors": {
+            relpath: entry["error"]
+            for relpath, entry in sorted(entries.items())
+            if entry.get("error")
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Collect AST and bytecode metrics for every Python file"
+    )
+    parser.add_argument("root", nargs="?", default=".", help="Directory to walk")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: all)")
+    parser.add_argument(
+        "--cache", default=DEFAULT_CACHE, help="Cache file for unchanged files"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Analyse every file")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = analyze_repository(
+        args.root, jobs=args.jobs, cache_path=None if args.no_cache else args.cache
+    )
+    text = json.dumps(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    meta = report["meta"]
+    print(
+        f"{meta['files']} files ({meta['reanalysed']} analysed, "
+        f"{meta['cached']} cached) in {meta['seconds']:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Tests for bytecode_inspector.py.
+"""
+import importlib.util
+import io
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bytecode_inspector import (
+    CodeIndex,
+    compile_many,
+    compile_to_bytecode,
+    diff_stats,
+    find_slow_patterns,
+    inspect_pyc,
+    instruction_stats,
+    load_code,
+    main,
+    pyc_is_current,
+    read_pyc_header,
+)
+
+MODULE = """\
+class Greeter:
+    def greet(self, name):
+        return [name.upper() for _ in range(2)]
+
+
+def helper():
+    return lambda: 1
+
+
+def helper():
+    return 2
+
+
+raise SystemExit("executed")
+"""
+
+
+class TestCompile:
+    """Test hash-checked compilation."""
+
+    def test_pyc_next_to_source(self, tmp_path, monkeypatch):
+        """The pyc lands in the source's __pycache__, not the cwd's."""
+        src = tmp_path / "pkg" / "mod.py"
+        src.parent.mkdir()
+        src.write_text("x = 1\n")
+        monkeypatch.chdir(tmp_path)
+        pyc = compile_to_bytecode(str(src))
+        assert pyc == importlib.util.cache_from_source(str(src))
+        header = read_pyc_header(pyc)
+        assert header["magic"] == importlib.util.MAGIC_NUMBER
+        assert header["hash_based"] and header["check_source"]
+
+    def test_skips_unchanged_source(self, tmp_path, capsys):
+        """Only a change to the source contents triggers recompilation."""
+        src = tmp_path / "mod.py"
+        src.write_text("x = 1\n")
+        compile_to_bytecode(str(src))
+        os.utime(src, ns=(0, 0))
+        assert pyc_is_current(str(src))
+        compile_to_bytecode(str(src))
+        assert "Up to date" in capsys.readouterr().out
+        src.write_text("x = 2\n")
+        assert not pyc_is_current(str(src))
+
+    def test_compile_many(self, tmp_path):
+        """Batch mode compiles stale files and skips current ones."""
+        for i in range(5):
+            (tmp_path / f"m{i}.py").write_text(f"x = {i}\n")
+        (tmp_path / "bad.py").write_text("def f(:\n")
+        assert compile_many([str(tmp_path)], workers=2) == (5, 0, 1)
+        assert compile_many([str(tmp_path)], workers=2) == (0, 5, 1)
+        assert compile_many([str(tmp_path)], workers=1, force=True) == (5, 0, 1)
+
+
+class TestCodeIndex:
+    """Test non-executing pyc inspection."""
+
+    @pytest.fixture
+    def pyc(self, tmp_path):
+        src = tmp_path / "mod.py"
+        src.write_text(MODULE)
+        return compile_to_bytecode(str(src))
+
+    def test_index_without_executing(self, pyc):
+        """Loading never runs the module body."""
+        index = CodeIndex(load_code(pyc))
+        # Comprehensions are inlined from 3.12 (PEP 709)
+        listcomp = []
+        if sys.version_info < (3, 12):
+            listcomp = ["Greeter.greet.<locals>.<listcomp>"]
+        assert index.names() == [
+            "<module>",
+            "Greeter",
+            "Greeter.greet",
+            *listcomp,
+            "helper",
+            "helper.<locals>.<lambda>",
+            "helper@10",
+        ]
+
+    def test_lazy_lookup(self, pyc):
+        """Looking up an early name leaves later code objects unvisited."""
+        index = CodeIndex(load_code(pyc))
+        assert index["Greeter.greet"].co_firstlineno == 2
+        assert "helper" not in index._index
+        with pytest.raises(KeyError):
+            index["missing"]
+
+    def test_disassemble_one(self, pyc):
+        """Only the requested code object is disassembled."""
+        out = io.StringIO()
+        CodeIndex(load_code(pyc)).disassemble("helper@10", file=out)
+        # RETURN_CONST from 3.12, RETURN_VALUE before
+        assert "RETURN_" in out.getvalue()
+        assert "<lambda>" not in out.getvalue()
+
+    def test_inspect_pyc_timings(self, pyc, capsys):
+        """inspect_pyc reports load, index and disassembly timings."""
+        assert set(inspect_pyc(pyc, "Greeter.greet")) == {
+            "load",
+            "index",
+            "disassemble",
+        }
+        assert "Disassembly of Greeter.greet" in capsys.readouterr().out
+
+    def test_main_inspects_every_file(self, tmp_path, monkeypatch, capsys):
+        """Every positional file is inspected, not just the first."""
+        paths = []
+        for name in ("one.py", "two.py"):
+            (tmp_path / name).write_text(MODULE)
+            paths.append(str(tmp_path / name))
+        argv = ["bytecode_inspector.py", "--function", "helper@10", *paths]
+        monkeypatch.setattr(sys, "argv", argv)
+        main()
+        out = capsys.readouterr().out
+        assert out.count("Disassembly of helper@10") == 2
+
+    def test_rejects_other_versions(self, pyc):
+        """A pyc with a foreign magic number is refused."""
+        with open(pyc, "r+b") as f:
+            f.write(b"\x00\x00\r\n")
+        with pytest.raises(ValueError):
+            load_code(pyc)
+
+
+SLOW = """\
+import math
+
+
+def slow(points):
+    total = 0
+    for p in points:
+        total += math.sqrt(p.x * p.x)
+        tags = [1, 2, 3]
+    return total
+"""
+
+
+class TestInstructionStats:
+    """Test opcode histograms, slow patterns and diffs."""
+
+    def test_histograms(self):
+        """Per-function histograms add up to the file total."""
+        stats = instruction_stats(compile(SLOW, "slow.py", "exec"))
+        assert stats["file"] == "slow.py"
+        assert set(stats["functions"]) == {"<module>", "slow"}
+        assert stats["instructions"] == sum(
+            f["instructions"] for f in stats["functions"].values()
+        )
+        assert stats["functions"]["slow"]["opcodes"]["FOR_ITER"] == 1
+
+    def test_slow_patterns(self):
+        """Globals, repeated attributes and list rebuilds in loops are flagged."""
+        module = compile(SLOW, "slow.py", "exec")
+        code = next(c for c in module.co_consts if hasattr(c, "co_code"))
+        found = {(w["pattern"], w["line"]) for w in find_slow_patterns(code)}
+        assert ("global-in-loop", 7) in found
+        assert ("list-rebuilt-in-loop", 8) in found
+        assert any(pattern == "repeated-attribute-load" for pattern, _ in found)
+
+    def test_no_loops_no_warnings(self):
+        """Straight-line code is not flagged."""
+        code = compile("def f(p):\n    return p.x + p.x + len(p)\n", "m", "exec")
+        assert find_slow_patterns(code.co_consts[0]) == []
+
+    def test_diff(self):
+        """A diff reports only functions and opcodes that changed."""
+        old = instruction_stats(compile(SLOW, "old.py", "exec"))
+        faster = SLOW.replace("math.sqrt(p.x * p.x)", "abs(p.x)")
+        new = instruction_stats(compile(faster, "new.py", "exec"))
+        diff = diff_stats(old, new)
+        assert list(diff["functions"]) == ["slow"]
+        assert diff["functions"]["slow"]["delta"] < 0
+        assert diff["instructions"]["delta"] == diff["functions"]["slow"]["delta"]
+        assert diff["opcodes"]["BINARY_OP"] == -1
+        assert diff_stats(old, old)["functions"] == {}
@@ -0,0 +1,409 @@
+"""
+Tests for the measuring tools in interpreter_internals.py.
+"""
+import gc
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interpreter_internals import (
+    PythonInternalsExplorer,
+    StackSampler,
+    parse_importtime,
+    pause_histogram,
+)
+
+
+def loop(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def many_calls():
+    return [loop(10) for _ in range(100)]
+
+
+class TestOpcodeProfile:
+    """Test the opcode profiler."""
+
+    def setup_method(self):
+        self.explorer = PythonInternalsExplorer()
+
+    def test_counts_loop_body(self):
+        """Loop-body instructions run once per iteration."""
+        profile = self.explorer.profile_opcodes(loop, 50)
+        assert profile.result == sum(range(50))
+        code = loop.__code__
+        per_offset = {
+            offset: n for (c, offset), n in profile.counts.items() if c is code
+        }
+        assert max(per_offset.values()) in (50, 51)
+        body_line = code.co_firstlineno + 3
+        assert profile.by_line()[0][0] == (code.co_filename, body_line, "loop")
+
+    def test_annotate(self):
+        """The annotated listing shows counts next to the instructions."""
+        profile = self.explorer.profile_opcodes(loop, 5)
+        listing = profile.annotate(loop.__code__)
+        assert "FOR_ITER" in listing
+        assert any(line.split()[0] == "5" for line in listing.splitlines())
+        # The line column holds line numbers, not 3.13's boolean starts_line
+        lines = {row[11:16].strip() for row in listing.splitlines()} - {""}
+        first = loop.__code__.co_firstlineno
+        assert lines <= {str(first + n) for n in range(5)}
+        assert str(first + 3) in lines
+
+    def test_max_events(self):
+        """Counting stops once max_events instructions were seen."""
+        profile = self.explorer.profile_opcodes(loop, 10_000, max_events=100)
+        assert profile.truncated
+        assert profile.total <= 100 * profile.sample_every
+        assert profile.result == sum(range(10_000))
+
+    @pytest.mark.parametrize("mechanism", ["sys.monitoring", "f_trace_opcodes"])
+    def test_sampling_estimates_total(self, mechanism, monkeypatch):
+        """Sampled counts are scaled to approximate the exact total."""
+        if mechanism == "sys.monitoring" and not hasattr(sys, "monitoring"):
+            pytest.skip("sys.monitoring needs Python 3.12")
+        if mechanism == "f_trace_opcodes":
+            monkeypatch.delattr(sys, "monitoring", raising=False)
+        exact = self.explorer.profile_opcodes(many_calls)
+        sampled = self.explorer.profile_opcodes(many_calls, sample_every=10)
+        assert exact.mechanism == sampled.mechanism == mechanism
+        assert sampled.sample_every == 10
+        assert abs(sampled.total - exact.total) < exact.total * 0.2
+        assert sys.gettrace() is None
+
+
+class TestMemory:
+    """Test the memory explorer API."""
+
+    def setup_method(self):
+        self.explorer = PythonInternalsExplorer()
+
+    def test_snapshot_diff(self):
+        """The workload's allocations show up at its own line."""
+        diff = self.explorer.memory_snapshot_diff(lambda: [bytearray(1000)] * 1)
+        assert diff["result"][0] == bytearray(1000)
+        assert diff["size_diff"] >= 1000
+        assert diff["top"][0]["filename"] == __file__
+
+    def test_deep_sizeof_cycles(self):
+        """Cycles are counted once and deep nesting does not recurse."""
+        a = [1]
+        a.append(a)
+        assert self.explorer.deep_sizeof(a) == sys.getsizeof(a) + sys.getsizeof(1)
+        deep = []
+        for _ in range(100_000):
+            deep = [deep]
+        expected = 100_000 * sys.getsizeof([0]) + sys.getsizeof([])
+        assert self.explorer.deep_sizeof(deep) == expected
+
+    def test_deep_sizeof_by_type(self):
+        """Per-type counts include dict keys and skip shared classes."""
+        total, by_type = self.explorer.deep_sizeof({"key": (1.5, int)}, by_type=True)
+        assert by_type["str"][0] == 1
+        assert by_type["float"][0] == 1
+        assert "type" not in by_type
+        assert total == sum(size for _, size in by_type.values())
+
+    def test_gc_stats(self):
+        """Generation stats and young-generation type counts are reported."""
+        stats = self.explorer.gc_stats()
+        assert len(stats["generations"]) == 3
+        assert all(count > 0 for _, count in stats["young_types"])
+
+
+class TestGcPauses:
+    """Test GC pause measurement and the settings sweep."""
+
+    def setup_method(self):
+        self.explorer = PythonInternalsExplorer()
+
+    def test_measure_pauses(self):
+        """Explicit collections are recorded with their generation."""
+        callbacks = len(gc.callbacks)
+
+        def workload():
+            gc.collect()
+            return 7
+
+        measured = self.explorer.measure_gc_pauses(workload)
+        assert measured["result"] == 7
+        assert measured["summary"]["collections"] >= 1
+        assert measured["pauses"][-1]["generation"] == 2
+        assert sum(count for _, count in measured["histogram"]) == len(
+            measured["pauses"]
+        )
+        assert len(gc.callbacks) == callbacks
+
+    def test_pause_histogram(self):
+        """Durations fall into the first bucket they are below."""
+        assert pause_histogram([5e-6, 5e-5, 2.0], buckets=(1e-5, 1e-3)) == [
+            ("< 10us", 1),
+            ("< 1000us", 1),
+            (">= 1000us", 1),
+        ]
+
+    def test_sweep_restores_settings(self):
+        """Every candidate gets a row and the original thresholds come back."""
+        original = gc.get_threshold()
+        rows = self.explorer.sweep_gc_settings(
+            lambda: [[] for _ in range(1000)],
+            candidates=[("small", (10, 10, 10), False), ("frozen", original, True)],
+            repeat=2,
+        )
+        assert [row["label"] for row in rows] == ["small", "frozen"]
+        assert rows[0]["collections"] > rows[1]["collections"]
+        assert all(row["throughput"] > 0 for row in rows)
+        assert gc.get_threshold() == original
+        assert gc.get_freeze_count() == 0
+
+    def test_sweep_keeps_callers_freeze(self):
+        """Objects frozen before the sweep stay frozen; freeze rows are skipped."""
+        candidates = [
+            ("plain", gc.get_threshold(), False),
+            ("frozen", gc.get_threshold(), True),
+        ]
+        gc.freeze()
+        try:
+            rows = self.explorer.sweep_gc_settings(
+                lambda: [[] for _ in range(100)], candidates=candidates, repeat=1
+            )
+            assert [row["label"] for row in rows] == ["plain"]
+            # Frozen objects can still be freed, but none were unfrozen
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     _c
+import time:       200 |        300 |   b
+import time:        50 |         50 |   d
+import time:       400 |        750 | a
+import time:        10 |         10 | e
+"""
+
+
+class TestImports:
+    """Test the import-time profiler."""
+
+    def test_parse_importtime(self):
+        """Nesting follows the indentation of -X importtime output."""
+        a, e = parse_importtime(IMPORTTIME)
+        assert (a["name"], a["self_us"], a["cumulative_us"]) == ("a", 400, 750)
+        assert [c["name"] for c in a["children"]] == ["b", "d"]
+        assert a["children"][0]["children"][0]["name"] == "_c"
+        assert e["children"] == []
+
+    def test_profile_imports(self):
+        """A real import produces a tree containing the module."""
+        roots = PythonInternalsExplorer().profile_imports("json")
+        assert "json" in [root["name"] for root in roots]
+
+    def test_profile_imports_from_any_directory(self, tmp_path, monkeypatch):
+        """The explorer's own module is found whatever the working directory."""
+        monkeypatch.chdir(tmp_path)
+        roots = PythonInternalsExplorer().profile_imports("interpreter_internals")
+        assert "interpreter_internals" in [root["name"] for root in roots]
+
+    def test_profile_imports_failure_without_stderr(self, monkeypatch):
+        """A failing child with no output still raises ImportError."""
+        import subprocess
+
+        def fake_run(*args, **kwargs):
+            return subprocess.CompletedProcess(args, 1, stdout="", stderr="")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        with pytest.raises(ImportError, match="exited with 1"):
+            PythonInternalsExplorer().profile_imports("json")
+
+    def test_module_import_is_lazy(self):
+        """Importing the explorer does not pull in the heavy section modules."""
+        import subprocess
+
+        code = (
+            "import sys, interpreter_internals; "
+            "print(sorted({'dis', 'inspect', 'ctypes', 'IPython'} & set(sys.modules)))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, cwd=root
+        )
+        assert out.stdout.strip() == "[]"
+
+    def test_startup_before_and_after(self):
+        """The eager startup run loads the old module-level imports first."""
+        import subprocess
+
+        for eager in (False, True):
+            code = PythonInternalsExplorer._cli_startup_code(eager)
+            out = subprocess.run(
+                [sys.executable, "-c", code + "\nprint('dis' in sys.modules)"],
+                capture_output=True,
+                text=True,
+            )
+            assert out.returncode == 0
+            assert out.stdout.splitlines()[-1] == str(eager)
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestStackSampler:
+    """Test the sampling profiler."""
+
+    def test_samples_running_code(self):
+        """The busy function shows up as a leaf of the sampled stacks."""
+        with StackSampler(interval=0.002) as sampler:
+            spin(0.2)
+        assert sampler.samples > 5
+        leaves = {stack[-1].split(" ")[0] for stack in sampler.stacks}
+        assert "spin" in leaves
+        assert all(stack[0] == "MainThread" for stack in sampler.stacks)
+        assert abs(sum(sampler.seconds.values()) - sampler.duration) < 0.1
+
+    def test_outputs(self, tmp_path):
+        """Collapsed lines and the speedscope document describe the same stacks."""
+        with StackSampler(interval=0.002, per_thread=False) as sampler:
+            spin(0.05)
+        lines = sampler.collapsed()
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sum(
+            sampler.stacks.values()
+        )
+        doc = sampler.speedscope()
+        profile = doc["profiles"][0]
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"]) == len(lines)
+        frames = doc["shared"]["frames"]
+        assert all(0 <= i < len(frames) for ids in profile["samples"] for i in ids)
+        path = tmp_path / "out.speedscope.json"
+        sampler.write_speedscope(str(path))
+        assert json.loads(path.read_text())["exporter"].endswith("StackSampler")
+
+    def test_start_twice(self):
+        """A running sampler cannot be started again."""
+        sampler = StackSampler().start()
+        try:
+            with pytest.raises(RuntimeError):
+                sampler.start()
+        finally:
+            sampler.stop()
+
+    def test_unstarted(self):
+        """A sampler that never ran can be stopped and reported on."""
+        sampler = StackSampler()
+        assert sampler.stop() is sampler
+        assert (sampler.duration, sampler.samples, sampler.collapsed()) == (0.0, 0, [])
+
+    def test_report_while_running(self):
+        """Reports read a snapshot, so they work while stacks are being added."""
+        import threading
+
+        def recurse(depth):
+            return recurse(depth - 1) if depth else spin(0.001)
+
+        done = threading.Event()
+
+        def busy():
+            while not done.is_set():
+                for depth in range(30):
+                    recurse(depth)
+
+        worker = threading.Thread(target=busy)
+        with StackSampler(interval=0.0005) as sampler:
+            worker.start()
+            try:
+                for _ in range(200):
+                    sampler.collapsed()
+                    sampler.speedscope()
+            finally:
+                done.set()
+                worker.join()
+        stacks, seconds = sampler.snapshot()
+        assert stacks == sampler.stacks and set(seconds) == set(stacks)
+
+
+class TestGilContention:
+    """Test the GIL contention probe."""
+
+    def setup_method(self):
+        self.explorer = PythonInternalsExplorer()
+
+    def test_interpreter_state_runs(self, capsys, monkeypatch):
+        """The state section no longer fails on threading or getcheckinterval."""
+        run = {
+            "switch_interval": 0.005,
+            "wall": 0.1,
+            "cores_used": 1.0,
+            "threads": [],
+            "probe": {"wait_ratio": 0.0, "slowdown": 1.0},
+        }
+        monkeypatch.setattr(
+            self.explorer,
+            "measure_gil_contention",
+            lambda workload, threads: {"runs": [run], "recommendation": "n/a"},
+        )
+        self.explorer.explore_interpreter_state()
+        assert "Current thread: MainThread" in capsys.readouterr().out
+
+    def test_cpu_bound_recommends_processes(self):
+        """Pure-Python spinning threads contend for the GIL."""
+
+        def spin_work():
+            spin(0.1)
+
+        original = sys.getswitchinterval()
+        report = self.explorer.measure_gil_contention(
+            spin_work, threads=2, switch_intervals=(0.005, 0.001), calibrate=0.02
+        )
+        assert sys.getswitchinterval() == original
+        assert [run["switch_interval"] for run in report["runs"]] == [0.005, 0.001]
+        run = report["runs"][0]
+        assert [t["name"] for t in run["threads"]] == ["worker-0", "worker-1"]
+        assert run["probe"]["wait_ratio"] > 0.3
+        assert "processes" in report["recommendation"]
+
+    def test_sleeping_threads_are_fine(self):
+        """Threads that sleep leave the GIL to the probe."""
+        report = self.explorer.measure_gil_contention(
+            lambda: time.sleep(0.1), threads=2, switch_intervals=(0.005,),
+            calibrate=0.02,
+        )
+        run = report["runs"][0]
+        assert run["probe"]["wait_ratio"] < 0.3
+        assert all(t["cpu"] < t["wall"] for t in run["threads"])
+        assert report["recommendation"].startswith("Threads mostly wait")
+
+    def test_rejects_bad_arguments(self):
+        """Empty switch intervals or no threads fail before anything runs."""
+        with pytest.raises(ValueError):
+            self.explorer.measure_gil_contention(lambda: None, switch_intervals=())
+        with pytest.raises(ValueError):
+            self.explorer.measure_gil_contention(lambda: None, threads=0)
+
+    def test_worker_exception_propagates(self):
+        """A failing workload is re-raised instead of skewing cores_used."""
+        original = sys.getswitchinterval()
+
+        def workload():
+            raise KeyError("boom")
+
+        with pytest.raises(KeyError):
+            self.explorer.measure_gil_contention(
+                workload, switch_intervals=(0.005,), calibrate=0.01
+            )
+        assert sys.getswitchinterval() == original
@@ -0,0 +1,94 @@
+"""
+Tests for the streaming AST explorer in lambda_ast_explorer.py.
+"""
+import ast
+import io
+import json
+import os
+import sys
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lambda_ast_explorer import explore_ast, iter_nodes, stream_ast, subtree_summary
+
+SOURCE = "def f(a):\n    return a + 1\n\nx = f(2)\n"
+
+
+class TestIterNodes:
+    """Test node records."""
+
+    def test_matches_ast_walk(self):
+        """Every node is yielded once with its child count."""
+        tree = ast.parse(SOURCE)
+        records = list(iter_nodes(tree))
+        assert len(records) == sum(1 for _ in ast.walk(tree))
+        assert records[0] == {
+            "type": "Module",
+            "lineno": None,
+            "col": None,
+            "depth": 0,
+            "children": 2,
+        }
+        assert records[1]["type"] == "FunctionDef"
+        assert records[1]["lineno"] == 1
+
+    def test_max_depth(self):
+        """Nodes below max_depth are not visited."""
+        records = list(iter_nodes(ast.parse(SOURCE), max_depth=1))
+        assert [r["type"] for r in records] == ["Module", "FunctionDef", "Assign"]
+
+    def test_is_lazy(self):
+        """Records are produced on demand."""
+        nodes = iter_nodes(ast.parse("x = 1\n" * 10_000))
+        assert next(nodes)["children"] == 10_000
+
+
+class TestSummary:
+    """Test the post-order subtree summary."""
+
+    def test_sizes(self):
+        """Subtree sizes add up and the root is the largest subtree."""
+        tree = ast.parse(SOURCE)
+        summary = subtree_summary(tree, top=3)
+        total = sum(1 for _ in ast.walk(tree))
+        assert summary["nodes"] == total
+        assert summary["largest_subtrees"][0] == {
+            "type": "Module",
+            "lineno": None,
+            "size": total,
+        }
+        assert len(summary["largest_subtrees"]) == 3
+        assert summary["by_type"]["Name"]["count"] == 3
+
+    def test_deep_tree(self):
+        """Deep nesting does not hit the recursion limit."""
+        tree = ast.Constant(1)
+        for _ in range(5000):
+            tree = ast.UnaryOp(ast.USub(), tree)
+        summary = subtree_summary(tree)
+        assert summary["max_depth"] == 5000
+        assert summary["nodes"] == 10_001
+
+
+class TestExplore:
+    """Test streaming output and execution."""
+
+    def test_stream_json_lines(self):
+        """JSON-lines output has one parseable record per node."""
+        out = io.StringIO()
+        count = stream_ast(SOURCE, out=out, json_lines=True)
+        lines = out.getvalue().splitlines()
+        assert len(lines) == count
+        assert json.loads(lines[0])["type"] == "Module"
+
+    def test_explore_without_exec(self, capsys):
+        """execute=False only prints the tree."""
+        assert explore_ast("import os\nx = os.getcwd()", execute=False) == {}
+        assert "Executing" not in capsys.readouterr().out
+
+    def test_explore_exec_namespace(self, capsys):
+        """Executed code sees the list helpers but not the module globals."""
+        local_vars = explore_ast("p = pair(1, 2)\nhas_ast = 'ast' in globals()")
+        assert local_vars["has_ast"] is False
+        assert callable(local_vars["p"])
@@ -0,0 +1,260 @@
+"""
+Tests for lambda_calculus.py.
+"""
+import gc
+import os
+import sys
+
+import pytest
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lambda_calculus import (
+    CHURCH_MULT,
+    CHURCH_PLUS,
+    CHURCH_POW,
+    CHURCH_SUCC,
+    FACTORIAL_TERM,
+    PRELUDE,
+    App,
+    Lam,
+    LRUCache,
+    ReductionLimitExceeded,
+    Var,
+    Y,
+    Y_memo,
+    benchmark_list_operations,
+    church,
+    church_to_int,
+    compile_term,
+    factorial,
+    factorial_gen,
+    fibonacci_gen,
+    filter_list,
+    from_python_list,
+    iter_list,
+    make_list,
+    map_list,
+    normalize,
+    parse_term,
+    run_compiled,
+    to_python_list,
+)
+
+
+class TestYMemo:
+    """Test the memoizing fixed-point combinator."""
+
+    def test_matches_y(self):
+        """Y_memo computes the same values as Y."""
+        fib = Y_memo(fibonacci_gen)
+        assert [fib(n) for n in range(15)] == [Y(fibonacci_gen)(n) for n in range(15)]
+        assert Y_memo(factorial_gen)(10) == factorial(10)
+
+    def test_cache_info(self):
+        """Each distinct argument is computed once."""
+        fib = Y_memo(fibonacci_gen)
+        assert fib(80) == 23416728348467685
+        info = fib.cache_info()
+        assert info.misses == 81
+        assert info.maxsize == 128
+        fib.cache_clear()
+        assert fib.cache_info() == (0, 0, 128, 0)
+
+    def test_bounded_lru(self):
+        """An LRUCache never grows past maxsize."""
+        cache = LRUCache(maxsize=3)
+        fib = Y_memo(fibonacci_gen, cache)
+        fib(20)
+        assert len(cache) == 3
+        assert cache.evictions > 0
+
+    def test_weak_keys(self):
+        """Weakly keyed entries vanish with their key."""
+
+        class Node:
+            def __init__(self, value, child=None):
+                self.value = value
+                self.child = child
+
+        def total_gen(f):
+            return lambda node: node.value + (f(node.child) if node.child else 0)
+
+        cache = LRUCache(maxsize=None, weak_keys=True)
+        total = Y_memo(total_gen, cache)
+        tree = Node(1, Node(2, Node(3)))
+        assert total(tree) == 6
+        assert len(cache) == 3
+        del tree
+        assert len(cache) == 0
+
+    def test_tuple_argument_is_not_unpacked(self):
+        """f((a, b)) and f(a, b) are cached separately."""
+
+        def describe_gen(f):
+            return lambda *args: len(args)
+
+        describe = Y_memo(describe_gen)
+        assert describe((1, 2)) == 1
+        assert describe(1, 2) == 2
+        assert describe((1, 2)) == 1
+        assert describe.cache_info().hits == 1
+
+    def test_plain_dict_cache(self):
+        """Any mapping with get and item assignment can be the cache."""
+        cache = {}
+        fib = Y_memo(fibonacci_gen, cache)
+        assert fib(30) == 832040
+        assert len(cache) == 31
+        assert fib.cache_info().maxsize is None
+
+
+class TestPairLists:
+    """Test the pair-based list operations."""
+
+    def test_round_trip(self):
+        """make_list/from_python_list and to_python_list agree."""
+        assert to_python_list(make_list(1, 2, 3)) == [1, 2, 3]
+        assert to_python_list(from_python_list(x for x in "abc")) == ["a", "b", "c"]
+        assert to_python_list(None) == []
+
+    def test_map_and_filter(self):
+        """map_list and filter_list keep element order."""
+        numbers = make_list(1, 2, 3, 4, 5)
+        assert to_python_list(map_list(lambda x: x * 2, numbers)) == [2, 4, 6, 8, 10]
+        assert to_python_list(filter_list(lambda x: x % 2, numbers)) == [1, 3, 5]
+
+    def test_iter_list_is_lazy(self):
+        """iter_list streams without materialising the list."""
+        stream = iter_list(from_python_list(range(10)))
+        assert next(stream) == 0
+        assert next(stream) == 1
+
+    def test_long_lists(self):
+        """Operations on long lists do not hit the recursion limit."""
+        n = sys.getrecursionlimit() * 20
+        lst = from_python_list(range(n))
+        doubled = map_list(lambda x: x * 2, lst)
+        evens = filter_list(lambda x: x % 2 == 0, lst)
+        assert sum(iter_list(doubled)) == n * (n - 1)
+        assert len(to_python_list(evens)) == n // 2
+
+    def test_benchmark_restores_gc_state(self):
+        """The benchmark pauses the collector but leaves the caller's setting."""
+        was_enabled = gc.isenabled()
+        try:
+            gc.disable()
+            labels = [label for label, _ in benchmark_list_operations(100)]
+            assert labels[0] == "from_python_list"
+            assert not gc.isenabled()
+            gc.enable()
+            benchmark_list_operations(100)
+            assert gc.isenabled()
+        finally:
+            (gc.enable if was_enabled else gc.disable)()
+
+
+class TestTerms:
+    """Test parsing and Church numeral helpers."""
+
+    def test_parse_de_bruijn(self):
+        """Named variables become de Bruijn indices."""
+        assert parse_term("λx.x") == Lam(Var(0))
+        assert parse_term("λx y.x") == Lam(Lam(Var(1)))
+        assert parse_term(r"\f x. f x") == Lam(Lam(App(Var(1), Var(0))))
+
+    def test_parse_errors(self):
+        """Unbound names and stray tokens are rejected."""
+        with pytest.raises(ValueError):
+            parse_term("λx.y")
+        with pytest.raises(ValueError):
+            parse_term("λx.x)")
+
+    def test_church_round_trip(self):
+        """church and church_to_int are inverses."""
+        for n in (0, 1, 7, 1000):
+            assert church_to_int(church(n)) == n
+        with pytest.raises(ValueError):
+            church_to_int(Lam(Var(0)))
+
+
+class TestNormalize:
+    """Test the call-by-need normal-order reducer."""
+
+    def test_arithmetic(self):
+        """Church arithmetic reduces to the right numerals."""
+        cases = [
+            (App(CHURCH_SUCC, church(4)), 5),
+            (App(App(CHURCH_PLUS, church(2)), church(3)), 5),
+            (App(App(CHURCH_MULT, church(6)), church(7)), 42),
+            (App(App(CHURCH_POW, church(2)), church(10)), 1024),
+        ]
+        for term, expected in cases:
+            normal, steps = normalize(term)
+            assert church_to_int(normal) == expected
+            assert steps > 0
+
+    def test_normal_order_skips_unused_arguments(self):
+        """A diverging argument that is discarded is never evaluated."""
+        omega = parse_term("(λx.x x) (λx.x x)")
+        term = parse_term("(λx y.y) loop", {"loop": omega})
+        assert normalize(term, max_steps=10) == (Lam(Var(0)), 1)
+
+    def test_reduces_under_binders(self):
+        """Redexes inside abstractions are reduced."""
+        normal, _ = normalize(parse_term("λf x.(λg.g (g x)) f"))
+        assert normal == church(2)
+
+    def test_budget(self):
+        """A diverging term stops at the step budget."""
+        with pytest.raises(ReductionLimitExceeded) as excinfo:
+            normalize(parse_term("(λx.x x) (λx.x x)"), max_steps=500)
+        assert excinfo.value.steps == 500
+
+    def test_sharing(self):
+        """A shared argument is reduced once, not once per use."""
+        # double = λn.PLUS n n; the argument (2 * 50) must only be computed once.
+        double = parse_term("λn. plus n n", {"plus": CHURCH_PLUS})
+        shared = App(double, App(App(CHURCH_MULT, church(2)), church(50)))
+        normal, steps = normalize(shared)
+        assert church_to_int(normal) == 200
+        assert steps < 200
+
+    def test_large_numerals(self):
+        """Deep terms do not hit the recursion limit."""
+        normal, _ = normalize(App(App(CHURCH_PLUS, church(20000)), church(5)))
+        assert church_to_int(normal) == 20005
+
+
+class TestCompile:
+    """Test compiling Church encodings to native values."""
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "plus 3 4",
+            "mult 3 (succ 4)",
+            "pow 2 5",
+            "pred 0",
+            "pred 9",
+            "(λn. n succ 0) 7",
+            "iszero (pred 1) 5 6",
+            "first (rest (pair 1 (pair 2 3)))",
+            "Y (λf n. iszero n 1 (mult n (f (pred n)))) 4",
+        ],
+    )
+    def test_matches_normalize(self, source):
+        """Compiled numerals agree with symbolic reduction."""
+        term = parse_term(source, PRELUDE)
+        assert compile_term(term) == church_to_int(normalize(term)[0])
+
+    def test_native_values(self):
+        """Booleans and pairs come back as bool and tuple."""
+        assert compile_term(parse_term("iszero 0", PRELUDE)) is True
+        assert compile_term(parse_term("pair (plus 1 1) true", PRELUDE)) == (2, True)
+
+    def test_factorial(self):
+        """The compiled Y-based factorial matches the closure version."""
+        for n in (0, 1, 5, 20):
+            assert run_compiled(FACTORIAL_TERM, n) == factorial(n)
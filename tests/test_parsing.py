@@ -0,0 +1,316 @@
+"""
+Tests for the lambda expression parser in parsing.py.
+"""
+import io
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("click")
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from array import array
+
+from click.testing import CliRunner
+
+from parsing import (
+    NUMPY_AVAILABLE,
+    _evaluate_chunk,
+    _stream_batch,
+    apply_batch,
+    benchmark_parser,
+    compile_lambda,
+    jit_compile,
+    main,
+    parse_and_apply_lambda,
+    parse_lambda,
+    test_cases,
+    tokenize,
+)
+
+
+class TestParse:
+    """Test tokenizing and parsing."""
+
+    def test_tokenize(self):
+        """Tokens come out in one pass with their kinds."""
+        assert tokenize("λx.(x + 12)") == [
+            ("λ", "λ"),
+            ("name", "x"),
+            (".", "."),
+            ("(", "("),
+            ("name", "x"),
+            ("+", "+"),
+            ("int", "12"),
+            (")", ")"),
+        ]
+
+    def test_parse_lambda(self):
+        """The body becomes a nested (op, left, right) tuple."""
+        assert parse_lambda("λx.((x * x) - 3)") == ("x", ("-", ("*", "x", "x"), 3))
+        assert parse_lambda("λy.(y)") == ("y", "y")
+
+    def test_invalid(self):
+        """Malformed expressions raise ValueError."""
+        for expr in (
+            "x.(x)",
+            "λx.(x + 1",
+            "λx.(x + 1))",
+            "λx.(x ^ 2)",
+            "λx.(+ x)",
+            "λx.(+)",
+            "λx.(x 1)",
+            "λx.(+ (+ x) 1)",
+        ):
+            with pytest.raises(ValueError):
+                parse_lambda(expr)
+
+    def test_module_test_cases(self):
+        """The prefix and curried forms in test_cases evaluate correctly."""
+        expected = [3, 7, -1]
+        for (expr, arg), want in zip(test_cases, expected):
+            assert compile_lambda(expr)(arg) == want
+
+    def test_prefix_forms(self):
+        """Prefix operators fold left and partial applications complete."""
+        assert parse_lambda("λx.(+ x 1)")[1] == ("+", "x", 1)
+        assert parse_lambda("λx.(* 1 2 x)")[1] == ("*", ("*", 1, 2), "x")
+        assert parse_lambda("λx.((- ((+ x) x)) 3)")[1] == ("-", ("+", "x", "x"), 3)
+
+    def test_precedence(self):
+        """Infix operators follow Python's precedence and associativity."""
+        assert parse_lambda("λx.x + 2 * x")[1] == ("+", "x", ("*", 2, "x"))
+        assert parse_lambda("λx.x - 1 - 2")[1] == ("-", ("-", "x", 1), 2)
+        assert parse_lambda("λx.x ** 2 ** 3")[1] == ("**", "x", ("**", 2, 3))
+        assert parse_lambda("λx.x < 1 + 2")[1] == ("<", "x", ("+", 1, 2))
+        assert compile_lambda("λx.-x ** 2")(3) == -9
+
+    def test_negative_literal_before_power(self):
+        """A glued minus still binds looser than **, as in Python."""
+        for expr in ("λx.-3 ** 2", "λx.- 3 ** 2", "λx.(-3 ** 2)", "λx.x * 0 + -3 ** 2"):
+            assert compile_lambda(expr)(1) == -9, expr
+        assert parse_lambda("λx.-3 ** 2")[1] == ("-", 0, ("**", 3, 2))
+        assert compile_lambda("λx.(** -3 2)")(1) == 9
+
+    def test_negative_literals(self):
+        """A minus glued to a number is a literal; spaced out it subtracts."""
+        assert parse_lambda("λx.(- x -12)")[1] == ("-", "x", -12)
+        assert parse_lambda("λx.(x -12)")[1] == ("-", "x", 12)
+        assert parse_lambda("λx.(x-12)")[1] == ("-", "x", 12)
+        assert parse_lambda("λx.(-12 + x)")[1] == ("+", -12, "x")
+
+    def test_operators(self):
+        """Every operator in the table evaluates like Python's."""
+        cases = {
+            "λx.x / 4": 1.75,
+            "λx.x // 4": 1,
+            "λx.x % 4": 3,
+            "λx.(** x 2)": 49,
+            "λx.x <= 7": True,
+            "λx.x != 7": False,
+        }
+        for expr, want in cases.items():
+            assert compile_lambda(expr)(7) == want
+
+    def test_benchmark_parser(self):
+        """Large generated expressions parse in both notations."""
+        rows = benchmark_parser(node_counts=(1001,))
+        assert [row["notation"] for row in rows] == ["infix", "prefix", "chain"]
+        assert all(row["nodes_per_second"] > 0 for row in rows)
+
+
+class TestDepth:
+    """Test bodies deeper than the recursion limit."""
+
+    def test_flat_chain(self):
+        """A 10^4-node left-deep chain evaluates, traces and batches."""
+        source = "λx." + " + ".join(["x"] * 5_000)
+        compiled = compile_lambda(source, jit=False)
+        assert compiled(3) == 15_000
+        result, steps = compiled.trace(1)
+        assert (result, len(steps)) == (5_000, 4_999)
+        assert list(compiled.batch(array("q", [1, 2]), use_numpy=False)) == [
+            5_000,
+            10_000,
+        ]
+
+    def test_deep_nesting_is_a_value_error(self):
+        """Nesting past the parser's limit is reported, not a RecursionError."""
+        source = "λx." + "(" * 3_000 + "x" + ")" * 3_000
+        with pytest.raises(ValueError, match="nested too deeply"):
+            parse_lambda(source)
+        result = CliRunner().invoke(main, [source, "1"])
+        assert result.exception is None
+        assert "nested too deeply" in result.output
+
+
+class TestApply:
+    """Test compiling and applying expressions."""
+
+    def test_parse_and_apply(self):
+        """Results and steps match the step-by-step evaluation."""
+        result, steps = parse_and_apply_lambda("λx.(x + (2 * x))", 3)
+        assert result == 9
+        assert steps == ["(* 2 3) = 6", "(+ 3 6) = 9"]
+
+    def test_trace_is_optional(self):
+        """Without tracing no steps are collected."""
+        assert parse_and_apply_lambda("λx.((x * x) - 3)", 4, trace=False) == (13, [])
+
+    def test_compile_is_cached(self):
+        """Compiling the same text twice returns the same object."""
+        first = compile_lambda("λx.((x * 3) - 1)")
+        assert compile_lambda("λx.((x * 3) - 1)") is first
+        assert [first(x) for x in range(4)] == [-1, 2, 5, 8]
+
+
+class TestJit:
+    """Test bytecode compilation of expression bodies."""
+
+    def test_matches_interpreter(self):
+        """JIT and interpreter agree on every operator."""
+        for expr in (
+            "λx.((x * x) + ((3 * x) - 5))",
+            "λx.(x // 3) ** 2 % 7 - x / 4",
+            "λx.(x < 3) + (x >= 5) * 2",
+            "λx.((- ((+ x) x)) 3)",
+        ):
+            jitted = compile_lambda(expr)
+            interpreted = compile_lambda(expr, jit=False)
+            assert [jitted(x) for x in range(-5, 10)] == [
+                interpreted(x) for x in range(-5, 10)
+            ]
+
+    def test_cache_ignores_spelling(self):
+        """Bodies differing only in layout and parameter share one function."""
+        first = jit_compile(*parse_lambda("λx.(x + 1)"))
+        assert jit_compile(*parse_lambda("λy.(+ y   1)")) is first
+        assert jit_compile(*parse_lambda("λx.(x + 2)")) is not first
+
+    def test_deep_body_falls_back(self):
+        """A body too deep for compile() still runs, through the interpreter."""
+        source = "λx." + " - ".join(["x"] + ["1"] * 5_000)
+        jitted = compile_lambda(source)
+        assert jitted(10_000) == 5_000
+        assert jit_compile(*parse_lambda(source)) is jitted._fn
+
+    def test_trace_uses_interpreter(self):
+        """Tracing still reports every step with the JIT enabled."""
+        _, steps = compile_lambda("λx.(x * 2) + 1").trace(3)
+        assert steps == ["(* 3 2) = 6", "(+ 6 1) = 7"]
+
+
+class TestBatch:
+    """Test column-wise batch evaluation."""
+
+    EXPR = "λx.((x * x) + ((3 * x) - 5))"
+
+    @pytest.mark.parametrize(
+        "use_numpy",
+        [
+            False,
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(
+                    not NUMPY_AVAILABLE, reason="NumPy not installed"
+                ),
+            ),
+        ],
+    )
+    def test_batch_matches_scalar(self, use_numpy):
+        """Batch results equal per-argument evaluation."""
+        compiled = compile_lambda(self.EXPR)
+        args = array("q", range(-50, 50))
+        assert list(compiled.batch(args, use_numpy=use_numpy)) == [
+            compiled(x) for x in args
+        ]
+        constant = compile_lambda("λx.(2 * 3)")
+        assert list(constant.batch(array("q", [1, 2, 3]), use_numpy=use_numpy)) == [
+            6,
+            6,
+            6,
+        ]
+
+    def test_array_batch_float_results(self):
+        """Without NumPy, division switches the column to array('d')."""
+        result = compile_lambda("λx.x / 2").batch(array("q", [1, 2]), use_numpy=False)
+        assert result.typecode == "d"
+        assert list(result) == [0.5, 1.0]
+
+    def test_apply_batch_streams_chunks(self):
+        """apply_batch yields every result across chunk boundaries."""
+        results = list(apply_batch(self.EXPR, iter(range(1000)), chunk_size=64))
+        assert results == [x * x + 3 * x - 5 for x in range(1000)]
+
+    def test_unbound_name(self):
+        """Names other than the parameter cannot be batch-evaluated."""
+        with pytest.raises(ValueError):
+            compile_lambda("λx.(x + y)").batch(array("q", [1]))
+
+    def test_cli_batch(self, tmp_path):
+        """--batch reads arguments from a file or stdin."""
+        path = tmp_path / "args.txt"
+        path.write_text("1\n2\n3\n")
+        runner = CliRunner()
+        result = runner.invoke(main, ["λx.(x * 2)", "--batch", str(path)])
+        assert result.output.split() == ["2", "4", "6"]
+        result = runner.invoke(main, ["λx.(x + 1)", "--batch", "-"], input="10\n20\n")
+        assert result.output.split() == ["11", "21"]
+
+    def test_stream_keeps_blank_lines(self):
+        """Blank lines are echoed, even when a whole chunk is blank."""
+        lines = io.StringIO("1\n\n\n\n2\n")
+        blocks = list(_stream_batch(compile_lambda("λx.x * 10"), lines, chunk_size=2))
+        assert "\n".join(blocks).split("\n") == ["10", "", "", "", "20"]
+
+    @pytest.mark.parametrize(
+        "use_numpy",
+        [
+            False,
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(
+                    not NUMPY_AVAILABLE, reason="NumPy not installed"
+                ),
+            ),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "expr, args",
+        [
+            ("λx.x * x * x", [2**21, 3]),
+            ("λx.x ** 40", [5, 2]),
+            ("λx.x + 9223372036854775000", [1000, 1]),
+            ("λx.0 - x - x", [-(2**62), 1]),
+            ("λx.x ** -1", [2, 4]),
+            ("λx.x ** (x - 3)", [1, 5]),
+            ("λx.x / 3", [2**60, 1]),
+            ("λx.(x < 3) + (x < 4)", [1, 5]),
+            ("λx.x < 3", [2, 4]),
+            ("λx.(x / 2) // 1", [5, 6]),
+        ],
+    )
+    def test_batch_matches_scalar_semantics(self, expr, args, use_numpy):
+        """Overflow, powers and comparisons give exactly the scalar results."""
+        compiled = compile_lambda(expr)
+        results = _evaluate_chunk(compiled, args, use_numpy)
+        expected = [compiled(arg) for arg in args]
+        assert results == expected
+        assert [type(r) for r in results] == [type(r) for r in expected]
+
+    @pytest.mark.parametrize(
+        "expr", ["λx.x // 0", "λx.x % 0", "λx.x / 0", "λx.0 ** -x", "λx.x // (x - 2)"]
+    )
+    def test_batch_zero_division(self, expr):
+        """Division by zero raises as it does for a single argument."""
+        with pytest.raises(ZeroDivisionError):
+            list(apply_batch(expr, [1, 2, 3]))
+
+    def test_batch_beyond_int64(self):
+        """Constants or arguments past int64 fall back to exact integers."""
+        big = 2**70
+        assert list(apply_batch(f"λx.x + {big}", [1, 2])) == [big + 1, big + 2]
+        assert list(apply_batch("λx.x - 1", [big])) == [big - 1]
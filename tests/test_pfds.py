@@ -0,0 +1,308 @@
+"""
+Tests for the persistent data structures in pfds.py.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pfds import (
+    BankersQueue,
+    HashArrayMappedTrie,
+    PersistentVector,
+    SkewBinaryList,
+    SkewBinomialHeap,
+    SortableCollection,
+)
+
+
+class TestBankersQueue:
+    """Test the banker's queue."""
+
+    def test_fifo_order(self):
+        """Elements leave in the order they were added."""
+        q = BankersQueue()
+        for x in range(5):
+            q = q.snoc(x)
+        q = q.tail().snoc(5)
+        drained = []
+        while not q.is_empty():
+            drained.append(q.head())
+            q = q.tail()
+        assert drained == [1, 2, 3, 4, 5]
+
+    def test_defaults_are_not_shared(self):
+        """Two empty queues do not share their backing lists."""
+        assert BankersQueue().front is not BankersQueue().front
+        with pytest.raises(IndexError):
+            BankersQueue().head()
+
+
+class TestSkewBinaryList:
+    """Test the skew binary random-access list."""
+
+    def test_cons_head_tail(self):
+        """cons/head/tail behave like a stack."""
+        lst = SkewBinaryList()
+        for x in range(10):
+            lst = lst.cons(x)
+        assert lst.head() == 9
+        assert lst.tail().head() == 8
+        assert len(lst.tail()) == 9
+        assert list(lst) == list(range(9, -1, -1))
+
+    def test_empty(self):
+        """Operations on an empty list raise IndexError."""
+        lst = SkewBinaryList()
+        assert lst.is_empty()
+        assert len(lst) == 0
+        with pytest.raises(IndexError):
+            lst.head()
+        with pytest.raises(IndexError):
+            lst.tail()
+        with pytest.raises(IndexError):
+            lst.lookup(0)
+
+    def test_lookup_matches_list(self):
+        """lookup and indexing agree with a Python list at every size."""
+        for n in range(40):
+            lst = SkewBinaryList(range(n))
+            assert [lst.lookup(i) for i in range(n)] == list(range(n))
+            assert list(lst) == list(range(n))
+            if n:
+                assert lst[-1] == n - 1
+
+    def test_tail_preserves_order(self):
+        """Repeated tail walks the elements in order."""
+        lst = SkewBinaryList(range(25))
+        seen = []
+        while not lst.is_empty():
+            seen.append(lst.head())
+            lst = lst.tail()
+        assert seen == list(range(25))
+
+    def test_update_is_persistent(self):
+        """update returns a new version and leaves the old one intact."""
+        original = SkewBinaryList(range(30))
+        for i in range(30):
+            updated = original.update(i, "x")
+            assert updated[i] == "x"
+            assert list(updated) == [("x" if j == i else j) for j in range(30)]
+        assert list(original) == list(range(30))
+
+    def test_slice(self):
+        """Slicing returns a SkewBinaryList."""
+        lst = SkewBinaryList(range(10))
+        assert list(lst[2:5]) == [2, 3, 4]
+        assert isinstance(lst[::2], SkewBinaryList)
+
+
+class TestSkewBinomialHeap:
+    """Test the skew binomial heap."""
+
+    def test_drains_in_sorted_order(self):
+        """Repeated delete_min yields the elements in sorted order."""
+        rng = random.Random(42)
+        data = [rng.randrange(100) for _ in range(500)]
+        heap = SkewBinomialHeap()
+        for x in data:
+            heap = heap.insert(x)
+        assert len(heap) == len(data)
+        drained = []
+        while not heap.is_empty():
+            drained.append(heap.find_min())
+            heap = heap.delete_min()
+        assert drained == sorted(data)
+
+    def test_heapify(self):
+        """heapify builds the same heap as repeated insert."""
+        heap = SkewBinomialHeap.heapify([5, 3, 8, 1, 9])
+        assert heap.find_min() == 1
+        assert len(heap) == 5
+
+    def test_merge(self):
+        """merge combines two heaps."""
+        left = SkewBinomialHeap.heapify(range(0, 50, 2))
+        right = SkewBinomialHeap.heapify(range(1, 50, 2))
+        merged = left.merge(right)
+        drained = []
+        while not merged.is_empty():
+            drained.append(merged.find_min())
+            merged = merged.delete_min()
+        assert drained == list(range(50))
+
+    def test_snapshots_survive(self):
+        """Old versions keep working after newer versions are modified."""
+        versions = [SkewBinomialHeap()]
+        for x in [7, 3, 9, 1, 5]:
+            versions.append(versions[-1].insert(x))
+        versions[-1].delete_min().delete_min()
+        assert [v.find_min() for v in versions[1:]] == [7, 3, 3, 1, 1]
+        assert len(versions[3]) == 3
+
+    def test_empty(self):
+        """find_min/delete_min on an empty heap raise IndexError."""
+        with pytest.raises(IndexError):
+            SkewBinomialHeap().find_min()
+        with pytest.raises(IndexError):
+            SkewBinomialHeap().delete_min()
+
+
+class TestHashArrayMappedTrie:
+    """Test the persistent hash array mapped trie."""
+
+    def test_assoc_dissoc_get(self):
+        """assoc/dissoc return new maps and leave the old ones alone."""
+        empty = HashArrayMappedTrie()
+        one = empty.assoc("a", 1)
+        two = one.assoc("b", 2)
+        assert len(empty) == 0
+        assert one == {"a": 1}
+        assert two == {"a": 1, "b": 2}
+        assert two.dissoc("a") == {"b": 2}
+        assert two.get("missing", 42) == 42
+        assert two.dissoc("missing") is two
+        with pytest.raises(KeyError):
+            two["missing"]
+
+    def test_matches_dict(self):
+        """A long random edit sequence agrees with a dict at every version."""
+        rng = random.Random(7)
+        hamt = HashArrayMappedTrie()
+        reference = {}
+        versions = []
+        for _ in range(2000):
+            key = rng.randrange(500)
+            if rng.random() < 0.3:
+                hamt = hamt.dissoc(key)
+                reference.pop(key, None)
+            else:
+                hamt = hamt.assoc(key, rng.random())
+                reference[key] = hamt[key]
+            versions.append((hamt, dict(reference)))
+        for version, expected in versions[::50]:
+            assert dict(version.items()) == expected
+            assert len(version) == len(expected)
+
+    def test_hash_collisions(self):
+        """Keys with identical hashes are stored side by side."""
+
+        class Colliding:
+            def __init__(self, name):
+                self.name = name
+
+            def __hash__(self):
+                return 1
+
+            def __eq__(self, other):
+                return isinstance(other, Colliding) and other.name == self.name
+
+        keys = [Colliding(str(i)) for i in range(10)]
+        hamt = HashArrayMappedTrie((k, i) for i, k in enumerate(keys))
+        assert [hamt[k] for k in keys] == list(range(10))
+        assert hamt.assoc(1, "int").dissoc(keys[3])[1] == "int"
+        assert keys[3] not in hamt.dissoc(keys[3])
+
+    def test_transient(self):
+        """A transient edits in place and does not disturb its source."""
+        source = HashArrayMappedTrie({i: i for i in range(100)})
+        transient = source.transient()
+        for i in range(100, 200):
+            transient[i] = i
+        del transient[0]
+        result = transient.persistent()
+        assert len(source) == 100 and 0 in source and 150 not in source
+        assert len(result) == 199 and 0 not in result and result[150] == 150
+        with pytest.raises(RuntimeError):
+            transient[1] = 2
+
+
+class TestPersistentVector:
+    """Test the 32-way persistent vector."""
+
+    @pytest.mark.parametrize("n", [0, 1, 32, 33, 1024, 1057, 40000])
+    def test_build_and_index(self, n):
+        """Vectors of every trie depth index like a list."""
+        vec = PersistentVector(range(n))
+        assert len(vec) == n
+        assert list(vec) == list(range(n))
+        assert [vec[i] for i in range(0, n, 97)] == list(range(0, n, 97))
+        if n:
+            assert vec[-1] == n - 1
+
+    def test_append_and_set_are_persistent(self):
+        """append/set leave earlier versions untouched."""
+        base = PersistentVector(range(40))
+        left = base.append("left")
+        right = base.append("right")
+        changed = right.set(3, "x")
+        assert left[40] == "left" and right[40] == "right"
+        assert changed[3] == "x" and right[3] == 3
+        assert list(base) == list(range(40))
+        with pytest.raises(IndexError):
+            base.set(40, "x")
+
+    def test_slice_and_concat(self):
+        """Slicing and + produce new vectors."""
+        vec = PersistentVector(range(100))
+        assert list(vec[10:75]) == list(range(10, 75))
+        assert list(vec[::-3]) == list(range(100))[::-3]
+        assert list(vec[90:] + [100, 101]) == list(range(90, 102))
+        assert isinstance(vec[1:2], PersistentVector)
+
+    def test_transient(self):
+        """A transient builds in place and does not alter its source."""
+        source = PersistentVector(range(10))
+        transient = source.transient()
+        transient.extend(range(10, 2000))
+        transient[0] = "zero"
+        result = transient.persistent()
+        assert list(source) == list(range(10))
+        assert result[0] == "zero" and result[1999] == 1999
+        with pytest.raises(RuntimeError):
+            transient.append(1)
+
+
+class TestSortableCollection:
+    """Test the bottom-up mergesort collection."""
+
+    def test_sort_natural_order(self):
+        """Without compare or key, elements sort naturally."""
+        rng = random.Random(3)
+        data = [rng.randrange(1000) for _ in range(777)]
+        coll = SortableCollection()
+        for x in data:
+            coll = coll.add(x)
+        assert len(coll) == 777
+        assert coll.sort() == sorted(data)
+
+    def test_compare_and_key(self):
+        """compare and key give the same order; key sorts stably."""
+        words = ["pear", "fig", "apple", "kiwi", "banana", "date"]
+        by_cmp = SortableCollection(words, compare=lambda a, b: len(a) - len(b))
+        by_key = SortableCollection(words, key=len)
+        assert by_cmp.sort() == sorted(words, key=len)
+        assert by_key.sort() == sorted(words, key=len)
+        with pytest.raises(ValueError):
+            SortableCollection(compare=lambda a, b: 0, key=len)
+
+    def test_versions_are_independent(self):
+        """Adding to an old version does not affect newer ones."""
+        base = SortableCollection([5, 1, 4])
+        left = base.add(0)
+        right = base.add(9)
+        assert base.sort() == [1, 4, 5]
+        assert left.sort() == [0, 1, 4, 5]
+        assert right.sort() == [1, 4, 5, 9]
+        assert base.sort() is not base.sort()
+
+    def test_long_unforced_chain(self):
+        """Many adds without sorting stay within the recursion limit."""
+        coll = SortableCollection(key=lambda x: -x)
+        for x in range(5000):
+            coll = coll.add(x)
+        assert coll.sort() == list(range(4999, -1, -1))
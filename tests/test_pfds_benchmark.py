@@ -0,0 +1,37 @@
+"""
+Tests for the pfds_benchmark.py harness.
+"""
+import json
+import os
+import random
+import sys
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pfds_benchmark import WORKLOADS, run_benchmarks
+
+
+def test_workloads_run_at_small_sizes():
+    """Every workload completes on a tiny input."""
+    for workloads in WORKLOADS.values():
+        for workload in workloads.values():
+            workload(20, 5, random.Random(0))
+
+
+def test_report_is_json():
+    """The report covers each structure and serialises to JSON."""
+    report = run_benchmarks(n=50, versions=10, repeat=1)
+    decoded = json.loads(json.dumps(report))
+    kinds = {(r["structure"], r["workload"]) for r in decoded["results"]}
+    for name in WORKLOADS:
+        assert {(name, "ephemeral"), (name, "persistent"), (name, "memory")} <= kinds
+    assert decoded["meta"]["repeat"] == 1
+
+
+def test_structure_filter():
+    """Only the requested structures are run."""
+    report = run_benchmarks(
+        n=10, versions=2, repeat=1, structures=["SkewBinaryList"], memory=False
+    )
+    assert {r["structure"] for r in report["results"]} == {"SkewBinaryList"}
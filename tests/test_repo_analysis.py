@@ -0,0 +1,104 @@
+"""
+Tests for the repository-wide metrics in repo_analysis.py.
+"""
+import os
+import sys
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from repo_analysis import COLUMNS, _analyze_file, analyze_repository, analyze_source
+
+SOURCE = '''\
+import functools
+
+
+@functools.lru_cache
+def outer(n):
+    def inner():
+        return n + 1
+
+    return sum(inner() for _ in range(n))
+
+
+square = lambda x: x * x
+'''
+
+
+class TestAnalyzeSource:
+    """Test per-code-object rows."""
+
+    def test_rows(self):
+        """Every code object gets a row with AST and bytecode metrics."""
+        rows = {row[1]: dict(zip(COLUMNS, row)) for row in analyze_source(SOURCE, "m")}
+        assert set(rows) == {
+            "<module>",
+            "outer",
+            "outer.<locals>.inner",
+            "outer.<locals>.<genexpr>",
+            "<lambda>",
+        }
+        assert rows["outer"]["lineno"] == 4
+        assert rows["outer"]["cellvars"] == 2  # n, and inner for the genexpr
+        assert rows["outer.<locals>.inner"]["freevars"] == 1
+        assert rows["outer"]["ast_nodes"] > rows["outer.<locals>.inner"]["ast_nodes"]
+        assert all(row["ast_nodes"] and row["instructions"] for row in rows.values())
+
+
+    def test_same_line_nested_scopes(self):
+        """Scopes nested on one line get their own node counts."""
+        source = "r = [[y for y in x] for x in xs]\nf = lambda: lambda: (1, 2, 3)\n"
+        rows = {row[1]: row[3] for row in analyze_source(source, "t.py")}
+        outer = [name for name in rows if name.endswith("<lambda>")]
+        assert rows[outer[0]] > rows[outer[1]]
+        assert rows["<lambda>"] == rows["<lambda>.<locals>.<lambda>"] + 2
+        if "<listcomp>" in rows:  # comprehensions are inlined from 3.12
+            assert rows["<listcomp>"] > rows["<listcomp>.<listcomp>"]
+
+
+class TestAnalyzeRepository:
+    """Test the pooled walk and its cache."""
+
+    def test_report_and_cache(self, tmp_path):
+        """Unchanged files come from the cache; touched ones are re-hashed."""
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "a.py").write_text(SOURCE)
+        (src / "b.py").write_text("def f(:\n")
+        cache = str(tmp_path / "cache.json")
+
+        report = analyze_repository(str(src), jobs=2, cache_path=cache)
+        assert report["meta"]["reanalysed"] == 2
+        assert set(report["columns"]["file"]) == {"a.py"}
+        assert list(report["errors"]) == ["b.py"]
+
+        again = analyze_repository(str(src), jobs=2, cache_path=cache)
+        assert again["meta"]["reanalysed"] == 0
+        assert again["columns"] == report["columns"]
+
+        os.utime(src / "a.py", ns=(0, 0))
+        touched = analyze_repository(str(src), jobs=2, cache_path=cache)
+        assert touched["meta"]["reanalysed"] == 0
+
+        (src / "a.py").write_text(SOURCE + "y = 1\n")
+        changed = analyze_repository(str(src), jobs=2, cache_path=cache)
+        assert changed["meta"]["reanalysed"] == 1
+
+    def test_broken_symlink_is_an_error(self, tmp_path):
+        """A dangling .py symlink is reported and does not stop the run."""
+        (tmp_path / "ok.py").write_text("x = 1\n")
+        os.symlink(tmp_path / "missing.py", tmp_path / "broken.py")
+        cache = str(tmp_path / "cache.json")
+        report = analyze_repository(str(tmp_path), jobs=1, cache_path=cache)
+        assert list(report["errors"]) == ["broken.py"]
+        assert report["columns"]["file"] == ["ok.py"]
+        (tmp_path / "missing.py").write_text("y = 2\n")
+        again = analyze_repository(str(tmp_path), jobs=1, cache_path=cache)
+        assert again["errors"] == {}
+
+    def test_unreadable_file_is_an_error(self, tmp_path):
+        """A file that vanishes after the walk is reported, not raised."""
+        missing = str(tmp_path / "gone.py")
+        result = _analyze_file((missing, "gone.py", None))
+        assert result["rows"] == []
+        assert result["error"].startswith("FileNotFoundError")